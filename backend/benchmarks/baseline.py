@@ -0,0 +1,48 @@
+"""Stored benchmark baselines and regression checks."""
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import json
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+def baseline_path(name: str, directory: Path = BASELINE_DIR) -> Path:
+    return directory / f"{name}.json"
+
+
+def load_baseline(name: str, directory: Path = BASELINE_DIR) -> Optional[Dict[str, Any]]:
+    path = baseline_path(name, directory)
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def save_baseline(name: str, baseline: Dict[str, Any], directory: Path = BASELINE_DIR) -> Path:
+    path = baseline_path(name, directory)
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def compare(
+    current: Dict[str, Optional[float]],
+    baseline: Dict[str, Optional[float]],
+    tolerance: float,
+    higher_is_better: Iterable[str] = (),
+) -> List[str]:
+    """
+    Metrics that regressed by more than tolerance against the baseline.
+
+    Metrics are lower-is-better (times, memory, bytes) unless their name
+    ends with one of the higher_is_better suffixes (e.g. throughput).
+    """
+    higher_is_better = tuple(higher_is_better)
+    regressions = []
+    for metric, value in current.items():
+        previous = baseline.get(metric)
+        if value is None or not previous:
+            continue
+        change = value / previous - 1
+        if higher_is_better and metric.endswith(higher_is_better):
+            change = -change
+        if change > tolerance:
+            regressions.append(f"{metric}: {previous} -> {value} ({change * 100:+.0f}% worse)")
+    return regressions
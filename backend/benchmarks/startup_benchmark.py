@@ -0,0 +1,143 @@
+"""
+Startup benchmark: module import time and time until /ready.
+
+Each run starts a fresh interpreter, so nothing is measured warm:
+
+- import: `python -X importtime -c "import main"`, with the slowest
+  top-level packages (summing each module's own import time)
+- startup: time to import main, to run the lifespan up to `yield`
+  (when uvicorn starts accepting requests) and until the warm-up
+  reports ready, with per-phase durations
+
+The startup run uses the database configured in .env. Medians over the
+runs are compared with benchmarks/baselines/startup.json; the exit code is
+1 when a metric regressed by more than --tolerance.
+
+Usage (from backend/):
+    python -m benchmarks.startup_benchmark --runs 5
+    python -m benchmarks.startup_benchmark --save-baseline
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from benchmarks.baseline import BASELINE_DIR, compare, load_baseline, save_baseline
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BASELINE_NAME = "startup"
+
+# Runs inside the child interpreter; prints one JSON line
+STARTUP_SCRIPT = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+from services.warmup_service import warmup_service
+imported = time.perf_counter()
+
+async def run():
+    async with main.app.router.lifespan_context(main.app):
+        serving = time.perf_counter()
+        deadline = serving + {timeout}
+        while not warmup_service.ready and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+        ready = time.perf_counter() if warmup_service.ready else None
+        status = warmup_service.status()
+    return serving, ready, status
+
+serving, ready, status = asyncio.run(run())
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "serving_ms": (serving - started) * 1000,
+    "ready_ms": (ready - started) * 1000 if ready is not None else None,
+    "phases": {{name: phase["duration_ms"] for name, phase in status["phases"].items()}},
+}}))
+"""
+
+
+def measure_imports(top: int) -> Dict[str, Any]:
+    """Import `main` under -X importtime and summarize the time per package."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    packages: Dict[str, int] = {}
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # header line
+        name = name.strip()
+        if name == "main":
+            total_us = int(cumulative)
+        # Attribute each module's own time to its top-level package
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + int(own)
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "total_ms": total_us / 1000,
+        "slowest": {package: us / 1000 for package, us in slowest},
+    }
+
+
+def measure_startup(timeout: float) -> Dict[str, Any]:
+    """Run the lifespan in a fresh interpreter and time it until ready."""
+    completed = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT.format(timeout=timeout)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    # The last stdout line is ours; everything before it is application logging
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def median(values: List[Optional[float]]) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh-interpreter runs per measurement")
+    parser.add_argument("--top", type=int, default=10, help="slowest packages to list")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for readiness")
+    parser.add_argument("--imports-only", action="store_true", help="skip the startup (database) runs")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to baselines/{BASELINE_NAME}.json")
+    parser.add_argument("--baseline-dir", type=Path, default=BASELINE_DIR, help="where baselines are kept")
+    args = parser.parse_args()
+
+    imports = [measure_imports(args.top) for _ in range(args.runs)]
+    metrics = {"import_total_ms": median([run["total_ms"] for run in imports])}
+    report: Dict[str, Any] = {"runs": args.runs, "slowest_imports": imports[-1]["slowest"]}
+
+    if not args.imports_only:
+        startups = [measure_startup(args.timeout) for _ in range(args.runs)]
+        for metric in ("import_ms", "serving_ms", "ready_ms"):
+            metrics[f"startup_{metric}"] = median([run[metric] for run in startups])
+        report["phases_ms"] = {
+            name: median([run["phases"].get(name) for run in startups])
+            for name in startups[-1]["phases"]
+        }
+    report["metrics"] = metrics
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        print(f"Baseline saved to {save_baseline(BASELINE_NAME, metrics, args.baseline_dir)}")
+        return 0
+
+    baseline = load_baseline(BASELINE_NAME, args.baseline_dir)
+    if baseline is not None:
+        regressions = compare(metrics, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
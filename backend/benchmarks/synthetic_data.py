@@ -0,0 +1,326 @@
+"""
+Synthetic banking data for the benchmarks.
+
+Generates branches, customer types, customers, users, the navigation menu,
+nav rights, languages and nav-item translations with skewed, roughly
+realistic distributions (a few large branches, mostly members, names in
+up to three languages, partially filled contact details). Output is
+deterministic for a given seed, so baselines stay comparable.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+import json
+import random
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel
+
+from models.ci_customer import CiCustomer
+from models.ci_customer_type import CiCustomerType
+from models.gl_branch import GlBranch
+from models.it_institute import ItInstitute
+from models.it_language import ItLanguage
+from models.it_language_nav_items import ItLanguageNavItems
+from models.it_nav_menu import ItNavMenu
+from models.it_user_master import ItUserMaster  # noqa: F401 (foreign key target)
+from models.it_user_nav_rights import ItUserNavRights
+
+INSERT_BATCH_SIZE = 5000
+# The models' datetime columns only accept timezone-aware values
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+FIRST_NAMES = (
+    ("Kamal", "කමල්", "கமல்"), ("Nimal", "නිමල්", "நிமல்"), ("Sunil", "සුනිල්", "சுனில்"),
+    ("Chaminda", "චමින්ද", "சமிந்த"), ("Dilani", "දිලානි", "திலானி"), ("Sanduni", "සඳුනි", "சந்துனி"),
+    ("Ruwan", "රුවන්", "ருவன்"), ("Malini", "මාලිනී", "மாலினி"), ("Kumar", "කුමාර්", "குமார்"),
+    ("Priya", "ප්‍රියා", "பிரியா"), ("Fathima", "ෆාතිමා", "பாத்திமா"), ("Mohamed", "මොහමඩ්", "முகமது"),
+    ("Tharindu", "තරිඳු", "தரிந்து"), ("Ishara", "ඉෂාරා", "இஷாரா"), ("Lakmal", "ලක්මාල්", "லக்மால்"),
+)
+SURNAMES = (
+    ("Perera", "පෙරේරා", "பெரேரா"), ("Fernando", "ප්‍රනාන්දු", "பெர்னாண்டோ"), ("Silva", "සිල්වා", "சில்வா"),
+    ("Jayasinghe", "ජයසිංහ", "ஜயசிங்க"), ("Bandara", "බණ්ඩාර", "பண்டார"), ("Wickramasinghe", "වික්‍රමසිංහ", "விக்கிரமசிங்க"),
+    ("Rajapaksha", "රාජපක්ෂ", "ராஜபக்ஷ"), ("Sivakumar", "සිවකුමාර්", "சிவகுமார்"), ("Nadarajah", "නඩරාජා", "நடராஜா"),
+    ("Mohideen", "මොහිදීන්", "முகைதீன்"), ("Herath", "හේරත්", "ஹேரத்"), ("Dissanayake", "දිසානායක", "திசாநாயக்க"),
+)
+TOWNS = (
+    "Colombo", "Kandy", "Galle", "Matara", "Jaffna", "Kurunegala", "Anuradhapura", "Ratnapura",
+    "Badulla", "Negombo", "Trincomalee", "Batticaloa", "Hambantota", "Kegalle", "Polonnaruwa",
+)
+# (type_ln1, prefix, share of customers)
+CUSTOMER_TYPES = (
+    ("Member", "M", 0.70),
+    ("Non member", "N", 0.20),
+    ("Society", "S", 0.06),
+    ("Staff", "E", 0.03),
+    ("Minor", "C", 0.01),
+)
+# (role, share of users, share of menus granted)
+USER_ROLES = (
+    ("CLERK", 0.60, 0.30),
+    ("CASHIER", 0.15, 0.25),
+    ("FIELD_OFFICER", 0.15, 0.35),
+    ("BRANCH_MANAGER", 0.08, 0.80),
+    ("ADMIN", 0.02, 1.00),
+)
+MENU_GROUPS = (
+    "Customers", "Deposits", "Loans", "Pawning", "General Ledger", "Cash",
+    "Reports", "Members", "Shares", "Administration", "Audit", "Settings",
+)
+MENU_ITEMS = (
+    "Register", "Search", "Statement", "Approvals", "Balances", "Transfers",
+    "Interest", "Arrears", "Summary", "History", "Closures", "Limits",
+)
+LANGUAGES = (("en", "English"), ("si", "Sinhala"), ("ta", "Tamil"))
+
+
+@dataclass(frozen=True)
+class DataSpec:
+    """Size of the generated data set"""
+
+    customers: int = 1_000_000
+    branches: int = 40
+    users: int = 500
+    seed: int = 42
+
+    @property
+    def key(self) -> str:
+        """Identifies a generated data set (used to reuse database files)."""
+        return f"c{self.customers}-b{self.branches}-u{self.users}-s{self.seed}"
+
+
+def zipf_weights(count: int, exponent: float = 0.8) -> List[float]:
+    """Weights for a few large and many small groups (e.g. branch sizes)."""
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def _batches(rows: Iterator[Dict[str, Any]], size: int = INSERT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _nic(rng: random.Random, born: datetime) -> str:
+    day = born.timetuple().tm_yday + (500 if rng.random() < 0.5 else 0)
+    if born.year < 2000 and rng.random() < 0.7:
+        # Old format: YYDDDSSSSC + V
+        return f"{born.year % 100:02d}{day:03d}{rng.randrange(10000):04d}V"
+    return f"{born.year}{day:03d}{rng.randrange(100000):05d}"
+
+
+def _mobile(rng: random.Random) -> str:
+    return f"07{rng.choice('01245678')}{rng.randrange(10_000_000):07d}"
+
+
+def branch_rows(spec: DataSpec) -> List[Dict[str, Any]]:
+    rows = []
+    for i in range(1, spec.branches + 1):
+        town = TOWNS[(i - 1) % len(TOWNS)]
+        suffix = f" {(i - 1) // len(TOWNS) + 1}" if i > len(TOWNS) else ""
+        rows.append({
+            "id": i, "it_institute_id": 1, "ref_number": f"BR{i:03d}",
+            "name_ln1": f"{town}{suffix}", "name_ln2": f"{town}{suffix} ශාඛාව", "name_ln3": None,
+            "telephone": f"011{i:07d}", "status": 1 if i % 25 else 0, "c_at": NOW, "m_at": NOW,
+        })
+    return rows
+
+
+def customer_rows(spec: DataSpec) -> Iterator[Dict[str, Any]]:
+    """Customers spread over branches by a Zipf-like weight and over types by CUSTOMER_TYPES."""
+    rng = random.Random(spec.seed)
+    branch_ids = list(range(1, spec.branches + 1))
+    branch_weights = zipf_weights(spec.branches)
+    type_ids = list(range(1, len(CUSTOMER_TYPES) + 1))
+    type_weights = [share for _, _, share in CUSTOMER_TYPES]
+    span_days = 12 * 365
+
+    for i in range(1, spec.customers + 1):
+        first = rng.choice(FIRST_NAMES)
+        surname = rng.choice(SURNAMES)
+        type_id = rng.choices(type_ids, type_weights)[0]
+        born = NOW - timedelta(days=rng.randint(18 * 365, 80 * 365))
+        # The customer base grows over time: more recent registrations
+        created = NOW - timedelta(days=int(span_days * (1 - rng.random() ** 0.5)), seconds=rng.randrange(86400))
+        modified = created + timedelta(days=rng.randint(0, (NOW - created).days)) if rng.random() < 0.7 else None
+        has_ln2 = rng.random() < 0.55
+        has_ln3 = rng.random() < 0.20
+        credit = round(rng.lognormvariate(11, 1.2), -3) if rng.random() < 0.7 else None
+        yield {
+            "id": i,
+            "customer_number": f"{CUSTOMER_TYPES[type_id - 1][1]}{i:08d}",
+            "customer_type_id": type_id,
+            "branch_id": rng.choices(branch_ids, branch_weights)[0],
+            "title_ln1": rng.choice(("Mr", "Mrs", "Miss", "Rev")),
+            "full_name_ln1": f"{first[0]} {surname[0]}",
+            "full_name_ln2": f"{first[1]} {surname[1]}" if has_ln2 else None,
+            "full_name_ln3": f"{first[2]} {surname[2]}" if has_ln3 else None,
+            "ini_name_ln1": f"{first[0][0]}. {surname[0]}",
+            "address_ln1": f"{rng.randint(1, 500)}, Main Street, {rng.choice(TOWNS)}",
+            "nic": _nic(rng, born) if rng.random() < 0.95 else None,
+            "gender": rng.choice(("M", "F")),
+            "date_of_birth": born,
+            "member_date": created if type_id == 1 else None,
+            "mobile_1": _mobile(rng) if rng.random() < 0.9 else None,
+            "mobile_2": _mobile(rng) if rng.random() < 0.2 else None,
+            "credit_limit": credit,
+            "status": 1 if rng.random() < 0.95 else 0,
+            "c_at": created,
+            "m_at": modified,
+        }
+
+
+def menu_rows(spec: DataSpec) -> List[Dict[str, Any]]:
+    """Two-level menu: each group has a varying number of items."""
+    rng = random.Random(spec.seed + 1)
+    rows = []
+    next_id = 1
+    for group_order, group in enumerate(MENU_GROUPS, start=1):
+        group_id = next_id
+        items = rng.sample(MENU_ITEMS, rng.randint(4, len(MENU_ITEMS)))
+        rows.append({
+            "id": group_id, "title": group, "title_si": f"{group} (si)", "title_ta": f"{group} (ta)",
+            "url": f"/{group.lower().replace(' ', '-')}", "parent_id": None, "level": 0,
+            "path": f"/{group_id}", "group_name": group, "sort_order": group_order,
+            "has_children": True, "created_at": NOW, "updated_at": NOW,
+        })
+        next_id += 1
+        for item_order, item in enumerate(items, start=1):
+            title = f"{group} {item}"
+            rows.append({
+                "id": next_id, "title": title, "title_si": f"{title} (si)", "title_ta": f"{title} (ta)",
+                "url": f"/{group.lower().replace(' ', '-')}/{item.lower()}", "parent_id": group_id, "level": 1,
+                "path": f"/{group_id}/{next_id}", "group_name": group, "sort_order": item_order,
+                "has_children": False, "created_at": NOW, "updated_at": NOW,
+            })
+            next_id += 1
+    return rows
+
+
+def user_rows(spec: DataSpec) -> List[Dict[str, Any]]:
+    rng = random.Random(spec.seed + 2)
+    roles = [role for role, _, _ in USER_ROLES]
+    weights = [share for _, share, _ in USER_ROLES]
+    branch_weights = zipf_weights(spec.branches)
+    return [
+        {
+            "id": i, "name": f"User {i}", "user_name": f"user{i}",
+            "user_role": rng.choices(roles, weights)[0],
+            "active_branch_id": rng.choices(range(1, spec.branches + 1), branch_weights)[0],
+            "status": 1,
+        }
+        for i in range(1, spec.users + 1)
+    ]
+
+
+def nav_right_rows(users: Sequence[Dict[str, Any]], menus: Sequence[Dict[str, Any]], spec: DataSpec) -> Iterator[Dict[str, Any]]:
+    """Each user is granted a role-dependent share of the menu items (and their groups)."""
+    rng = random.Random(spec.seed + 3)
+    grant_share = {role: share for role, _, share in USER_ROLES}
+    items = [menu for menu in menus if menu["parent_id"] is not None]
+    for user in users:
+        granted = rng.sample(items, max(1, round(len(items) * grant_share[user["user_role"]])))
+        menu_ids = sorted({menu["id"] for menu in granted} | {menu["parent_id"] for menu in granted})
+        for menu_id in menu_ids:
+            yield {
+                "user_id": user["id"], "nav_menu_id": menu_id, "can_view": rng.random() < 0.97,
+                "quick_access": rng.random() < 0.05, "is_active": True,
+                "created_at": NOW, "updated_at": NOW,
+            }
+
+
+def translations_json(menus: Sequence[Dict[str, Any]]) -> str:
+    """it_language_nav_items.common_json: {language: {English text: translation}}."""
+    return json.dumps({
+        "si": {menu["title"]: menu["title_si"] for menu in menus},
+        "ta": {menu["title"]: menu["title_ta"] for menu in menus},
+    }, ensure_ascii=False)
+
+
+# it_user_master is created from DDL: its model references it_user_group,
+# which has no model in this application
+USER_MASTER_DDL = """
+CREATE TABLE IF NOT EXISTS it_user_master (
+    id INTEGER PRIMARY KEY, user_group_id INT, customer_id INT, active_branch_id INT,
+    name VARCHAR(300), user_name VARCHAR(50), user_role VARCHAR(20), password VARCHAR(500),
+    password_old1 VARCHAR(500), password_od2 VARCHAR(500), ref_number VARCHAR(11),
+    password_status INT, report_status INT, status INT,
+    c_at DATETIME, c_by INT, m_at DATETIME, m_by INT
+)
+"""
+
+MODEL_TABLES = (
+    GlBranch, CiCustomerType, ItInstitute, ItLanguage, ItLanguageNavItems,
+    ItNavMenu, ItUserNavRights, CiCustomer,
+)
+
+# InnoDB indexes foreign keys implicitly; SQLite needs them created
+SQLITE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_ci_customer_branch_id ON ci_customer (branch_id)",
+    "CREATE INDEX IF NOT EXISTS ix_ci_customer_customer_type_id ON ci_customer (customer_type_id)",
+    "CREATE INDEX IF NOT EXISTS ix_it_user_nav_rights_user_id ON it_user_nav_rights (user_id)",
+)
+
+
+async def generate(engine: AsyncEngine, spec: DataSpec) -> Dict[str, int]:
+    """
+    Create the schema and load a synthetic data set.
+
+    Returns:
+        Row counts per table
+    """
+    tables = [model.__table__ for model in MODEL_TABLES]
+    menus = menu_rows(spec)
+    users = user_rows(spec)
+    counts: Dict[str, int] = {}
+
+    async def insert(conn, table, rows) -> None:
+        total = 0
+        for batch in _batches(iter(rows)):
+            await conn.execute(table.insert(), batch)
+            total += len(batch)
+        counts[table.name] = total
+
+    async with engine.begin() as conn:
+        await conn.execute(text(USER_MASTER_DDL))
+        await conn.run_sync(lambda sync_conn: SQLModel.metadata.create_all(sync_conn, tables=tables))
+        if engine.dialect.name == "sqlite":
+            for statement in SQLITE_INDEXES:
+                await conn.execute(text(statement))
+
+        await insert(conn, ItInstitute.__table__, [{"id": 1, "name_ln1": "Synthetic Co-operative", "status": 1, "c_at": NOW, "m_at": NOW}])
+        await insert(conn, GlBranch.__table__, branch_rows(spec))
+        await insert(conn, CiCustomerType.__table__, [
+            {"id": i, "type_ln1": name, "prefix": prefix, "status": 1, "c_at": NOW, "m_at": NOW}
+            for i, (name, prefix, _) in enumerate(CUSTOMER_TYPES, start=1)
+        ])
+        await insert(conn, ItLanguage.__table__, [
+            {"id": i, "language": code, "display_name": name, "is_active": True, "created_at": NOW, "updated_at": NOW}
+            for i, (code, name) in enumerate(LANGUAGES, start=1)
+        ])
+        await insert(conn, ItLanguageNavItems.__table__, [{"id": 1, "common_json": translations_json(menus)}])
+        await insert(conn, ItNavMenu.__table__, menus)
+        await conn.execute(
+            text("INSERT INTO it_user_master (id, name, user_name, user_role, active_branch_id, status) "
+                 "VALUES (:id, :name, :user_name, :user_role, :active_branch_id, :status)"),
+            users,
+        )
+        counts["it_user_master"] = len(users)
+        await insert(conn, ItUserNavRights.__table__, nav_right_rows(users, menus, spec))
+
+    # Customers in their own transactions so the stand-in's journal stays small
+    for batch in _batches(customer_rows(spec), INSERT_BATCH_SIZE * 10):
+        async with engine.begin() as conn:
+            await conn.execute(CiCustomer.__table__.insert(), batch)
+        counts[CiCustomer.__tablename__] = counts.get(CiCustomer.__tablename__, 0) + len(batch)
+    return counts
+
+
+def branch_weights(spec: DataSpec) -> Tuple[List[int], List[float]]:
+    """Branch ids and weights, for picking request parameters like real traffic."""
+    return list(range(1, spec.branches + 1)), zipf_weights(spec.branches)
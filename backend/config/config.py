@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from typing import Optional
 from urllib.parse import quote_plus
@@ -16,14 +17,129 @@ class Settings:
     DB_USER: str = os.getenv("DB_USER")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD")
     DB_NAME: str = os.getenv("DB_NAME")
+    # Full SQLAlchemy URL; overrides the DB_* settings when set (e.g. the
+    # SQLite stand-in used by the benchmarks)
+    DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
+
+    # Logging (structured JSON, written from a background thread)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    LOG_SQL_ECHO_SAMPLE_RATE: float = float(os.getenv("LOG_SQL_ECHO_SAMPLE_RATE", "0.01"))
+    LOG_SUCCESS_SAMPLE_RATE: float = float(os.getenv("LOG_SUCCESS_SAMPLE_RATE", "0.1"))
+    LOG_SLOW_QUERY_MS: int = int(os.getenv("LOG_SLOW_QUERY_MS", "1000"))
+
+    # Startup: the schema is managed by migrations; STARTUP_RUN_DDL=true
+    # (development only) creates missing tables at startup. Warm-up primes
+    # the pool and caches in the background until /ready
+    STARTUP_RUN_DDL: bool = os.getenv("STARTUP_RUN_DDL", "false").lower() == "true"
+    STARTUP_WARMUP: bool = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+    STARTUP_WARM_CONNECTIONS: int = int(os.getenv("STARTUP_WARM_CONNECTIONS", "5"))
+    STARTUP_WARM_NAV_USERS: int = int(os.getenv("STARTUP_WARM_NAV_USERS", "200"))
+    STARTUP_WARMUP_RETRY_SECONDS: int = int(os.getenv("STARTUP_WARMUP_RETRY_SECONDS", "10"))
 
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-default-secret-key")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
-    
+
+    # Reference data (branches, customer types, institute, languages)
+    REFERENCE_DATA_REFRESH_SECONDS: int = int(os.getenv("REFERENCE_DATA_REFRESH_SECONDS", "900"))
+    REFERENCE_DATA_PROBE_SECONDS: int = int(os.getenv("REFERENCE_DATA_PROBE_SECONDS", "30"))
+
+    # Customer search index
+    CUSTOMER_SEARCH_ENABLED: bool = os.getenv("CUSTOMER_SEARCH_ENABLED", "true").lower() == "true"
+    CUSTOMER_SEARCH_REFRESH_SECONDS: int = int(os.getenv("CUSTOMER_SEARCH_REFRESH_SECONDS", "60"))
+    CUSTOMER_SEARCH_BATCH_SIZE: int = int(os.getenv("CUSTOMER_SEARCH_BATCH_SIZE", "5000"))
+    # Candidates scored per search; broader matches are cut off and flagged truncated
+    CUSTOMER_SEARCH_MAX_CANDIDATES: int = int(os.getenv("CUSTOMER_SEARCH_MAX_CANDIDATES", "5000"))
+    # Full rebuild interval; the only way deleted customers leave the index
+    CUSTOMER_SEARCH_REBUILD_SECONDS: int = int(os.getenv("CUSTOMER_SEARCH_REBUILD_SECONDS", "3600"))
+    CUSTOMER_SEARCH_WATERMARK_LAG_SECONDS: int = int(os.getenv("CUSTOMER_SEARCH_WATERMARK_LAG_SECONDS", "5"))
+
+    # Customer photo/signature delivery
+    CUSTOMER_BLOB_CACHE_DIR: str = os.getenv(
+        "CUSTOMER_BLOB_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ai_banker_blob_cache")
+    )
+    CUSTOMER_BLOB_CACHE_MAX_MB: int = int(os.getenv("CUSTOMER_BLOB_CACHE_MAX_MB", "256"))
+    CUSTOMER_BLOB_MAX_AGE_SECONDS: int = int(os.getenv("CUSTOMER_BLOB_MAX_AGE_SECONDS", "3600"))
+
+    # Report snapshots (delta refresh from c_at/m_at)
+    REPORT_SNAPSHOT_MAX_ENTRIES: int = int(os.getenv("REPORT_SNAPSHOT_MAX_ENTRIES", "64"))
+    REPORT_SNAPSHOT_RECONCILE_SECONDS: int = int(os.getenv("REPORT_SNAPSHOT_RECONCILE_SECONDS", "3600"))
+    REPORT_SNAPSHOT_WATERMARK_LAG_SECONDS: int = int(os.getenv("REPORT_SNAPSHOT_WATERMARK_LAG_SECONDS", "5"))
+
+    # Streamed (Server-Sent Events) report runs: a small first page for a
+    # fast first paint, then QUERY_FETCH_BATCH_SIZE batches
+    REPORT_STREAM_FIRST_PAGE_ROWS: int = int(os.getenv("REPORT_STREAM_FIRST_PAGE_ROWS", "100"))
+    REPORT_STREAM_PROGRESS_SECONDS: float = float(os.getenv("REPORT_STREAM_PROGRESS_SECONDS", "1"))
+
+    # Off-peak report pre-generation: at each REPORT_PREGENERATE_TIMES (server
+    # local HH:MM, comma separated) the listed reports are generated for
+    # every active branch/customer type and served while younger than
+    # REPORT_PREGENERATE_MAX_AGE_SECONDS
+    REPORT_PREGENERATE_ENABLED: bool = os.getenv("REPORT_PREGENERATE_ENABLED", "true").lower() == "true"
+    REPORT_PREGENERATE_TIMES: str = os.getenv("REPORT_PREGENERATE_TIMES", "02:00")
+    # loans_past_due ages every branch's loan book; deployments opt into it
+    REPORT_PREGENERATE_REPORTS: str = os.getenv("REPORT_PREGENERATE_REPORTS", "customer_list")
+    REPORT_PREGENERATE_MAX_AGE_SECONDS: int = int(os.getenv("REPORT_PREGENERATE_MAX_AGE_SECONDS", "86400"))
+    REPORT_PREGENERATE_DIR: str = os.getenv(
+        "REPORT_PREGENERATE_DIR", os.path.join(tempfile.gettempdir(), "ai_banker_pregenerated_reports")
+    )
+
+    # Materialized summary tables
+    MATERIALIZED_VIEWS_ENABLED: bool = os.getenv("MATERIALIZED_VIEWS_ENABLED", "true").lower() == "true"
+    MATERIALIZED_VIEW_REFRESH_SECONDS: int = int(os.getenv("MATERIALIZED_VIEW_REFRESH_SECONDS", "300"))
+    MATERIALIZED_VIEW_FULL_REFRESH_SECONDS: int = int(os.getenv("MATERIALIZED_VIEW_FULL_REFRESH_SECONDS", "86400"))
+    # Full COUNT comparison against the base tables (catches deleted rows)
+    MATERIALIZED_VIEW_RECONCILE_SECONDS: int = int(os.getenv("MATERIALIZED_VIEW_RECONCILE_SECONDS", "3600"))
+
+    # Loan past-due aging
+    LOAN_AGING_BATCH_SIZE: int = int(os.getenv("LOAN_AGING_BATCH_SIZE", "10000"))
+
+    # Read-only transactions (START TRANSACTION READ ONLY, WITH CONSISTENT
+    # SNAPSHOT) for /runQuery, query batches and named reports. Isolation
+    # is one of READ COMMITTED, REPEATABLE READ, SERIALIZABLE, READ
+    # UNCOMMITTED; empty keeps the server default
+    QUERY_READ_ONLY_TRANSACTIONS: bool = os.getenv("QUERY_READ_ONLY_TRANSACTIONS", "true").lower() == "true"
+    QUERY_ISOLATION_LEVEL: str = os.getenv("QUERY_ISOLATION_LEVEL", "")
+    QUERY_BATCH_MAX_QUERIES: int = int(os.getenv("QUERY_BATCH_MAX_QUERIES", "20"))
+
+    # Index advisor: executed query shapes are recorded per worker (LRU of
+    # fingerprints) and turned into composite index suggestions on request
+    INDEX_ADVISOR_ENABLED: bool = os.getenv("INDEX_ADVISOR_ENABLED", "true").lower() == "true"
+    INDEX_ADVISOR_MAX_FINGERPRINTS: int = int(os.getenv("INDEX_ADVISOR_MAX_FINGERPRINTS", "1000"))
+
+    # Query result memory budget (/runQuery)
+    QUERY_FETCH_BATCH_SIZE: int = int(os.getenv("QUERY_FETCH_BATCH_SIZE", "1000"))
+    QUERY_MEMORY_LIMIT_MB: int = int(os.getenv("QUERY_MEMORY_LIMIT_MB", "64"))
+    QUERY_MEMORY_GLOBAL_LIMIT_MB: int = int(os.getenv("QUERY_MEMORY_GLOBAL_LIMIT_MB", "512"))
+    # "spill" to a temporary file or "fail" the query when a budget is exceeded
+    QUERY_MEMORY_OVERFLOW: str = os.getenv("QUERY_MEMORY_OVERFLOW", "spill")
+    QUERY_SPILL_DIR: Optional[str] = os.getenv("QUERY_SPILL_DIR")
+    QUERY_SPILL_MAX_MB: int = int(os.getenv("QUERY_SPILL_MAX_MB", "2048"))
+
+    # Response compression (codings in server preference order; br/zstd
+    # are offered only when the brotli/zstandard packages are installed)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_ENCODINGS: str = os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip")
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+    # Host-wide shared memory cache (shared by all uvicorn workers)
+    SHARED_CACHE_ENABLED: bool = os.getenv("SHARED_CACHE_ENABLED", "true").lower() == "true"
+    SHARED_CACHE_PATH: Optional[str] = os.getenv("SHARED_CACHE_PATH")
+    SHARED_CACHE_SIZE_MB: int = int(os.getenv("SHARED_CACHE_SIZE_MB", "64"))
+    SHARED_CACHE_SEGMENT_KB: int = int(os.getenv("SHARED_CACHE_SEGMENT_KB", "1024"))
+    SHARED_CACHE_INDEX_SLOTS: int = int(os.getenv("SHARED_CACHE_INDEX_SLOTS", "16384"))
+    SHARED_CACHE_MAX_ITEM_KB: int = int(os.getenv("SHARED_CACHE_MAX_ITEM_KB", "512"))
+    SHARED_CACHE_TTL_SECONDS: int = int(os.getenv("SHARED_CACHE_TTL_SECONDS", "300"))
+
     @property
     def database_url(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         # URL encode the password to handle special characters
         encoded_password = quote_plus(self.DB_PASSWORD)
         return f"mysql+aiomysql://{self.DB_USER}:{encoded_password}@{self.DB_HOST}/{self.DB_NAME}"
@@ -1,9 +1,13 @@
+import asyncio
 import os
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable, Optional, TypeVar
 
 from dotenv import load_dotenv
+from sqlalchemy import event, func, select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlmodel import SQLModel
 from config.config import settings
 
@@ -13,7 +17,8 @@ load_dotenv()
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
-    echo=True,  # Set to False in production
+    # SQL echo goes through logging (DB_ECHO, sampled); see config/logging_config.py
+    echo=False,
     connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
 )
 
@@ -48,6 +53,109 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+ISOLATION_LEVELS = ("READ UNCOMMITTED", "READ COMMITTED", "REPEATABLE READ", "SERIALIZABLE")
+
+T = TypeVar("T")
+
+
+def _isolation_level(isolation_level: Optional[str]) -> str:
+    level = (isolation_level or settings.QUERY_ISOLATION_LEVEL or "").upper()
+    if level and level not in ISOLATION_LEVELS:
+        raise ValueError(f"Unknown isolation level '{level}'; use one of {', '.join(ISOLATION_LEVELS)}")
+    return level
+
+
+@event.listens_for(Session, "after_begin")
+def _start_read_only_transaction(session: Session, transaction, connection) -> None:
+    """
+    Open the transaction of a read-only session explicitly.
+
+    On MySQL this is START TRANSACTION READ ONLY (InnoDB then skips
+    transaction-id and undo bookkeeping) WITH CONSISTENT SNAPSHOT, so every
+    statement of the session reads the same committed state. The snapshot
+    part only applies under REPEATABLE READ (the InnoDB default). Runs when
+    the session first uses its connection, so sessions that never query
+    cost no round trip. Other databases (e.g. the SQLite benchmark
+    stand-in) are left as they are.
+    """
+    if "read_only_isolation" not in session.info or connection.dialect.name != "mysql":
+        return
+    level = session.info["read_only_isolation"]
+    if level:
+        # Applies to the next transaction only, so nothing leaks into the pool
+        connection.exec_driver_sql(f"SET TRANSACTION ISOLATION LEVEL {level}")
+    start = "START TRANSACTION READ ONLY"
+    if level in ("", "REPEATABLE READ"):
+        start += ", WITH CONSISTENT SNAPSHOT"
+    connection.exec_driver_sql(start)
+
+
+@asynccontextmanager
+async def read_only_session(isolation_level: Optional[str] = None) -> AsyncIterator[AsyncSession]:
+    """
+    A session whose statements run in one read-only (snapshot) transaction,
+    rolled back on exit.
+
+    Args:
+        isolation_level: One of ISOLATION_LEVELS (default QUERY_ISOLATION_LEVEL;
+            empty for the server default)
+
+    Raises:
+        ValueError: If the isolation level is unknown
+    """
+    level = _isolation_level(isolation_level)
+    async with AsyncSessionLocal() as session:
+        if settings.QUERY_READ_ONLY_TRANSACTIONS:
+            session.info["read_only_isolation"] = level
+        yield session
+
+
+async def get_read_only_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get a session in a read-only snapshot transaction.
+
+    Used by report and query endpoints, which never write.
+    """
+    async with read_only_session() as session:
+        yield session
+
+
+class SharedSnapshot:
+    """
+    One read-only snapshot shared by several concurrent queries.
+
+    MySQL cannot hand a consistent snapshot to another connection (short of
+    a global read lock), so the queries take turns on the snapshot
+    session's connection; callers may still issue them concurrently, and
+    all of them see the same committed state.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._lock = asyncio.Lock()
+
+    async def run(self, operation: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Run operation(session, *args, **kwargs) on the snapshot session."""
+        async with self._lock:
+            return await operation(self.session, *args, **kwargs)
+
+
+async def database_now(session: AsyncSession) -> datetime:
+    """
+    Current time according to the database clock.
+
+    Watermarks compared against c_at/m_at columns use this rather than the
+    application clock so the two are always comparable. In a snapshot
+    session it is read just after the snapshot was taken;
+    REPORT_SNAPSHOT_WATERMARK_LAG_SECONDS covers the difference.
+    """
+    value = (await session.execute(select(func.now()))).scalar_one()
+    if isinstance(value, str):
+        # SQLite returns CURRENT_TIMESTAMP as text
+        value = datetime.fromisoformat(value)
+    return value
+
+
 async def close_db():
     """Close database connections."""
     await engine.dispose()
\ No newline at end of file
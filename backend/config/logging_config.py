@@ -0,0 +1,132 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+from config.config import settings
+
+# Attributes every LogRecord has; anything else came from `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Loggers whose INFO records are high-volume and sampled
+SQL_ECHO_LOGGER = "sqlalchemy.engine"
+ACCESS_LOGGER = "uvicorn.access"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as one JSON object per line, including `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drop a share of high-volume INFO records before they are queued.
+
+    Warnings, errors and records logged with extra={"slow": True} are always
+    kept. SQL echo records are kept at LOG_SQL_ECHO_SAMPLE_RATE; records
+    logged with extra={"sample": True} (e.g. successful query logs) and
+    successful access log lines at LOG_SUCCESS_SAMPLE_RATE.
+
+    Args:
+        rng: Random source for the sampling decision (seeded in tests)
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        super().__init__()
+        self._random = (rng or random).random
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or getattr(record, "slow", False):
+            return True
+        if record.name.startswith(SQL_ECHO_LOGGER):
+            rate = settings.LOG_SQL_ECHO_SAMPLE_RATE
+        elif getattr(record, "sample", False):
+            rate = settings.LOG_SUCCESS_SAMPLE_RATE
+        elif record.name == ACCESS_LOGGER and isinstance(record.args, tuple) and len(record.args) >= 5:
+            # uvicorn access records: (client, method, path, http version, status)
+            if int(record.args[4]) >= 400:
+                return True
+            rate = settings.LOG_SUCCESS_SAMPLE_RATE
+        else:
+            return True
+        return rate >= 1.0 or self._random() < rate
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records unformatted.
+
+    The stock QueueHandler formats the message (and traceback) on the
+    calling thread; here all formatting happens on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging() -> None:
+    """
+    Route all logging through a background thread as structured JSON.
+
+    The root logger gets a QueueHandler (sampling on the calling thread is
+    just a random() check); a QueueListener thread formats records and
+    writes them to stdout. uvicorn's loggers are re-pointed at the root so
+    access and error logs take the same path. SQL echo is enabled on the
+    sqlalchemy.engine logger when DB_ECHO is set.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter())
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    for name in ("uvicorn", "uvicorn.error", ACCESS_LOGGER):
+        logger = logging.getLogger(name)
+        logger.handlers = []
+        logger.propagate = True
+
+    logging.getLogger(SQL_ECHO_LOGGER).setLevel(logging.INFO if settings.DB_ECHO else logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    # Stopping at exit (not in the lifespan) keeps uvicorn's shutdown logs
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
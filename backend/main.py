@@ -1,23 +1,60 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from config.config import settings
 from config.database import create_db_and_tables
+from config.logging_config import setup_logging
+from middleware.compression_middleware import CompressionMiddleware
 from routes.user_nav_routes import router as user_nav_router
 from routes.language_routes import router as language_router
 from routes.translation_routes import router as translation_router
 from routes.sql_executor_routes import router as sql_executor_router
+from routes.reference_data_routes import router as reference_data_router
+from routes.customer_routes import router as customer_router
+from routes.report_routes import router as report_router
+from routes.loan_routes import router as loan_router
+from routes.cache_routes import router as cache_router
+from routes.index_advisor_routes import router as index_advisor_router
+from services.reference_data_service import reference_data_service
+from services.customer_search_service import customer_search_service
+from services.shared_cache_service import shared_cache
+from services.warmup_service import warmup_service
 from contextlib import asynccontextmanager
+import logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    try:
-        await create_db_and_tables()
-        print("✅ Database connection successful and tables created/verified")
-    except Exception as e:
-        print(f"⚠️  Database connection failed: {e}")
-        print("📝 Application will start but database operations may fail")
-        print("🔧 Please check your database configuration in .env file")
+    # With STARTUP_RUN_DDL=false (schema managed by migrations) startup
+    # makes no database round trip; everything else warms up in the background
+    if settings.STARTUP_RUN_DDL:
+        try:
+            await create_db_and_tables()
+            logger.info("Database connection successful and tables created/verified")
+        except Exception as e:
+            logger.error(
+                "Database connection failed: %s. Application will start but database "
+                "operations may fail; check the database configuration in .env", e
+            )
+    background = [reference_data_service, customer_search_service]
+    # The report services are only imported when their background task is
+    # enabled; otherwise the first request that needs them loads them
+    if settings.MATERIALIZED_VIEWS_ENABLED:
+        from services.materialization_service import materialization_service
+        background.append(materialization_service)
+    if settings.REPORT_PREGENERATE_ENABLED:
+        from services.report_pregeneration_service import report_pregeneration_service
+        background.append(report_pregeneration_service)
+    for service in background:
+        await service.start()
+    await warmup_service.start()
     yield
+    await warmup_service.stop()
+    for service in reversed(background):
+        await service.stop()
+    shared_cache.close()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -35,11 +72,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses (including streamed ones) for slow branch links
+app.add_middleware(CompressionMiddleware)
+
 # Include routers
 app.include_router(user_nav_router, prefix="/api/v1", tags=["user-navigation"])
 app.include_router(language_router, prefix="/api/v1", tags=["languages"])
 app.include_router(translation_router, prefix="/api/v1", tags=["translations"])
 app.include_router(sql_executor_router, prefix="/api/v1", tags=["sql-executor"])
+app.include_router(reference_data_router, prefix="/api/v1", tags=["reference-data"])
+app.include_router(customer_router, prefix="/api/v1", tags=["customers"])
+app.include_router(report_router, prefix="/api/v1", tags=["reports"])
+app.include_router(loan_router, prefix="/api/v1", tags=["loans"])
+app.include_router(cache_router, prefix="/api/v1", tags=["cache"])
+app.include_router(index_advisor_router, prefix="/api/v1", tags=["index-advisor"])
 
 @app.get("/")
 def read_root():
@@ -47,4 +93,12 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/ready")
+def readiness_check():
+    """Readiness for load balancers: 503 until the startup warm-up has finished."""
+    return JSONResponse(
+        status_code=200 if warmup_service.ready else 503,
+        content=warmup_service.status(),
+    )
\ No newline at end of file
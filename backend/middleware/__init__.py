@@ -0,0 +1,3 @@
+from .compression_middleware import CompressionMiddleware
+
+__all__ = ["CompressionMiddleware"]
@@ -0,0 +1,223 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import importlib.util
+import logging
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Content types that are already compact (compressing them wastes CPU), and
+# event streams, whose small events must reach the client as they are sent
+SKIP_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/zstd",
+    "application/octet-stream",
+    "application/pdf",
+    "font/woff",
+    "text/event-stream",
+)
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self, level: int):
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + self._compressor.flush() if flush else out
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level: int):
+        import zstandard
+
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(self._flush_block) if flush else out
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _available_encoders() -> Dict[str, Tuple[Callable[[int], object], int]]:
+    """Encoders whose libraries are installed, keyed by content-coding."""
+    # find_spec checks availability without importing the codec at startup
+    encoders = {"gzip": (GzipEncoder, settings.COMPRESSION_GZIP_LEVEL)}
+    if importlib.util.find_spec("brotli") is not None:
+        encoders["br"] = (BrotliEncoder, settings.COMPRESSION_BROTLI_QUALITY)
+    if importlib.util.find_spec("zstandard") is not None:
+        encoders["zstd"] = (ZstdEncoder, settings.COMPRESSION_ZSTD_LEVEL)
+    return encoders
+
+
+def negotiate_encoding(accept_encoding: str, preference: List[str]) -> Optional[str]:
+    """
+    Pick a content-coding from an Accept-Encoding header.
+
+    The client's highest q-value wins; ties go to the server's preference
+    order. Codings with q=0 are never chosen.
+
+    Returns:
+        The chosen coding, or None to send the response uncompressed
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    wildcard = weights.get("*")
+    best, best_q = None, 0.0
+    for coding in preference:
+        q = weights.get(coding, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with zstd, brotli or gzip.
+
+    The coding is negotiated from Accept-Encoding. Bodies smaller than
+    minimum_size are sent as is; larger ones are compressed, including
+    streamed (chunked) responses, whose chunks are flushed through the
+    encoder as they arrive so clients still receive rows progressively.
+    Already-compact binary content types and partial responses are skipped.
+    A strong ETag on a compressed response is made weak (W/): the encoded
+    bytes differ from the identity representation the tag was computed for.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.encoders = _available_encoders()
+        self.preference = [
+            coding.strip()
+            for coding in settings.COMPRESSION_ENCODINGS.split(",")
+            if coding.strip() in self.encoders
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.preference)
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(self, coding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, coding: str, send: Send):
+        self.middleware = middleware
+        self.coding = coding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.buffer = bytearray()
+        self.encoder = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "").lower()
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 206, 304)
+                or content_type.startswith(SKIP_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is not None:
+            data = self.encoder.compress(body, flush=more_body)
+            if not more_body:
+                data += self.encoder.finish()
+            if data or not more_body:
+                await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        # Hold the start message until we know whether the body reaches the
+        # threshold; small bodies are sent exactly as produced
+        self.buffer += body
+        if len(self.buffer) < self.middleware.minimum_size:
+            if more_body:
+                return
+            await self._send(self.start_message)
+            await self._send({"type": "http.response.body", "body": bytes(self.buffer), "more_body": False})
+            return
+
+        factory, level = self.middleware.encoders[self.coding]
+        self.encoder = factory(level)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.coding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+        data = self.encoder.compress(bytes(self.buffer), flush=more_body)
+        self.buffer = bytearray()
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            data += self.encoder.finish()
+            headers["Content-Length"] = str(len(data))
+
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -1,7 +1,16 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, LargeBinary
+from sqlalchemy.orm import deferred
 from typing import Optional
 from datetime import datetime
 
+# Photo and signature LOBs are deferred: they are only loaded when the
+# attribute is accessed (or with undefer()), never by a plain customer load.
+LOB_COLUMNS = ("photo", "signature")
+
+_photo_column = Column("photo", LargeBinary, nullable=True)
+_signature_column = Column("signature", LargeBinary, nullable=True)
+
 
 class CiCustomer(SQLModel, table=True):
     """Customer information model"""
@@ -40,8 +49,8 @@ class CiCustomer(SQLModel, table=True):
     credit_limit_date: Optional[datetime] = Field(default=None)
     status: Optional[int] = Field(default=None)
     inactive_reson: Optional[str] = Field(default=None, max_length=300)
-    photo: Optional[bytes] = Field(default=None)
-    signature: Optional[bytes] = Field(default=None)
+    photo: Optional[bytes] = Field(default=None, sa_column=_photo_column)
+    signature: Optional[bytes] = Field(default=None, sa_column=_signature_column)
     sms_status: Optional[int] = Field(default=None)
     dp_app_status: Optional[int] = Field(default=None)
     pos_app_status: Optional[int] = Field(default=None)
@@ -50,3 +59,10 @@ class CiCustomer(SQLModel, table=True):
     m_at: Optional[datetime] = Field(default=None)
     m_by: Optional[int] = Field(default=None, foreign_key="it_user_master.id")
     field_officer_id: Optional[int] = Field(default=None)
+
+    __mapper_args__ = {
+        "properties": {
+            "photo": deferred(_photo_column),
+            "signature": deferred(_signature_column),
+        }
+    }
@@ -0,0 +1,28 @@
+import asyncio
+
+from fastapi import APIRouter, Path
+
+from services.shared_cache_service import shared_cache
+from schemas.cache_schemas import SharedCacheInvalidateResponse, SharedCacheStatsResponse
+
+router = APIRouter()
+
+
+@router.get("/cache/stats", response_model=SharedCacheStatsResponse)
+async def get_cache_stats():
+    """
+    Host-wide shared cache counters (the same for every worker).
+    """
+    return await asyncio.to_thread(shared_cache.stats)
+
+
+@router.post("/cache/{namespace}/invalidate", response_model=SharedCacheInvalidateResponse)
+async def invalidate_cache(
+    namespace: str = Path(..., pattern="^(nav_menu|translations|reference|query)$"),
+):
+    """
+    Invalidate every cached entry of a namespace in all workers
+    (e.g. after changing nav rights or translations).
+    """
+    version = await asyncio.to_thread(shared_cache.invalidate, namespace)
+    return SharedCacheInvalidateResponse(namespace=namespace, version=version)
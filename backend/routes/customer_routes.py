@@ -0,0 +1,124 @@
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.config import settings
+from config.database import get_session
+from services.customer_search_service import customer_search_service
+from services.customer_blob_service import customer_blob_service, detect_media_type, parse_range
+from schemas.customer_schemas import CustomerSearchResponse
+
+router = APIRouter()
+
+
+@router.get("/customers/search", response_model=CustomerSearchResponse)
+async def search_customers(
+    q: str = Query(..., min_length=2, description="Customer number, NIC, mobile or name"),
+    branch_id: Optional[int] = Query(None, description="Restrict results to a branch"),
+    customer_type_id: Optional[int] = Query(None, description="Restrict results to a customer type"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+):
+    """
+    Type-ahead customer search served from the in-memory search index.
+    """
+    if not customer_search_service.ready:
+        raise HTTPException(status_code=503, detail="Customer search index is not ready yet")
+
+    results, total_count, truncated = customer_search_service.search(
+        q,
+        branch_id=branch_id,
+        customer_type_id=customer_type_id,
+        page=page,
+        page_size=page_size,
+    )
+
+    return CustomerSearchResponse(
+        query=q,
+        results=results,
+        total_count=total_count,
+        page=page,
+        page_size=page_size,
+        truncated=truncated,
+    )
+
+
+@router.get("/customers/{customer_id}/{kind}")
+async def get_customer_blob(
+    request: Request,
+    customer_id: int,
+    kind: str = Path(..., pattern="^(photo|signature)$"),
+    size: Optional[int] = Query(None, ge=16, le=1024, description="Return a thumbnail of at most size x size"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Retrieve a customer's photo or signature.
+
+    Supports conditional requests (If-None-Match / If-Modified-Since) and
+    single byte-range requests. Thumbnails are served from a disk cache;
+    asking for a thumbnail of a LOB that is not a decodable image returns 415.
+    """
+    info = await customer_blob_service.get_info(session, customer_id, kind)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"Customer {customer_id} has no {kind}")
+
+    etag = info.etag if size is None else f'{info.etag[:-1]}-{size}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": f"private, max-age={settings.CUSTOMER_BLOB_MAX_AGE_SECONDS}",
+    }
+    last_modified = None
+    if info.last_modified is not None:
+        last_modified = info.last_modified.replace(microsecond=0)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if etag in tags or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+    elif if_modified_since and last_modified is not None:
+        try:
+            if last_modified <= parsedate_to_datetime(if_modified_since):
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+
+    if size is None:
+        content = await customer_blob_service.get_content(session, info)
+        media_type = detect_media_type(content)
+    else:
+        try:
+            content = await customer_blob_service.get_thumbnail(session, info, size)
+        except ValueError as e:
+            # No ETag/caching headers: the failure must not be cached as the thumbnail
+            raise HTTPException(status_code=415, detail=str(e))
+        media_type = "image/jpeg"
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, len(content))
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{len(content)}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+            return Response(
+                content=content[start:end + 1],
+                status_code=206,
+                media_type=media_type,
+                headers=headers,
+            )
+
+    return Response(content=content, media_type=media_type, headers=headers)
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import get_read_only_session
+from services.index_advisor_service import index_advisor_service
+from schemas.index_advisor_schemas import IndexAdvisorResponse
+
+router = APIRouter()
+
+
+@router.get("/index-advisor/suggestions", response_model=IndexAdvisorResponse)
+async def get_index_suggestions(
+    source: str = Query("recorded", pattern="^(recorded|performance_schema)$"),
+    min_count: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=200),
+    session: AsyncSession = Depends(get_read_only_session),
+):
+    """
+    Composite index suggestions ranked by the time spent in the queries
+    they would serve.
+
+    source=recorded uses the queries executed by this worker since start
+    (or the last reset); source=performance_schema uses the MySQL server's
+    statement digests for the schema.
+    """
+    try:
+        workload = None
+        if source == "performance_schema":
+            workload = await index_advisor_service.performance_schema_workload(session)
+        result = await index_advisor_service.suggest(session, workload, min_count=min_count, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return IndexAdvisorResponse(source=source, **result)
+
+
+@router.post("/index-advisor/reset")
+async def reset_index_advisor():
+    """
+    Forget the recorded workload of this worker (e.g. after adding indexes).
+    """
+    index_advisor_service.reset()
+    return {"success": True}
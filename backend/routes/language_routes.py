@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.database import get_session
+from routes.reference_data_routes import not_modified
 from services.language_service import LanguageService
+from services.reference_data_service import reference_data_service
 from schemas.language_schemas import LanguageListResponse
 
 router = APIRouter()
@@ -10,11 +12,17 @@ router = APIRouter()
 
 @router.get("/languages", response_model=LanguageListResponse)
 async def get_languages(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session)
 ):
     """
     Retrieve all active languages.
     """
+    snapshot = reference_data_service.get_snapshot("languages")
+    if snapshot is not None and not_modified(request, response, snapshot):
+        return Response(status_code=304, headers=dict(response.headers))
+
     language_service = LanguageService(session)
     languages, total_count = await language_service.get_languages_response()
     
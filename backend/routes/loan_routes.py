@@ -0,0 +1,81 @@
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import get_read_only_session
+from services.sql_executor_service import sql_executor_service
+from schemas.loan_schemas import LoanPastDueResponse
+
+router = APIRouter()
+
+
+@router.get("/loans/past-due", response_model=LoanPastDueResponse)
+async def get_loan_past_due(
+    branch_id: int = Query(..., description="Branch whose loan book is aged"),
+    product_code: Optional[str] = Query(None, description="Restrict to a loan product"),
+    as_of: Optional[date] = Query(None, description="Aging date (default: today)"),
+    min_days: Optional[int] = Query(None, ge=0, description="Minimum days past due"),
+    max_days: Optional[int] = Query(None, ge=0, description="Maximum days past due"),
+    due_from: Optional[date] = Query(None, description="Oldest overdue installment due on/after"),
+    due_to: Optional[date] = Query(None, description="Oldest overdue installment due on/before"),
+    capital_from: Optional[Decimal] = Query(None, ge=0, description="Minimum loan capital"),
+    capital_to: Optional[Decimal] = Query(None, ge=0, description="Maximum loan capital"),
+    include_detail: bool = Query(False, description="Return a page of past-due loans"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    max_age_seconds: Optional[int] = Query(
+        None, ge=0, description="Oldest acceptable pre-generated result (0: always compute)"
+    ),
+    session: AsyncSession = Depends(get_read_only_session),
+    accept_encoding: str = Header(""),
+):
+    """
+    Loan past-due aging for a branch: totals per aging bucket
+    (current, 1-30, 31-60, 61-90, 90+ days) and optional loan detail.
+
+    Unfiltered requests for today's branch totals, alone or with the first
+    detail page at the default page size (as the past-due screen asks),
+    are served from the off-peak pre-generated result while it is fresh
+    enough.
+    """
+    # Imported here so NumPy and the report services are not loaded at
+    # application startup
+    from services.loan_aging_service import loan_aging_service
+    from services.report_pregeneration_service import (
+        LOANS_PAST_DUE_DETAIL_FIELDS,
+        LOANS_PAST_DUE_PAGE_SIZE,
+        report_pregeneration_service,
+    )
+
+    unfiltered = all(
+        value is None
+        for value in (product_code, as_of, min_days, max_days, due_from, due_to, capital_from, capital_to)
+    )
+    stored_page = not include_detail or (page == 1 and page_size == LOANS_PAST_DUE_PAGE_SIZE)
+    if unfiltered and stored_page:
+        payload = await report_pregeneration_service.get("loans_past_due", {"branch_id": branch_id}, max_age_seconds)
+        if payload is not None:
+            omit = () if include_detail else LOANS_PAST_DUE_DETAIL_FIELDS
+            return report_pregeneration_service.response(payload, accept_encoding, omit)
+
+    try:
+        return await loan_aging_service.past_due_report(
+            session,
+            branch_id,
+            product_code=product_code,
+            as_of=as_of,
+            min_days=min_days,
+            max_days=max_days,
+            due_from=due_from,
+            due_to=due_to,
+            capital_from=capital_from,
+            capital_to=capital_to,
+            include_detail=include_detail,
+            page=page,
+            page_size=page_size,
+        )
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=sql_executor_service.friendly_error(e))
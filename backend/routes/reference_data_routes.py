@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Request, Response
+
+from services.reference_data_service import reference_data_service, ReferenceSnapshot
+from schemas.reference_data_schemas import (
+    BranchListResponse,
+    CustomerTypeListResponse,
+    InstituteInfoResponse,
+)
+
+router = APIRouter()
+
+
+def not_modified(request: Request, response: Response, snapshot: ReferenceSnapshot) -> bool:
+    """
+    Set caching headers for a snapshot and check the client's If-None-Match.
+
+    Returns:
+        True if the client already holds this snapshot version
+    """
+    response.headers["ETag"] = snapshot.etag
+    response.headers["Cache-Control"] = "no-cache"
+    if_none_match = request.headers.get("if-none-match", "")
+    # Weak comparison: compressed responses carry the tag as W/"..."
+    return snapshot.etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+@router.get("/reference/branches", response_model=BranchListResponse)
+async def get_branches(request: Request, response: Response):
+    """
+    Retrieve all active branches from the in-memory reference snapshot.
+    """
+    snapshot = await reference_data_service.get_or_load("branches")
+    if not_modified(request, response, snapshot):
+        return Response(status_code=304, headers=dict(response.headers))
+
+    return BranchListResponse(
+        branches=list(snapshot.items),
+        total_count=len(snapshot),
+        version=snapshot.version,
+    )
+
+
+@router.get("/reference/customer-types", response_model=CustomerTypeListResponse)
+async def get_customer_types(request: Request, response: Response):
+    """
+    Retrieve all active customer types from the in-memory reference snapshot.
+    """
+    snapshot = await reference_data_service.get_or_load("customer_types")
+    if not_modified(request, response, snapshot):
+        return Response(status_code=304, headers=dict(response.headers))
+
+    return CustomerTypeListResponse(
+        customer_types=list(snapshot.items),
+        total_count=len(snapshot),
+        version=snapshot.version,
+    )
+
+
+@router.get("/reference/institute", response_model=InstituteInfoResponse)
+async def get_institute(request: Request, response: Response):
+    """
+    Retrieve the institute record from the in-memory reference snapshot.
+    """
+    snapshot = await reference_data_service.get_or_load("institute")
+    if not_modified(request, response, snapshot):
+        return Response(status_code=304, headers=dict(response.headers))
+
+    return InstituteInfoResponse(
+        institute=snapshot.items[0] if snapshot.items else None,
+        version=snapshot.version,
+    )
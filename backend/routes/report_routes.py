@@ -0,0 +1,191 @@
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import json
+import logging
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import get_read_only_session
+from services.language_service import resolve_language_slot
+from services.report_registry import get_report
+from schemas.report_schemas import (
+    MaterializedViewRefreshResponse,
+    ReportDefinitionResponse,
+    ReportListResponse,
+    ReportParameterResponse,
+    ReportPregenerationStatusResponse,
+    ReportRunRequest,
+    ReportRunResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/reports", response_model=ReportListResponse)
+async def list_reports():
+    """
+    List the registered reports and their parameters.
+    """
+    # Imported here so report services are not loaded at application startup
+    from services.report_service import report_service
+
+    reports = [
+        ReportDefinitionResponse(
+            name=definition.name,
+            title=definition.title,
+            parameters=[
+                ReportParameterResponse(
+                    name=parameter.name,
+                    type=parameter.type.__name__,
+                    required=parameter.required,
+                )
+                for parameter in definition.parameters
+            ],
+            supports_snapshot=definition.supports_delta,
+        )
+        for definition in report_service.list_reports()
+    ]
+    return ReportListResponse(reports=reports, total_count=len(reports))
+
+
+@router.post("/reports/{report_name}/run", response_model=ReportRunResponse)
+async def run_report(
+    report_name: str,
+    request: ReportRunRequest,
+    session: AsyncSession = Depends(get_read_only_session),
+    accept_encoding: str = Header(""),
+):
+    """
+    Run a registered report with the given parameters.
+
+    In 'live' and 'snapshot' mode a result pre-generated off-peak is served
+    while it is younger than max_age_seconds (see the Age and
+    X-Report-Generated-At headers); 'base' always runs the report.
+    """
+    # Imported here so report services are not loaded at application startup
+    from services.report_pregeneration_service import report_pregeneration_service
+    from services.report_service import report_service
+
+    try:
+        definition = get_report(report_name)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    try:
+        language = await resolve_language_slot(request.language) or 1
+        # Pre-generated results hold the default language
+        if request.mode in ("live", "snapshot") and request.aggregate is None and language == 1:
+            payload = await report_pregeneration_service.get(
+                report_name, definition.bind_parameters(request.params), request.max_age_seconds
+            )
+            if payload is not None:
+                return report_pregeneration_service.response(payload, accept_encoding)
+        return await report_service.run_report(
+            session,
+            definition,
+            request.params,
+            mode=request.mode,
+            aggregate=request.aggregate,
+            language=language,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def iter_server_sent_events(events: AsyncIterator[Tuple[str, Dict[str, Any]]]) -> AsyncIterator[str]:
+    """Format (event, data) pairs as Server-Sent Events."""
+    async for event, data in events:
+        yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/reports/{report_name}/stream")
+async def stream_report(
+    report_name: str,
+    request: Request,
+    mode: str = Query("live", pattern="^(live|base)$"),
+    language: Optional[str] = Query(None, description="Caller's language (it_language code or id)"),
+):
+    """
+    Run a registered report progressively as Server-Sent Events (for
+    EventSource): "columns" first, then "rows" batches starting with a
+    small first page, periodic "progress" and a final "complete" (or
+    "error"). Report parameters are passed as query parameters, besides
+    mode and language.
+    """
+    # Imported here so report services are not loaded at application startup
+    from services.report_service import report_service
+
+    try:
+        definition = get_report(report_name)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    params = {key: value for key, value in request.query_params.items() if key not in ("mode", "language")}
+    try:
+        slot = await resolve_language_slot(language) or 1
+        events = report_service.stream_report(definition, params, mode=mode, language=slot)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        iter_server_sent_events(events),
+        media_type="text/event-stream",
+        # Keep proxies (nginx) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/reports/materialized/{view_name}/refresh", response_model=MaterializedViewRefreshResponse)
+async def refresh_materialized_view(view_name: str, full: bool = False):
+    """
+    Refresh a materialized summary table now (incrementally unless full=true).
+
+    Goes through the same per-interval claim as the background refresher, so
+    it is refused (409) while another worker refreshes or just refreshed it.
+    """
+    # Imported here so report services are not loaded at application startup
+    from services.materialization_service import MATERIALIZED_VIEWS, materialization_service
+
+    view = MATERIALIZED_VIEWS.get(view_name)
+    if view is None:
+        raise HTTPException(status_code=404, detail=f"Materialized view '{view_name}' not found")
+
+    result = await materialization_service.refresh_claimed(view, full=full)
+    if result is None:
+        raise HTTPException(
+            status_code=409, detail=f"Materialized view '{view_name}' was refreshed or claimed by another worker"
+        )
+    return result
+
+
+@router.get("/reports/pregenerated/status", response_model=ReportPregenerationStatusResponse)
+async def get_pregeneration_status():
+    """
+    Off-peak report pre-generation: schedule, last run of this worker and
+    the stored payloads.
+    """
+    # Imported here so report services are not loaded at application startup
+    from services.report_pregeneration_service import report_pregeneration_service
+
+    return report_pregeneration_service.status()
+
+
+@router.post("/reports/pregenerated/generate")
+async def generate_pregenerated_reports(request: Request):
+    """
+    Pre-generate the configured reports now, in the background.
+
+    Refused (409) while a run is in progress in any worker.
+    """
+    # Imported here so report services are not loaded at application startup
+    from services.report_pregeneration_service import report_pregeneration_service
+
+    client = request.client.host if request.client else "unknown"
+    if not report_pregeneration_service.trigger():
+        logger.info(f"Report pre-generation requested by {client} refused: a run is in progress")
+        raise HTTPException(status_code=409, detail="Report pre-generation is already running")
+    logger.info(f"Report pre-generation triggered by {client}")
+    return {"started": True}
@@ -1,9 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from config.database import get_session
+from config.config import settings
+from config.database import SharedSnapshot, get_read_only_session, read_only_session
+from services.language_service import resolve_language_slot
 from services.sql_executor_service import sql_executor_service
-from schemas.sql_executor_schemas import QueryExecuteRequest, QueryExecuteResponse
+from services.query_memory_service import iter_spilled_response
+from services.shared_cache_service import shared_cache
+from schemas.sql_executor_schemas import (
+    QueryBatchRequest,
+    QueryBatchResponse,
+    QueryExecuteRequest,
+    QueryExecuteResponse,
+)
+import asyncio
+import hashlib
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -13,10 +26,10 @@ router = APIRouter()
 @router.post("/runQuery", response_model=QueryExecuteResponse)
 async def run_query(
     request: QueryExecuteRequest,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_only_session),
 ):
     """
-    Execute a SQL query
+    Execute a SQL query (in a read-only transaction)
 
     Args:
         request: Query execution request with query string and optional limit
@@ -26,21 +39,113 @@ async def run_query(
         QueryExecuteResponse with query results or error
     """
     try:
-        logger.info(f"Executing query with limit: {request.limit}")
+        language = await resolve_language_slot(request.language)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        cache_key = None
+        if request.cache_ttl:
+            cache_key = hashlib.sha1(
+                request.model_dump_json(exclude={"cache_ttl"}).encode("utf-8")
+            ).hexdigest()
+            cached = shared_cache.get("query", cache_key)
+            if cached is not None:
+                return Response(content=cached, media_type="application/json")
+
+        logger.info("Executing query with limit: %s", request.limit, extra={"sample": True})
 
         # Execute query
         result = await sql_executor_service.execute_query(
-            session=session, query=request.query, limit=request.limit
+            session=session,
+            query=request.query,
+            limit=request.limit,
+            aggregate=request.aggregate,
+            language=language,
         )
 
         # Log the execution
         if result.get("success"):
-            logger.info(f"Query executed successfully. Returned {result.get('row_count', 0)} rows")
+            logger.info(
+                "Query executed successfully. Returned %s rows",
+                result.get("row_count", 0),
+                extra={"sample": True, "duration_ms": result.get("duration_ms")},
+            )
         else:
-            logger.warning(f"Query execution failed: {result.get('error')}")
+            logger.warning("Query execution failed: %s", result.get("error"))
+
+        spill = result.pop("spill", None)
+        if spill is not None:
+            # Rows that exceeded the memory budget are streamed from disk
+            return StreamingResponse(iter_spilled_response(result, spill), media_type="application/json")
+
+        if cache_key is not None and result.get("success"):
+            payload = QueryExecuteResponse.model_validate(result).model_dump_json().encode("utf-8")
+            # Results larger than SHARED_CACHE_MAX_ITEM_KB are simply not cached
+            await asyncio.to_thread(shared_cache.put, "query", cache_key, payload, ttl=request.cache_ttl)
+            return Response(content=payload, media_type="application/json")
 
         return result
 
     except Exception as e:
         logger.error(f"Unexpected error in run_query endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/runQueries", response_model=QueryBatchResponse)
+async def run_queries(request: QueryBatchRequest):
+    """
+    Execute several queries against one consistent snapshot
+
+    All queries run in a single read-only transaction (WITH CONSISTENT
+    SNAPSHOT on MySQL), so a page built from several queries never mixes
+    data from before and after a concurrent change. Results that exceed
+    the memory budget fail instead of spilling to disk.
+
+    Args:
+        request: Queries and optional isolation level
+
+    Returns:
+        QueryBatchResponse with one result per query, in request order
+    """
+    if len(request.queries) > settings.QUERY_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch may contain at most {settings.QUERY_BATCH_MAX_QUERIES} queries",
+        )
+    try:
+        language = await resolve_language_slot(request.language)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        started = time.perf_counter()
+        async with read_only_session(request.isolation_level) as session:
+            snapshot = SharedSnapshot(session)
+            results = await asyncio.gather(*(
+                snapshot.run(
+                    sql_executor_service.execute_query,
+                    query=item.query,
+                    limit=item.limit,
+                    aggregate=item.aggregate,
+                    overflow="fail",
+                    language=language,
+                )
+                for item in request.queries
+            ))
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        logger.info(
+            "Executed batch of %s queries",
+            len(results),
+            extra={"sample": True, "duration_ms": duration_ms},
+        )
+        return {
+            "success": all(result.get("success") for result in results),
+            "results": results,
+            "duration_ms": duration_ms,
+        }
+
+    except Exception as e:
+        logger.error(f"Unexpected error in run_queries endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.database import get_session
@@ -16,6 +16,5 @@ async def get_nav_translations(
     Retrieve navigation item translations for all languages.
     """
     translation_service = TranslationService(session)
-    translations = await translation_service.get_nav_translations()
-    
-    return TranslationResponse(translations=translations)
+    payload = await translation_service.get_nav_translations_json()
+    return Response(content=payload, media_type="application/json")
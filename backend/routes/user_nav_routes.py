@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.database import get_session
@@ -17,18 +17,15 @@ async def get_user_nav_menu(
     Retrieve navigation menu items for a given user_id.
     
     Returns only navigation menu items where can_view = True.
+    Served from the host-wide shared cache when another worker already
+    built it.
     """
     try:
         # Create service instance
         user_nav_service = UserNavService(session)
         
         # Get navigation menu through service
-        nav_rights, total_count = await user_nav_service.get_user_navigation_menu(user_id)
-        
-        return UserNavRightsListResponse(
-            user_id=user_id,
-            nav_rights=nav_rights,
-            total_count=total_count
-        )
+        payload = await user_nav_service.get_user_navigation_menu_json(user_id)
+        return Response(content=payload, media_type="application/json")
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
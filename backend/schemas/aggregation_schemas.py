@@ -0,0 +1,26 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class MeasureSpec(BaseModel):
+    """An aggregate computed over a result column"""
+
+    column: str = Field(..., description="Result column to aggregate ('*' for count of rows)")
+    function: Literal["sum", "count", "avg", "min", "max"] = Field("sum")
+    alias: Optional[str] = Field(None, description="Output column name (default '<function> of <column>')")
+
+    @property
+    def output_name(self) -> str:
+        if self.alias:
+            return self.alias
+        return "Count" if self.column == "*" else f"{self.function.capitalize()} of {self.column}"
+
+
+class AggregationSpec(BaseModel):
+    """Declarative server-side grouping, subtotal and pivot specification"""
+
+    group_by: List[str] = Field(default_factory=list, description="Result columns to group by")
+    measures: List[MeasureSpec] = Field(..., min_length=1)
+    rollup: bool = Field(True, description="Add subtotal rows for each group_by prefix and a grand total")
+    pivot: Optional[str] = Field(None, description="Column whose values become measure columns")
+    include_detail: bool = Field(False, description="Return detail rows with subtotal rows after each group")
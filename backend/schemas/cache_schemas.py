@@ -0,0 +1,19 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class SharedCacheStatsResponse(BaseModel):
+    enabled: bool
+    path: Optional[str] = None
+    size_bytes: Optional[int] = None
+    used_bytes: Optional[int] = None
+    entries: Optional[int] = None
+    hits: Optional[int] = None
+    misses: Optional[int] = None
+    hit_rate: Optional[float] = None
+    evictions: Optional[int] = None
+
+
+class SharedCacheInvalidateResponse(BaseModel):
+    namespace: str
+    version: int
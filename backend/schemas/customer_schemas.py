@@ -0,0 +1,26 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class CustomerSearchResult(BaseModel):
+    id: int
+    customer_number: Optional[str] = None
+    full_name_ln1: Optional[str] = None
+    full_name_ln2: Optional[str] = None
+    full_name_ln3: Optional[str] = None
+    nic: Optional[str] = None
+    mobile_1: Optional[str] = None
+    mobile_2: Optional[str] = None
+    branch_id: Optional[int] = None
+    customer_type_id: Optional[int] = None
+    status: Optional[int] = None
+    score: int
+
+
+class CustomerSearchResponse(BaseModel):
+    query: str
+    results: List[CustomerSearchResult]
+    total_count: int
+    page: int
+    page_size: int
+    truncated: bool = False
@@ -0,0 +1,29 @@
+from typing import List
+from pydantic import BaseModel
+
+
+class IndexAdvisorQuery(BaseModel):
+    fingerprint: str
+    query: str
+    count: int
+    avg_ms: float
+    max_ms: float
+    total_ms: float
+
+
+class IndexSuggestion(BaseModel):
+    table: str
+    columns: List[str]
+    index_name: str
+    ddl: str
+    score_ms: float
+    query_count: int
+    replaces_indexes: List[str]
+    queries: List[IndexAdvisorQuery]
+
+
+class IndexAdvisorResponse(BaseModel):
+    source: str
+    suggestions: List[IndexSuggestion]
+    fingerprints_analyzed: int
+    tables_analyzed: List[str]
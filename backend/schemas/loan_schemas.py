@@ -0,0 +1,42 @@
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class AgingBucketTotal(BaseModel):
+    bucket: str
+    min_days: int
+    max_days: Optional[int] = None
+    loan_count: int
+    arrears_amount: Decimal
+    outstanding_amount: Decimal
+
+
+class PastDueLoan(BaseModel):
+    loan_id: int
+    loan_number: Optional[str] = None
+    customer_id: Optional[int] = None
+    product_code: Optional[str] = None
+    capital: Decimal
+    days_past_due: int
+    bucket: str
+    overdue_installments: int
+    oldest_due_date: Optional[date] = None
+    arrears_amount: Decimal
+    outstanding_amount: Decimal
+
+
+class LoanPastDueResponse(BaseModel):
+    branch_id: int
+    product_code: Optional[str] = None
+    as_of: date
+    loans_scanned: int
+    buckets: List[AgingBucketTotal]
+    total_loan_count: int
+    total_arrears_amount: Decimal
+    total_outstanding_amount: Decimal
+    loans: Optional[List[PastDueLoan]] = None
+    detail_count: Optional[int] = None
+    page: Optional[int] = None
+    page_size: Optional[int] = None
@@ -0,0 +1,63 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class BranchResponse(BaseModel):
+    id: int
+    it_institute_id: Optional[int] = None
+    ref_number: Optional[str] = None
+    name_ln1: Optional[str] = None
+    name_ln2: Optional[str] = None
+    name_ln3: Optional[str] = None
+    status: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+class CustomerTypeResponse(BaseModel):
+    id: int
+    prefix: Optional[str] = None
+    type_ln1: Optional[str] = None
+    type_ln2: Optional[str] = None
+    type_ln3: Optional[str] = None
+    status: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+class InstituteResponse(BaseModel):
+    id: int
+    name_ln1: Optional[str] = None
+    name_ln2: Optional[str] = None
+    name_ln3: Optional[str] = None
+    address_ln1: Optional[str] = None
+    address_ln2: Optional[str] = None
+    address_ln3: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    reg_num: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+class BranchListResponse(BaseModel):
+    branches: List[BranchResponse]
+    total_count: int
+    version: int
+
+
+class CustomerTypeListResponse(BaseModel):
+    customer_types: List[CustomerTypeResponse]
+    total_count: int
+    version: int
+
+
+class InstituteInfoResponse(BaseModel):
+    institute: Optional[InstituteResponse] = None
+    version: int
@@ -0,0 +1,92 @@
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+from schemas.aggregation_schemas import AggregationSpec
+
+
+class ReportRunRequest(BaseModel):
+    """Request model for running a registered report"""
+
+    params: Dict[str, Any] = Field(default_factory=dict, description="Report parameters")
+    mode: Literal["live", "base", "snapshot"] = Field(
+        "live",
+        description=(
+            "'live' may be served from a materialized summary table, 'base' always "
+            "queries the base tables, 'snapshot' refreshes a stored result "
+            "incrementally from c_at/m_at"
+        ),
+    )
+    aggregate: Optional[AggregationSpec] = Field(
+        None, description="Server-side grouping, subtotals and pivot applied to the result"
+    )
+    language: Optional[str] = Field(
+        None,
+        description=(
+            "Caller's language (it_language code or id); multilingual fields use its "
+            "_lnN columns, falling back to _ln1 where empty"
+        ),
+    )
+    max_age_seconds: Optional[int] = Field(
+        None,
+        ge=0,
+        description=(
+            "Oldest acceptable pre-generated result in 'live' and 'snapshot' mode "
+            "(default REPORT_PREGENERATE_MAX_AGE_SECONDS; 0 always runs the report)"
+        ),
+    )
+
+
+class ReportSnapshotInfo(BaseModel):
+    refresh: str = Field(..., description="'full' or 'delta'")
+    fetched_rows: int = Field(..., description="Rows fetched from the database by this run")
+    watermark: str = Field(..., description="Database time the snapshot is current as of")
+    refreshed_at: str
+
+
+class ReportRunResponse(BaseModel):
+    """Response model for a report run"""
+
+    success: bool
+    report: str
+    data: List[Dict[str, Any]] = Field(default_factory=list)
+    columns: Optional[List[str]] = None
+    row_count: Optional[int] = None
+    source: Optional[str] = Field(None, description="'base' or 'materialized:<summary table>'")
+    snapshot: Optional[ReportSnapshotInfo] = None
+    error: Optional[str] = None
+
+
+class ReportParameterResponse(BaseModel):
+    name: str
+    type: str
+    required: bool
+
+
+class ReportDefinitionResponse(BaseModel):
+    name: str
+    title: str
+    parameters: List[ReportParameterResponse]
+    supports_snapshot: bool
+
+
+class ReportListResponse(BaseModel):
+    reports: List[ReportDefinitionResponse]
+    total_count: int
+
+
+class MaterializedViewRefreshResponse(BaseModel):
+    view: str
+    mode: str
+    partitions: Optional[int] = None
+
+
+class ReportPregenerationStatusResponse(BaseModel):
+    enabled: bool
+    reports: List[str]
+    schedule: str
+    max_age_seconds: int
+    next_run: Optional[str] = None
+    last_run: Optional[Dict[str, Any]] = None
+    running: bool
+    entries: int
+    bytes: int
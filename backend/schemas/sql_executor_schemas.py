@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Any, Dict
+from typing import List, Literal, Optional, Any, Dict
+
+from schemas.aggregation_schemas import AggregationSpec
 
 
 class QueryExecuteRequest(BaseModel):
@@ -7,6 +9,32 @@ class QueryExecuteRequest(BaseModel):
 
     query: str = Field(..., description="SQL query to execute")
     limit: Optional[int] = Field(None, description="Maximum number of rows to return", gt=0)
+    aggregate: Optional[AggregationSpec] = Field(
+        None, description="Server-side grouping, subtotals and pivot applied to the result"
+    )
+    cache_ttl: Optional[int] = Field(
+        None,
+        description="Serve/store a small result from the host-wide shared cache for this many seconds",
+        gt=0,
+        le=86400,
+    )
+    language: Optional[str] = Field(
+        None,
+        description=(
+            "Caller's language (it_language code or id): {ln:field} placeholders and "
+            "wildcard selects of multilingual tables resolve to its _lnN columns, "
+            "falling back to _ln1 where empty"
+        ),
+    )
+
+
+class QueryMemoryInfo(BaseModel):
+    """Result memory usage of a query"""
+
+    peak_bytes: int = Field(..., description="Peak estimated result memory held in the process")
+    limit_bytes: int = Field(..., description="Per-query memory budget")
+    spilled: bool = Field(..., description="Whether rows were spilled to a temporary file")
+    spill_bytes: int = Field(0, description="Size of the spilled (JSON-encoded) rows")
 
 
 class QueryExecuteResponse(BaseModel):
@@ -19,3 +47,46 @@ class QueryExecuteResponse(BaseModel):
     row_count: Optional[int] = Field(None, description="Number of rows returned")
     query: Optional[str] = Field(None, description="The executed query")
     error: Optional[str] = Field(None, description="Error message if query failed")
+    omitted_columns: Optional[List[str]] = Field(
+        None, description="Binary (LOB) columns left out of the result data"
+    )
+    memory: Optional[QueryMemoryInfo] = Field(None, description="Result memory usage")
+    duration_ms: Optional[float] = Field(None, description="Time to execute and fetch the query")
+
+
+IsolationLevel = Literal["READ UNCOMMITTED", "READ COMMITTED", "REPEATABLE READ", "SERIALIZABLE"]
+
+
+class QueryBatchItem(BaseModel):
+    """One query of a batch"""
+
+    query: str = Field(..., description="SQL query to execute")
+    limit: Optional[int] = Field(None, description="Maximum number of rows to return", gt=0)
+    aggregate: Optional[AggregationSpec] = Field(
+        None, description="Server-side grouping, subtotals and pivot applied to the result"
+    )
+
+
+class QueryBatchRequest(BaseModel):
+    """Request model for executing several queries against one snapshot"""
+
+    queries: List[QueryBatchItem] = Field(..., min_length=1, description="Queries to execute")
+    isolation_level: Optional[IsolationLevel] = Field(
+        None, description="Transaction isolation (default: QUERY_ISOLATION_LEVEL or the server default)"
+    )
+    language: Optional[str] = Field(
+        None,
+        description=(
+            "Caller's language (it_language code or id): {ln:field} placeholders and "
+            "wildcard selects of multilingual tables resolve to its _lnN columns, "
+            "falling back to _ln1 where empty"
+        ),
+    )
+
+
+class QueryBatchResponse(BaseModel):
+    """Response model for a query batch; results are in request order"""
+
+    success: bool = Field(..., description="Whether every query executed successfully")
+    results: List[QueryExecuteResponse]
+    duration_ms: Optional[float] = Field(None, description="Time to execute the whole batch")
@@ -0,0 +1,315 @@
+from decimal import Decimal
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from schemas.aggregation_schemas import AggregationSpec, MeasureSpec
+
+ROW_TYPE_COLUMN = "_row_type"
+LEVEL_COLUMN = "_level"
+
+# Combined group keys are looked up in a dense array while the key space is
+# at most this many slots (or a few times the row count), else sorted
+DENSE_KEY_SPACE = 1 << 20
+
+
+def _sort_value(value: Any) -> Tuple[bool, str, Any]:
+    """Sort key that orders None last and never compares unlike types."""
+    return value is None, type(value).__name__, value
+
+
+class NumericColumn:
+    """
+    A measure column as a numeric NumPy array.
+
+    DECIMAL values are scaled to int64 by the column's largest number of
+    decimal places, so sums are exact; integers stay int64 and anything
+    else is summed as float64. Nulls are stored as 0 and tracked in valid.
+    When a sum of the scaled values could exceed int64 (largest magnitude
+    times row count), they are kept as Python ints in an object array
+    instead, which is slower but cannot overflow.
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.valid = np.not_equal(values, None).astype(bool)
+        present = values[self.valid]
+        types = set(map(type, present.tolist()))
+        self.scale = 0
+
+        if Decimal in types:
+            self.kind = "decimal"
+            self.scale = max(
+                (max(-v.as_tuple().exponent, 0) for v in present.tolist() if isinstance(v, Decimal)),
+                default=0,
+            )
+            self.array = _exact_array(
+                len(values), self.valid, [int(Decimal(v).scaleb(self.scale)) for v in present.tolist()]
+            )
+        elif all(issubclass(t, (int, np.integer)) for t in types):
+            self.kind = "int"
+            self.array = _exact_array(len(values), self.valid, [int(v) for v in present.tolist()])
+        elif all(issubclass(t, (int, float, np.number)) for t in types):
+            self.kind = "float"
+            self.array = np.where(self.valid, values, 0.0).astype(np.float64)
+        else:
+            raise ValueError("Column contains non-numeric values")
+
+    def to_python(self, value: Any) -> Any:
+        """Convert an aggregated array value back to the column's Python type."""
+        if self.kind == "decimal":
+            return Decimal(int(value)).scaleb(-self.scale)
+        if self.kind == "int":
+            return int(value)
+        return float(value)
+
+
+def _exact_array(length: int, valid: np.ndarray, values: List[int]) -> np.ndarray:
+    """
+    Place integer values at the valid positions of a zero-filled array.
+
+    The array is int64 when no sum of the values can overflow it, else an
+    object array of Python ints.
+    """
+    bound = max(map(abs, values), default=0) * len(values)
+    array = np.zeros(length, dtype=np.int64 if bound <= np.iinfo(np.int64).max else object)
+    array[valid] = np.array(values, dtype=array.dtype)
+    return array
+
+
+def _factorize(values: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Encode values as integer codes.
+
+    Returns:
+        Tuple of (code per row, distinct values in first-seen order)
+    """
+    uniques = list(dict.fromkeys(values))
+    lookup = {value: code for code, value in enumerate(uniques)}
+    codes = np.fromiter(map(lookup.__getitem__, values), dtype=np.int64, count=len(values))
+    return codes, uniques
+
+
+def _group_codes(
+    key_codes: List[np.ndarray], cardinalities: List[int], length: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Combine per-column key codes into one dense group id per row.
+
+    Returns:
+        Tuple of (group id per row, key codes of each group)
+    """
+    if not key_codes:
+        return np.zeros(length, dtype=np.int64), np.zeros((1, 0), dtype=np.int64)
+
+    space = 1
+    for cardinality in cardinalities:
+        space *= int(cardinality)
+
+    if space > np.iinfo(np.int64).max:
+        # The mixed-radix key would overflow int64; group on the code tuples
+        # instead (same lexicographic group order, slower)
+        uniques, group_ids = np.unique(np.stack(key_codes, axis=1), axis=0, return_inverse=True)
+        return group_ids.reshape(-1), uniques.astype(np.int64)
+
+    # Mixed-radix combination of the per-column codes
+    combined = np.zeros(length, dtype=np.int64)
+    for codes, cardinality in zip(key_codes, cardinalities):
+        combined = combined * cardinality + codes
+
+    if space <= max(DENSE_KEY_SPACE, 4 * length):
+        present = np.flatnonzero(np.bincount(combined, minlength=space))
+        lookup = np.empty(space, dtype=np.int64)
+        lookup[present] = np.arange(len(present))
+        group_ids = lookup[combined]
+    else:
+        present, group_ids = np.unique(combined, return_inverse=True)
+        group_ids = group_ids.reshape(-1)
+
+    uniques = np.empty((len(present), len(key_codes)), dtype=np.int64)
+    remainder = present.astype(np.int64)
+    for i in range(len(key_codes) - 1, -1, -1):
+        uniques[:, i] = remainder % cardinalities[i]
+        remainder = remainder // cardinalities[i]
+    return group_ids, uniques
+
+
+class AggregationService:
+    """
+    Service class for server-side grouping, subtotals and pivots.
+
+    Works on a result set column by column: group keys are factorized into
+    integer codes once, and every measure at every rollup level is computed
+    with vectorized NumPy reductions over those codes.
+    """
+
+    def aggregate(
+        self, columns: List[str], rows: Sequence[Sequence[Any]], spec: AggregationSpec
+    ) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+        """
+        Aggregate raw result rows according to spec.
+
+        Args:
+            columns: Result column names
+            rows: Raw result rows in column order
+            spec: Grouping / measure / rollup / pivot specification
+
+        Returns:
+            Tuple of (output columns, output rows in column order)
+
+        Raises:
+            ValueError: If the spec refers to unknown or non-numeric columns
+        """
+        index = {column: i for i, column in enumerate(columns)}
+        referenced = list(spec.group_by) + ([spec.pivot] if spec.pivot else [])
+        referenced += [measure.column for measure in spec.measures if measure.column != "*"]
+        unknown = [column for column in referenced if column not in index]
+        if unknown:
+            raise ValueError(f"Unknown column(s) in aggregation: {', '.join(unknown)}")
+        if spec.pivot and spec.pivot in spec.group_by:
+            raise ValueError("The pivot column cannot also be a group_by column")
+
+        length = len(rows)
+        transposed = list(zip(*rows)) if length else [()] * len(columns)
+        batch: Dict[str, np.ndarray] = {}
+        for column in dict.fromkeys(referenced):
+            batch[column] = np.empty(length, dtype=object)
+            batch[column][:] = transposed[index[column]]
+
+        # Factorize every key column once; levels reuse the codes
+        key_codes: Dict[str, np.ndarray] = {}
+        key_values: Dict[str, List[Any]] = {}
+        for column in spec.group_by + ([spec.pivot] if spec.pivot else []):
+            key_codes[column], key_values[column] = _factorize(transposed[index[column]])
+
+        numeric: Dict[str, NumericColumn] = {}
+        for measure in spec.measures:
+            if measure.column != "*" and measure.function != "count" and measure.column not in numeric:
+                try:
+                    numeric[measure.column] = NumericColumn(batch[measure.column])
+                except ValueError:
+                    raise ValueError(f"Column '{measure.column}' is not numeric and cannot be aggregated")
+
+        pivot_values = []
+        if spec.pivot:
+            pivot_values = sorted(key_values[spec.pivot], key=_sort_value)
+
+        measure_names = [measure.output_name for measure in spec.measures]
+        pivot_names = [
+            f"{pivot_value} - {name}" for pivot_value in pivot_values for name in measure_names
+        ]
+
+        depth = len(spec.group_by)
+        levels = range(depth, -1, -1) if spec.rollup else [depth]
+        aggregate_rows = []
+        for level in levels:
+            level_columns = spec.group_by[:level]
+            totals = self._aggregate_level(level_columns, key_codes, key_values, spec.measures, numeric, batch, length)
+            pivoted = {}
+            if spec.pivot:
+                by_pivot = self._aggregate_level(
+                    level_columns + [spec.pivot], key_codes, key_values, spec.measures, numeric, batch, length
+                )
+                for key, values in by_pivot.items():
+                    group_key, pivot_value = key[:-1], key[-1]
+                    for name, value in zip(measure_names, values):
+                        pivoted.setdefault(group_key, {})[f"{pivot_value} - {name}"] = value
+
+            for key, values in totals.items():
+                if level == depth:
+                    row_type = "subtotal" if spec.include_detail else "group"
+                else:
+                    row_type = "total" if level == 0 else "subtotal"
+                record = dict(zip(level_columns, key))
+                record.update(pivoted.get(key, {}))
+                record.update(zip(measure_names, values))
+                record[ROW_TYPE_COLUMN] = row_type
+                record[LEVEL_COLUMN] = level
+                sort_key = tuple(
+                    (0, _sort_value(key[i])) if i < level else (1,) for i in range(depth)
+                ) + ((1,),)
+                aggregate_rows.append((sort_key, record))
+
+        if spec.include_detail:
+            output_columns = list(columns) + [
+                name for name in pivot_names + measure_names if name not in index
+            ]
+            group_index = [index[column] for column in spec.group_by]
+            for i, row in enumerate(rows):
+                record = dict(zip(columns, row))
+                record[ROW_TYPE_COLUMN] = "detail"
+                record[LEVEL_COLUMN] = depth + 1
+                sort_key = tuple((0, _sort_value(row[j])) for j in group_index) + ((0, i),)
+                aggregate_rows.append((sort_key, record))
+        else:
+            output_columns = list(spec.group_by) + pivot_names + measure_names
+
+        output_columns += [ROW_TYPE_COLUMN, LEVEL_COLUMN]
+        aggregate_rows.sort(key=lambda item: item[0])
+        return output_columns, [
+            tuple(record.get(column) for column in output_columns) for _, record in aggregate_rows
+        ]
+
+    def _aggregate_level(
+        self,
+        level_columns: List[str],
+        key_codes: Dict[str, np.ndarray],
+        key_values: Dict[str, List[Any]],
+        measures: List[MeasureSpec],
+        numeric: Dict[str, NumericColumn],
+        batch: Dict[str, np.ndarray],
+        length: int,
+    ) -> Dict[Tuple[Any, ...], List[Any]]:
+        codes, uniques = _group_codes(
+            [key_codes[column] for column in level_columns],
+            [max(len(key_values[column]), 1) for column in level_columns],
+            length,
+        )
+        group_count = len(uniques)
+
+        results: List[List[Any]] = [[None] * len(measures) for _ in range(group_count)]
+        for m, measure in enumerate(measures):
+            if measure.function == "count":
+                if measure.column == "*":
+                    counts = np.bincount(codes, minlength=group_count)
+                else:
+                    valid = np.not_equal(batch[measure.column], None).astype(bool)
+                    counts = np.bincount(codes[valid], minlength=group_count)
+                for g in range(group_count):
+                    results[g][m] = int(counts[g])
+                continue
+
+            column = numeric[measure.column]
+            valid_codes = codes[column.valid]
+            valid_values = column.array[column.valid]
+            counts = np.bincount(valid_codes, minlength=group_count)
+            is_int = column.array.dtype == np.int64
+
+            if measure.function in ("sum", "avg"):
+                reduced = np.zeros(group_count, dtype=column.array.dtype)
+                np.add.at(reduced, valid_codes, valid_values)
+            elif measure.function == "min":
+                initial = np.iinfo(np.int64).max if is_int else np.inf
+                reduced = np.full(group_count, initial, dtype=column.array.dtype)
+                np.minimum.at(reduced, valid_codes, valid_values)
+            else:
+                initial = np.iinfo(np.int64).min if is_int else -np.inf
+                reduced = np.full(group_count, initial, dtype=column.array.dtype)
+                np.maximum.at(reduced, valid_codes, valid_values)
+
+            # Groups with no non-null values keep None, as in SQL
+            for g in np.flatnonzero(counts).tolist():
+                value = column.to_python(reduced[g])
+                if measure.function == "avg":
+                    if column.kind == "decimal":
+                        value = value / Decimal(int(counts[g]))
+                    else:
+                        value = float(value) / int(counts[g])
+                results[g][m] = value
+
+        return {
+            tuple(key_values[column][code] for column, code in zip(level_columns, unique_row)): results[g]
+            for g, unique_row in enumerate(uniques.tolist())
+        }
+
+
+aggregation_service = AggregationService()
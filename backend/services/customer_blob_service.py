@@ -0,0 +1,221 @@
+from datetime import datetime
+from typing import NamedTuple, Optional, Tuple
+import hashlib
+import io
+import logging
+import os
+import threading
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+from starlette.concurrency import run_in_threadpool
+
+from config.config import settings
+from models.ci_customer import CiCustomer, LOB_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+_MAGIC_MEDIA_TYPES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+]
+
+
+class BlobInfo(NamedTuple):
+    """Cheap metadata about a customer LOB, read without fetching the bytes"""
+
+    customer_id: int
+    kind: str
+    length: int
+    last_modified: Optional[datetime]
+    etag: str
+
+
+def detect_media_type(content: bytes) -> str:
+    """Guess an image media type from the leading bytes."""
+    for magic, media_type in _MAGIC_MEDIA_TYPES:
+        if content.startswith(magic):
+            return media_type
+    if content[:4] == b"RIFF" and content[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+def parse_range(header: str, length: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range HTTP Range header.
+
+    Args:
+        header: Value of the Range header, e.g. "bytes=0-1023" or "bytes=-500"
+        length: Total size of the content
+
+    Returns:
+        Inclusive (start, end) byte positions, or None if the header is not a
+        single byte range (in which case the full content is served)
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if start_text == "":
+            suffix = int(end_text)
+            if suffix <= 0:
+                raise ValueError("Empty suffix range")
+            start, end = max(length - suffix, 0), length - 1
+        else:
+            start = int(start_text)
+            end = int(end_text) if end_text else length - 1
+    except ValueError:
+        raise ValueError(f"Invalid range: {header}")
+
+    end = min(end, length - 1)
+    if start > end or start >= length:
+        raise ValueError(f"Range not satisfiable: {header}")
+    return start, end
+
+
+class CustomerBlobService:
+    """
+    Service class for serving customer photo and signature LOBs.
+
+    Metadata (length and m_at) is read first so conditional requests are
+    answered without transferring the bytes. Thumbnails are generated on
+    demand and kept in a size-bounded on-disk cache, evicting the least
+    recently used files first.
+    """
+
+    def __init__(self, cache_dir: str = settings.CUSTOMER_BLOB_CACHE_DIR,
+                 max_cache_bytes: int = settings.CUSTOMER_BLOB_CACHE_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = max_cache_bytes
+        self._cache_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    async def get_info(self, session: AsyncSession, customer_id: int, kind: str) -> Optional[BlobInfo]:
+        """
+        Get metadata for a customer's photo or signature.
+
+        Returns:
+            BlobInfo, or None if the customer or the LOB does not exist
+        """
+        if kind not in LOB_COLUMNS:
+            raise ValueError(f"Unknown customer blob '{kind}'")
+
+        column = getattr(CiCustomer, kind)
+        statement = select(func.length(column), CiCustomer.m_at).where(CiCustomer.id == customer_id)
+        result = await session.execute(statement)
+        row = result.one_or_none()
+        if row is None or not row[0]:
+            return None
+
+        length, last_modified = row
+        version = int(last_modified.timestamp()) if last_modified else 0
+        return BlobInfo(
+            customer_id=customer_id,
+            kind=kind,
+            length=length,
+            last_modified=last_modified,
+            etag=f'"{kind}-{customer_id}-{version}-{length}"',
+        )
+
+    async def get_content(self, session: AsyncSession, info: BlobInfo) -> bytes:
+        """Fetch the LOB bytes described by info."""
+        column = getattr(CiCustomer, info.kind)
+        result = await session.execute(select(column).where(CiCustomer.id == info.customer_id))
+        return result.scalar_one_or_none() or b""
+
+    async def get_thumbnail(self, session: AsyncSession, info: BlobInfo, size: int) -> bytes:
+        """
+        Get a JPEG thumbnail no larger than size x size, using the disk cache.
+
+        Raises:
+            ValueError: If the stored LOB is not an image Pillow can decode
+        """
+        digest = hashlib.sha1(info.etag.encode("utf-8")).hexdigest()[:12]
+        path = os.path.join(
+            self.cache_dir, f"{info.customer_id}-{info.kind}-{digest}-{size}.jpg"
+        )
+
+        cached = await run_in_threadpool(self._read_cached, path)
+        if cached is not None:
+            return cached
+
+        content = await self.get_content(session, info)
+        try:
+            thumbnail = await run_in_threadpool(self._make_thumbnail, content, size)
+        except OSError as e:
+            # UnidentifiedImageError (not an image) and truncated/corrupt data
+            # both surface as OSError; nothing is written to the cache
+            logger.warning(
+                f"Cannot thumbnail {info.kind} of customer {info.customer_id}: {str(e)}"
+            )
+            raise ValueError(f"Customer {info.customer_id} {info.kind} is not a readable image")
+        await run_in_threadpool(self._write_cached, path, thumbnail)
+        return thumbnail
+
+    def _make_thumbnail(self, content: bytes, size: int) -> bytes:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(content)) as image:
+            image.thumbnail((size, size))
+            output = io.BytesIO()
+            image.convert("RGB").save(output, format="JPEG", quality=85)
+            return output.getvalue()
+
+    def _read_cached(self, path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+            # Touch so eviction sees the file as recently used
+            os.utime(path)
+            return content
+        except FileNotFoundError:
+            return None
+
+    def _write_cached(self, path: str, content: bytes) -> None:
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if self._cache_bytes is None:
+                self._cache_bytes = sum(
+                    entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.is_file()
+                )
+
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+            self._cache_bytes += len(content)
+
+            if self._cache_bytes > self.max_cache_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(
+            (entry for entry in os.scandir(self.cache_dir) if entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        total = sum(entry.stat().st_size for entry in entries)
+        target = int(self.max_cache_bytes * 0.9)
+        for entry in entries:
+            if total <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except FileNotFoundError:
+                continue
+        self._cache_bytes = total
+        logger.info(f"Evicted customer blob cache down to {total} bytes")
+
+
+customer_blob_service = CustomerBlobService()
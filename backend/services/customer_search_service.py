@@ -0,0 +1,351 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import asyncio
+import heapq
+import itertools
+import logging
+import re
+import time
+
+from sqlalchemy import DateTime, literal, or_
+from sqlmodel import select
+
+from config.config import settings
+from config.database import AsyncSessionLocal, database_now
+from models.ci_customer import CiCustomer
+from schemas.customer_schemas import CustomerSearchResult
+
+logger = logging.getLogger(__name__)
+
+# Scores for how a query token matched a customer; a result's score is the sum
+# over all query tokens, so "perera 0771" ranks customers matching both first.
+SCORE_IDENTIFIER_EXACT = 100
+SCORE_IDENTIFIER_PREFIX = 80
+SCORE_NAME_EXACT = 60
+SCORE_NAME_PREFIX = 50
+SCORE_SUBSTRING = 30
+
+_IDENTIFIER_STRIP = re.compile(r"[\s\-/.]+")
+_NAME_SPLIT = re.compile(r"[\s,.;:()/\\\-'\"]+")
+
+
+class CustomerDoc(NamedTuple):
+    """Searchable projection of a ci_customer row"""
+
+    id: int
+    customer_number: Optional[str]
+    full_name_ln1: Optional[str]
+    full_name_ln2: Optional[str]
+    full_name_ln3: Optional[str]
+    nic: Optional[str]
+    mobile_1: Optional[str]
+    mobile_2: Optional[str]
+    branch_id: Optional[int]
+    customer_type_id: Optional[int]
+    status: Optional[int]
+    identifiers: Tuple[str, ...]
+    name_tokens: Tuple[str, ...]
+
+
+SEARCH_COLUMNS = [
+    CiCustomer.id,
+    CiCustomer.customer_number,
+    CiCustomer.full_name_ln1,
+    CiCustomer.full_name_ln2,
+    CiCustomer.full_name_ln3,
+    CiCustomer.nic,
+    CiCustomer.mobile_1,
+    CiCustomer.mobile_2,
+    CiCustomer.branch_id,
+    CiCustomer.customer_type_id,
+    CiCustomer.status,
+    CiCustomer.c_at,
+    CiCustomer.m_at,
+]
+
+
+def normalize_identifier(value: Optional[str]) -> str:
+    """Lowercase an identifier and drop separators (spaces, dashes, slashes, dots)."""
+    return _IDENTIFIER_STRIP.sub("", value).lower() if value else ""
+
+
+def tokenize_name(value: Optional[str]) -> List[str]:
+    """Split a name into lowercase word tokens."""
+    return [token for token in _NAME_SPLIT.split(value.lower()) if token] if value else []
+
+
+def _grams(token: str) -> Iterable[str]:
+    """Index keys for a token: a 2-character prefix key plus all trigrams."""
+    if len(token) >= 2:
+        yield "^" + token[:2]
+    for i in range(len(token) - 2):
+        yield token[i:i + 3]
+
+
+class CustomerSearchService:
+    """
+    Service class for type-ahead customer search over an in-memory n-gram index.
+
+    Customer numbers, NICs, mobile numbers and the three language name
+    columns are indexed by trigram (substring search) and by 2-character
+    token prefix (short queries). The index is built from a streamed scan
+    at startup and then kept current by re-indexing rows whose c_at/m_at
+    moved past the last watermark. Deleted customers leave no c_at/m_at
+    trace, so the whole index is rebuilt every
+    CUSTOMER_SEARCH_REBUILD_SECONDS and swapped in.
+    """
+
+    def __init__(self):
+        self._docs: Dict[int, CustomerDoc] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._watermark: Optional[datetime] = None
+        self._built_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def index_row(self, row) -> None:
+        """Add or replace a customer in the index."""
+        identifiers = tuple(
+            value for value in (
+                normalize_identifier(row.customer_number),
+                normalize_identifier(row.nic),
+                normalize_identifier(row.mobile_1),
+                normalize_identifier(row.mobile_2),
+            ) if value
+        )
+        name_tokens = tuple(dict.fromkeys(
+            token
+            for name in (row.full_name_ln1, row.full_name_ln2, row.full_name_ln3)
+            for token in tokenize_name(name)
+        ))
+        doc = CustomerDoc(
+            id=row.id,
+            customer_number=row.customer_number,
+            full_name_ln1=row.full_name_ln1,
+            full_name_ln2=row.full_name_ln2,
+            full_name_ln3=row.full_name_ln3,
+            nic=row.nic,
+            mobile_1=row.mobile_1,
+            mobile_2=row.mobile_2,
+            branch_id=row.branch_id,
+            customer_type_id=row.customer_type_id,
+            status=row.status,
+            identifiers=identifiers,
+            name_tokens=name_tokens,
+        )
+
+        previous = self._docs.get(doc.id)
+        if previous is not None:
+            self._unindex(previous)
+
+        self._docs[doc.id] = doc
+        for token in doc.identifiers + doc.name_tokens:
+            for gram in _grams(token):
+                self._postings.setdefault(gram, set()).add(doc.id)
+
+    def _unindex(self, doc: CustomerDoc) -> None:
+        for token in doc.identifiers + doc.name_tokens:
+            for gram in _grams(token):
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard(doc.id)
+                    if not posting:
+                        del self._postings[gram]
+
+    def search(
+        self,
+        query: str,
+        branch_id: Optional[int] = None,
+        customer_type_id: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> Tuple[List[CustomerSearchResult], int, bool]:
+        """
+        Search customers by number, NIC, mobile or name.
+
+        At most CUSTOMER_SEARCH_MAX_CANDIDATES index candidates are scored.
+        Short queries such as "07" can match most customers; those are cut
+        off early and reported as truncated rather than scored in full.
+
+        Args:
+            query: Free text; every whitespace-separated token must match
+            branch_id: Optional branch filter
+            customer_type_id: Optional customer type filter
+            page: 1-based page number
+            page_size: Results per page
+
+        Returns:
+            Tuple of (ranked results for the page, total matching count,
+            whether candidates were cut off)
+        """
+        query_tokens = [
+            normalize_identifier(token) for token in query.split()
+        ]
+        query_tokens = [token for token in query_tokens if len(token) >= 2]
+        if not query_tokens:
+            return [], 0, False
+
+        keys = {
+            key
+            for token in query_tokens
+            for key in (["^" + token[:2]] if len(token) < 3 else [token[i:i + 3] for i in range(len(token) - 2)])
+        }
+        postings = sorted((self._postings.get(key, set()) for key in keys), key=len)
+        # Intersecting from the smallest posting never copies the large ones
+        candidates: Set[int] = postings[0].intersection(*postings[1:])
+        if not candidates:
+            return [], 0, False
+
+        truncated = len(candidates) > settings.CUSTOMER_SEARCH_MAX_CANDIDATES
+        scored = []
+        for doc_id in itertools.islice(candidates, settings.CUSTOMER_SEARCH_MAX_CANDIDATES):
+            doc = self._docs[doc_id]
+            if branch_id is not None and doc.branch_id != branch_id:
+                continue
+            if customer_type_id is not None and doc.customer_type_id != customer_type_id:
+                continue
+            score = self._score(doc, query_tokens)
+            if score:
+                scored.append((-score, doc.full_name_ln1 or "", doc.id, score))
+
+        total_count = len(scored)
+        top = heapq.nsmallest(page * page_size, scored)[(page - 1) * page_size:]
+        results = [
+            CustomerSearchResult(
+                score=score,
+                **{
+                    name: getattr(self._docs[doc_id], name)
+                    for name in CustomerSearchResult.model_fields if name != "score"
+                },
+            )
+            for _, _, doc_id, score in top
+        ]
+        return results, total_count, truncated
+
+    def _score(self, doc: CustomerDoc, query_tokens: List[str]) -> int:
+        total = 0
+        for token in query_tokens:
+            best = 0
+            for identifier in doc.identifiers:
+                if identifier == token:
+                    best = SCORE_IDENTIFIER_EXACT
+                    break
+                if identifier.startswith(token):
+                    best = max(best, SCORE_IDENTIFIER_PREFIX)
+                elif len(token) >= 3 and token in identifier:
+                    best = max(best, SCORE_SUBSTRING)
+            if best < SCORE_NAME_EXACT:
+                for name_token in doc.name_tokens:
+                    if name_token == token:
+                        best = SCORE_NAME_EXACT
+                        break
+                    if name_token.startswith(token):
+                        best = max(best, SCORE_NAME_PREFIX)
+                    elif len(token) >= 3 and token in name_token:
+                        best = max(best, SCORE_SUBSTRING)
+            if not best:
+                # Trigram candidates can be false positives; every token must match
+                return 0
+            total += best
+        return total
+
+    async def build(self) -> None:
+        """
+        Build a new index from a full streamed scan of ci_customer and swap it in.
+
+        The scan fills a separate index, so searches keep hitting the current
+        one until the swap; customers deleted since the last build drop out.
+        """
+        index = CustomerSearchService()
+        await index._load(select(*SEARCH_COLUMNS))
+        self._docs, self._postings, self._watermark = index._docs, index._postings, index._watermark
+        self._built_at = time.monotonic()
+        self.ready = True
+        logger.info(f"Customer search index built ({len(self._docs)} customers)")
+
+    async def refresh(self) -> int:
+        """
+        Re-index customers created or modified since the watermark.
+
+        The watermark is the database clock when the previous scan started,
+        moved back by CUSTOMER_SEARCH_WATERMARK_LAG_SECONDS so rows committed
+        by transactions still open at that moment are not missed.
+
+        Returns:
+            Number of rows re-indexed
+        """
+        if self._watermark is None:
+            await self.build()
+            return len(self._docs)
+
+        # Bound as a plain DateTime: the database clock is naive, and SQLModel's
+        # column type only accepts timezone-aware values
+        since = literal(
+            self._watermark - timedelta(seconds=settings.CUSTOMER_SEARCH_WATERMARK_LAG_SECONDS),
+            DateTime(),
+        )
+        statement = select(*SEARCH_COLUMNS).where(
+            or_(CiCustomer.m_at > since, CiCustomer.c_at > since)
+        )
+        return await self._load(statement)
+
+    def rebuild_due(self) -> bool:
+        """Whether the periodic full rebuild is due."""
+        return (
+            self._built_at is None
+            or time.monotonic() - self._built_at >= settings.CUSTOMER_SEARCH_REBUILD_SECONDS
+        )
+
+    async def _load(self, statement) -> int:
+        count = 0
+        async with AsyncSessionLocal() as session:
+            started_at = await database_now(session)
+            result = await session.stream(
+                statement.execution_options(yield_per=settings.CUSTOMER_SEARCH_BATCH_SIZE)
+            )
+            async for partition in result.partitions():
+                for row in partition:
+                    self.index_row(row)
+                count += len(partition)
+                # Yield between batches so a large build does not stall requests
+                await asyncio.sleep(0)
+        self._watermark = started_at
+        return count
+
+    async def start(self) -> None:
+        """Start building the index and then keep it current in the background."""
+        if settings.CUSTOMER_SEARCH_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background builder/refresher."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        try:
+            await self.build()
+        except Exception as e:
+            logger.warning(f"Failed to build customer search index: {str(e)}")
+        while True:
+            await asyncio.sleep(settings.CUSTOMER_SEARCH_REFRESH_SECONDS)
+            try:
+                if self.rebuild_due():
+                    await self.build()
+                    continue
+                updated = await self.refresh()
+                if updated:
+                    logger.info(f"Customer search index refreshed ({updated} rows)")
+            except Exception as e:
+                logger.warning(f"Failed to refresh customer search index: {str(e)}")
+
+
+customer_search_service = CustomerSearchService()
@@ -0,0 +1,517 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import hashlib
+import logging
+import re
+
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Composite indexes wider than this rarely pay for their write cost
+MAX_INDEX_COLUMNS = 4
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+_BIND_PARAMETER = re.compile(r"(?<![:\w]):\w+|%s|%\(\w+\)s")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_QUOTED_IDENTIFIER = re.compile(r"`([^`]*)`")
+
+_CLAUSE_KEYWORDS = ("select", "from", "where", "group by", "having", "order by", "limit", "union", "for update")
+_JOIN_SPLIT = re.compile(
+    r",|\b(?:natural\s+)?(?:(?:left|right|full)\s+(?:outer\s+)?|inner\s+|cross\s+)?join\b|\bstraight_join\b"
+)
+_TABLE_REFERENCE = re.compile(r"^\s*([\w.$]+)(?:\s+(?:as\s+)?(\w+))?")
+_COLUMN = r"(?:(\w+)\.)?([a-z_]\w*)"
+_EQUALITY = re.compile(_COLUMN + r"\s*(?:(?<![<>!])=(?!\s*(?:\w+\.)?[a-z_]\w*\b(?!\s*\())|<=>|\bin\s*\(|\bis\s+null\b)")
+_RANGE = re.compile(_COLUMN + r"\s*(?:<=|>=|<(?!>)|>|\bbetween\b|\blike\s+'\?')")
+_COLUMN_PAIR = re.compile(_COLUMN + r"\s*=\s*" + _COLUMN + r"\b(?!\s*\()")
+_ORDER_ITEM = re.compile(r"^\s*" + _COLUMN + r"(?:\s+(?:asc|desc))?\s*$")
+
+# Words the column patterns can match that are never column names
+_NOT_COLUMNS = {
+    "and", "or", "not", "null", "is", "in", "on", "as", "between", "like", "exists", "case",
+    "when", "then", "else", "end", "select", "where", "true", "false", "interval", "distinct",
+}
+_NON_ALIAS_KEYWORDS = {
+    "where", "left", "right", "inner", "outer", "cross", "full", "natural", "join", "straight_join",
+    "on", "using", "group", "order", "having", "limit", "union", "window", "for", "lock", "force", "use", "ignore",
+}
+
+
+def normalize_query(sql: str) -> str:
+    """
+    Reduce a query to its shape: literals and bind parameters become ?,
+    IN lists collapse to (?), whitespace and case are normalized.
+
+    LIKE patterns keep whether they start with a wildcard ('%?'), since
+    only prefix patterns can use an index.
+    """
+    sql = _STRING_LITERAL.sub(lambda m: "'%?'" if m.group(0)[1:2] == "%" else "'?'", sql)
+    # Quoted identifiers: plain names lose their quotes, aliases with spaces become one token
+    sql = _QUOTED_IDENTIFIER.sub(lambda m: m.group(1) if re.fullmatch(r"[\w$]+", m.group(1)) else "quoted_alias", sql)
+    sql = _BIND_PARAMETER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _VALUE_LIST.sub("(?)", sql)
+    return " ".join(sql.split()).lower().rstrip(";")
+
+
+def fingerprint_id(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class QueryStats:
+    """Observed executions of one query shape"""
+
+    fingerprint: str
+    normalized: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+@dataclass
+class QueryShape:
+    """Index-relevant parts of one SELECT (subqueries are parsed separately)"""
+
+    tables: Dict[str, str] = field(default_factory=dict)  # alias (or name) -> table
+    equality: List[Tuple[Optional[str], str]] = field(default_factory=list)
+    ranges: List[Tuple[Optional[str], str]] = field(default_factory=list)
+    joins: List[Tuple[Optional[str], str]] = field(default_factory=list)
+    sort: List[Tuple[Optional[str], str]] = field(default_factory=list)
+
+
+def _split_top_level(sql: str) -> Tuple[str, List[str]]:
+    """
+    Replace parenthesized subqueries with a placeholder.
+
+    Returns:
+        Tuple of (outer query, subquery texts)
+    """
+    subqueries: List[str] = []
+    output: List[str] = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(sql):
+        if char == "(":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == ")" and depth:
+            depth -= 1
+            if depth == 0:
+                inner = sql[start + 1:i]
+                if inner.lstrip().startswith("select"):
+                    subqueries.append(inner)
+                    output.append("(subquery)")
+                else:
+                    output.append(sql[start:i + 1])
+        elif depth == 0:
+            output.append(char)
+    return "".join(output), subqueries
+
+
+def _clauses(sql: str) -> Dict[str, str]:
+    """Split a (subquery-free) SELECT into its clauses, ignoring text inside parentheses."""
+    positions: List[Tuple[int, str]] = []
+    depth = 0
+    for i, char in enumerate(sql):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        elif depth == 0 and (i == 0 or not (sql[i - 1].isalnum() or sql[i - 1] == "_")):
+            for keyword in _CLAUSE_KEYWORDS:
+                end = i + len(keyword)
+                if sql.startswith(keyword, i) and (end == len(sql) or not (sql[end].isalnum() or sql[end] == "_")):
+                    positions.append((i, keyword))
+                    break
+    clauses: Dict[str, str] = {}
+    for index, (position, keyword) in enumerate(positions):
+        end = positions[index + 1][0] if index + 1 < len(positions) else len(sql)
+        # The first occurrence wins (a UNION's second branch is parsed on its own)
+        clauses.setdefault(keyword, sql[position + len(keyword):end])
+    return clauses
+
+
+def _columns(pattern: re.Pattern, text_: str) -> List[Tuple[Optional[str], str]]:
+    return [
+        (qualifier or None, column)
+        for qualifier, column in pattern.findall(text_)
+        if column not in _NOT_COLUMNS
+    ]
+
+
+def parse_query(normalized: str) -> List[QueryShape]:
+    """
+    Extract the tables and the WHERE/JOIN/ORDER BY/GROUP BY columns of a
+    normalized query, one shape per SELECT (outer query, subqueries and
+    UNION branches).
+    """
+    shapes: List[QueryShape] = []
+    outer, subqueries = _split_top_level(normalized)
+    for branch in re.split(r"\bunion(?:\s+all)?\b", outer):
+        shape = QueryShape()
+        clauses = _clauses(branch.strip())
+
+        for segment in _JOIN_SPLIT.split(clauses.get("from", "")):
+            condition = ""
+            match = re.search(r"\b(on|using)\b", segment)
+            if match:
+                segment, condition = segment[:match.start()], segment[match.start():]
+            reference = _TABLE_REFERENCE.match(segment)
+            if not reference or reference.group(1) == "subquery":
+                continue
+            table = reference.group(1).split(".")[-1]
+            alias = reference.group(2) if reference.group(2) and reference.group(2) not in _NON_ALIAS_KEYWORDS else table
+            shape.tables[alias] = table
+            if condition.startswith("using"):
+                for column in re.findall(r"\w+", condition[len("using"):]):
+                    shape.joins.append((alias, column))
+            elif condition:
+                for left_q, left_c, right_q, right_c in _COLUMN_PAIR.findall(condition):
+                    shape.joins.extend(((left_q or None, left_c), (right_q or None, right_c)))
+                shape.equality.extend(_columns(_EQUALITY, condition[2:]))
+                shape.ranges.extend(_columns(_RANGE, condition[2:]))
+
+        where = clauses.get("where", "")
+        for left_q, left_c, right_q, right_c in _COLUMN_PAIR.findall(where):
+            # Implicit (comma) joins
+            shape.joins.extend(((left_q or None, left_c), (right_q or None, right_c)))
+        shape.equality.extend(_columns(_EQUALITY, where))
+        shape.ranges.extend(_columns(_RANGE, where))
+
+        for keyword in ("group by", "order by"):
+            items = [_ORDER_ITEM.match(item) for item in clauses.get(keyword, "").split(",")]
+            if items and all(items):
+                shape.sort = [(item.group(1) or None, item.group(2)) for item in items]
+                break
+
+        if shape.tables:
+            shapes.append(shape)
+    for subquery in subqueries:
+        shapes.extend(parse_query(subquery))
+    return shapes
+
+
+@dataclass
+class Candidate:
+    """A suggested index and the workload it would serve"""
+
+    table: str
+    columns: Tuple[str, ...]
+    equality_count: int
+    fingerprints: Dict[str, QueryStats] = field(default_factory=dict)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(stats.total_ms for stats in self.fingerprints.values())
+
+    @property
+    def query_count(self) -> int:
+        return sum(stats.count for stats in self.fingerprints.values())
+
+
+def covers(index_columns: Iterable[str], candidate: Candidate) -> bool:
+    """
+    Whether an index with these leading columns serves the candidate.
+
+    The candidate's equality columns may appear in any order; its
+    remaining (sort/range) columns must follow in order.
+    """
+    index_columns = list(index_columns)
+    columns = candidate.columns
+    if len(index_columns) < len(columns):
+        return False
+    head = candidate.equality_count
+    return set(index_columns[:head]) == set(columns[:head]) and index_columns[head:len(columns)] == list(columns[head:])
+
+
+def index_ddl(table: str, columns: Tuple[str, ...]) -> Tuple[str, str]:
+    """CREATE INDEX statement and index name for a suggestion."""
+    name = f"ix_{table}_{'_'.join(columns)}"
+    if len(name) > 64:
+        name = f"{name[:55]}_{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+    column_list = ", ".join(f"`{column}`" for column in columns)
+    return f"CREATE INDEX `{name}` ON `{table}` ({column_list});", name
+
+
+class IndexAdvisorService:
+    """
+    Service class for suggesting indexes from the observed query workload.
+
+    Executed queries are recorded cheaply as (fingerprint, count, latency).
+    On request, each fingerprint is parsed for the columns its WHERE, JOIN
+    and ORDER BY/GROUP BY clauses filter, join and sort on, and turned into
+    a composite index candidate per table (equality columns, then join,
+    then sort, then one range column). Candidates already served by an
+    existing index (per information_schema) are dropped; the rest are
+    merged across queries and ranked by the total time spent in the
+    queries they would serve.
+    """
+
+    def __init__(self, max_fingerprints: Optional[int] = None):
+        self.max_fingerprints = max_fingerprints or settings.INDEX_ADVISOR_MAX_FINGERPRINTS
+        self._stats: "OrderedDict[str, QueryStats]" = OrderedDict()
+        self._shapes: Dict[str, List[QueryShape]] = {}
+
+    def record(self, sql: str, duration_ms: float) -> None:
+        """Record one execution of a query (called by the executors)."""
+        if not settings.INDEX_ADVISOR_ENABLED:
+            return
+        normalized = normalize_query(sql)
+        key = fingerprint_id(normalized)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = QueryStats(key, normalized)
+            while len(self._stats) > self.max_fingerprints:
+                evicted, _ = self._stats.popitem(last=False)
+                self._shapes.pop(evicted, None)
+        else:
+            self._stats.move_to_end(key)
+        stats.count += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self._shapes.clear()
+
+    def workload(self) -> List[QueryStats]:
+        return list(self._stats.values())
+
+    async def performance_schema_workload(self, session: AsyncSession, limit: int = 200) -> List[QueryStats]:
+        """
+        The server's own statement digests for this schema (all workers and
+        clients), heaviest first.
+
+        Raises:
+            ValueError: If performance_schema is not available
+        """
+        if session.bind.dialect.name != "mysql":
+            raise ValueError("performance_schema is only available on MySQL")
+        try:
+            result = await session.execute(
+                text(
+                    "SELECT DIGEST_TEXT, COUNT_STAR, SUM_TIMER_WAIT / 1000000000, MAX_TIMER_WAIT / 1000000000 "
+                    "FROM performance_schema.events_statements_summary_by_digest "
+                    "WHERE SCHEMA_NAME = DATABASE() AND DIGEST_TEXT LIKE 'SELECT%' "
+                    "ORDER BY SUM_TIMER_WAIT DESC LIMIT :limit"
+                ),
+                {"limit": limit},
+            )
+        except Exception as e:
+            raise ValueError(f"performance_schema is not available: {str(e)}")
+        workload = []
+        for digest_text, count, total_ms, max_ms in result.fetchall():
+            normalized = normalize_query(digest_text)
+            workload.append(QueryStats(fingerprint_id(normalized), normalized, int(count), float(total_ms), float(max_ms)))
+        return workload
+
+    async def suggest(
+        self,
+        session: AsyncSession,
+        workload: Optional[List[QueryStats]] = None,
+        min_count: int = 1,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        Rank composite index suggestions for a workload.
+
+        Args:
+            session: Database session (for information_schema)
+            workload: Query statistics (default: queries recorded in this process)
+            min_count: Ignore query shapes executed fewer times
+            limit: Maximum number of suggestions
+
+        Returns:
+            Dict with the ranked suggestions and workload totals
+        """
+        workload = [stats for stats in (workload if workload is not None else self.workload()) if stats.count >= min_count]
+        parsed = [(stats, self._parse(stats)) for stats in workload]
+        tables = sorted({table for _, shapes in parsed for shape in shapes for table in shape.tables.values()})
+        columns, indexes = await self._schema(session, tables)
+
+        candidates: Dict[Tuple[str, Tuple[str, ...]], Candidate] = {}
+        for stats, shapes in parsed:
+            for shape in shapes:
+                for candidate in self._candidates(shape, columns, indexes):
+                    merged = candidates.setdefault((candidate.table, candidate.columns), candidate)
+                    merged.fingerprints[stats.fingerprint] = stats
+
+        # Drop candidates an existing index already serves, then fold
+        # candidates into wider ones that serve them as a prefix
+        pending = [
+            candidate for candidate in candidates.values()
+            if not any(covers(index_columns, candidate) for index_columns in indexes.get(candidate.table, {}).values())
+        ]
+        pending.sort(key=lambda candidate: len(candidate.columns), reverse=True)
+        suggestions: List[Candidate] = []
+        for candidate in pending:
+            wider = next(
+                (kept for kept in suggestions if kept.table == candidate.table and covers(kept.columns, candidate)),
+                None,
+            )
+            if wider is not None:
+                wider.fingerprints.update(candidate.fingerprints)
+            else:
+                suggestions.append(candidate)
+        suggestions.sort(key=lambda candidate: (candidate.total_ms, candidate.query_count), reverse=True)
+
+        return {
+            "suggestions": [self._describe(candidate, indexes) for candidate in suggestions[:limit]],
+            "fingerprints_analyzed": len(workload),
+            "tables_analyzed": tables,
+        }
+
+    def _parse(self, stats: QueryStats) -> List[QueryShape]:
+        shapes = self._shapes.get(stats.fingerprint)
+        if shapes is None:
+            try:
+                shapes = parse_query(stats.normalized)
+            except Exception as e:
+                logger.warning(f"Index advisor could not parse query {stats.fingerprint}: {str(e)}")
+                shapes = []
+            if stats.fingerprint in self._stats:
+                self._shapes[stats.fingerprint] = shapes
+        return shapes
+
+    def _candidates(
+        self,
+        shape: QueryShape,
+        columns: Dict[str, Set[str]],
+        indexes: Dict[str, Dict[str, List[str]]],
+    ) -> List[Candidate]:
+        def resolve(qualifier: Optional[str], column: str) -> Optional[str]:
+            if qualifier:
+                table = shape.tables.get(qualifier)
+                return table if table and column in columns.get(table, ()) else None
+            owners = [table for table in set(shape.tables.values()) if column in columns.get(table, ())]
+            return owners[0] if len(owners) == 1 else None
+
+        per_table: Dict[str, Dict[str, List[str]]] = {}
+        for kind in ("equality", "joins", "sort", "ranges"):
+            for qualifier, column in getattr(shape, kind):
+                table = resolve(qualifier, column)
+                if table is not None:
+                    per_table.setdefault(table, {}).setdefault(kind, [])
+                    if column not in per_table[table][kind]:
+                        per_table[table][kind].append(column)
+
+        candidates = []
+        sort_tables = {resolve(qualifier, column) for qualifier, column in shape.sort}
+        for table, kinds in per_table.items():
+            # Secondary indexes end with the primary key implicitly, and a
+            # join on the primary key is already served by it
+            primary_key = indexes.get(table, {}).get("PRIMARY", [])
+            ordered: List[str] = []
+            joins = [column for column in kinds.get("joins", []) if [column] != primary_key]
+            for column in kinds.get("equality", []) + joins:
+                if column not in ordered:
+                    ordered.append(column)
+            equality_count = len(ordered)
+            # An index can only provide the order when the sort is on this table alone
+            if sort_tables == {table}:
+                ordered.extend(column for column in kinds.get("sort", []) if column not in ordered)
+            elif kinds.get("ranges"):
+                ordered.extend(column for column in kinds["ranges"][:1] if column not in ordered)
+            if equality_count and ordered[equality_count:] == primary_key:
+                ordered = ordered[:equality_count]
+            ordered = ordered[:MAX_INDEX_COLUMNS]
+            if ordered:
+                candidates.append(Candidate(table, tuple(ordered), min(equality_count, len(ordered))))
+        return candidates
+
+    async def _schema(self, session: AsyncSession, tables: List[str]) -> Tuple[Dict[str, Set[str]], Dict[str, Dict[str, List[str]]]]:
+        """
+        Columns and existing indexes (name -> columns in order) of the tables.
+
+        MySQL is read from information_schema in two queries; other
+        databases go through the SQLAlchemy inspector.
+        """
+        columns: Dict[str, Set[str]] = {}
+        indexes: Dict[str, Dict[str, List[str]]] = {}
+        if not tables:
+            return columns, indexes
+
+        if session.bind.dialect.name == "mysql":
+            result = await session.execute(
+                text(
+                    "SELECT LOWER(TABLE_NAME), LOWER(COLUMN_NAME) FROM information_schema.COLUMNS "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND LOWER(TABLE_NAME) IN :tables"
+                ).bindparams(bindparam("tables", expanding=True)),
+                {"tables": tables},
+            )
+            for table, column in result.fetchall():
+                columns.setdefault(table, set()).add(column)
+            result = await session.execute(
+                text(
+                    "SELECT LOWER(TABLE_NAME), INDEX_NAME, LOWER(COLUMN_NAME) FROM information_schema.STATISTICS "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND LOWER(TABLE_NAME) IN :tables "
+                    "ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX"
+                ).bindparams(bindparam("tables", expanding=True)),
+                {"tables": tables},
+            )
+            for table, index_name, column in result.fetchall():
+                indexes.setdefault(table, {}).setdefault(index_name, []).append(column)
+            return columns, indexes
+
+        def inspect_tables(sync_session) -> None:
+            inspector = inspect(sync_session.connection())
+            existing = {name.lower(): name for name in inspector.get_table_names()}
+            for table in tables:
+                name = existing.get(table)
+                if name is None:
+                    continue
+                columns[table] = {column["name"].lower() for column in inspector.get_columns(name)}
+                table_indexes = indexes.setdefault(table, {})
+                primary_key = inspector.get_pk_constraint(name).get("constrained_columns") or []
+                if primary_key:
+                    table_indexes["PRIMARY"] = [column.lower() for column in primary_key]
+                for index in inspector.get_indexes(name):
+                    table_indexes[index["name"]] = [column.lower() for column in index["column_names"] if column]
+
+        await session.run_sync(inspect_tables)
+        return columns, indexes
+
+    def _describe(self, candidate: Candidate, indexes: Dict[str, Dict[str, List[str]]]) -> Dict[str, Any]:
+        ddl, name = index_ddl(candidate.table, candidate.columns)
+        # Existing indexes the suggestion would make redundant (its prefixes)
+        replaces = [
+            index_name
+            for index_name, index_columns in indexes.get(candidate.table, {}).items()
+            if index_name != "PRIMARY" and list(candidate.columns[:len(index_columns)]) == index_columns
+        ]
+        fingerprints = sorted(candidate.fingerprints.values(), key=lambda stats: stats.total_ms, reverse=True)
+        return {
+            "table": candidate.table,
+            "columns": list(candidate.columns),
+            "index_name": name,
+            "ddl": ddl,
+            "score_ms": round(candidate.total_ms, 1),
+            "query_count": candidate.query_count,
+            "replaces_indexes": replaces,
+            "queries": [
+                {
+                    "fingerprint": stats.fingerprint,
+                    "query": stats.normalized,
+                    "count": stats.count,
+                    "avg_ms": round(stats.avg_ms, 2),
+                    "max_ms": round(stats.max_ms, 2),
+                    "total_ms": round(stats.total_ms, 1),
+                }
+                for stats in fingerprints
+            ],
+        }
+
+
+index_advisor_service = IndexAdvisorService()
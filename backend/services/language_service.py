@@ -1,9 +1,60 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from typing import List
+from typing import List, Optional
+import re
 
 from models.it_language import ItLanguage
 from schemas.language_schemas import LanguageResponse
+from services.reference_data_service import reference_data_service
+
+# Multilingual data is stored in _ln1/_ln2/_ln3 columns; the it_language
+# row with id N owns the _lnN columns, _ln1 being the default language
+LANGUAGE_COLUMN_SLOTS = (1, 2, 3)
+
+# Logical multilingual field in report SQL, e.g. {ln:c.full_name}
+_LOCALIZED_FIELD = re.compile(r"\{ln:(\w+(?:\.\w+)?)\}")
+
+
+def localized_column(field: str, slot: int = 1) -> str:
+    """
+    SQL expression for a logical multilingual field in a language.
+
+    Args:
+        field: Column name without the suffix, optionally qualified ("c.full_name")
+        slot: Language column slot (1-3)
+
+    Returns:
+        The _lnN column, falling back to _ln1 where it is NULL or empty
+    """
+    if slot == 1:
+        return f"{field}_ln1"
+    return f"COALESCE(NULLIF({field}_ln{slot}, ''), {field}_ln1)"
+
+
+def localize_sql(sql: str, slot: int = 1) -> str:
+    """Replace {ln:field} placeholders with the column for a language slot."""
+    return _LOCALIZED_FIELD.sub(lambda match: localized_column(match.group(1), slot), sql)
+
+
+async def resolve_language_slot(language: Optional[str]) -> Optional[int]:
+    """
+    Resolve a caller's language (it_language code or id) to its column slot.
+
+    Languages beyond the three column slots use _ln1.
+
+    Returns:
+        The slot (1-3), or None if no language was given
+
+    Raises:
+        ValueError: If the language is not an active it_language entry
+    """
+    if language is None or language == "":
+        return None
+    snapshot = await reference_data_service.get_or_load("languages")
+    for item in snapshot.items:
+        if str(item.id) == language or item.language.lower() == language.lower():
+            return item.id if item.id in LANGUAGE_COLUMN_SLOTS else 1
+    raise ValueError(f"Unknown or inactive language '{language}'")
 
 
 class LanguageService:
@@ -32,9 +83,16 @@ class LanguageService:
         """
         Get formatted language list.
         
+        Served from the in-memory reference snapshot when it is loaded,
+        otherwise read from the database.
+        
         Returns:
             Tuple of (formatted_languages, total_count)
         """
+        snapshot = reference_data_service.get_snapshot("languages")
+        if snapshot is not None:
+            return list(snapshot.items), len(snapshot)
+        
         languages = await self.get_active_languages()
         
         languages_list = [
@@ -0,0 +1,312 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.config import settings
+from config.database import database_now
+
+logger = logging.getLogger(__name__)
+
+# (label, min days, max days) -- "current" holds performing loans
+AGING_BUCKETS: Tuple[Tuple[str, int, Optional[int]], ...] = (
+    ("current", 0, 0),
+    ("1-30", 1, 30),
+    ("31-60", 31, 60),
+    ("61-90", 61, 90),
+    ("90+", 91, None),
+)
+_BUCKET_EDGES = np.array([bucket[1] for bucket in AGING_BUCKETS[1:]], dtype=np.int64)
+
+# One row per installment, ordered by loan then due date, with each loan's
+# repayments up to the as-of date summed alongside. Repayments are
+# allocated to the oldest installments first.
+LOAN_INSTALLMENT_SQL = """
+SELECT
+    l.id AS loan_id,
+    l.loan_number,
+    l.customer_id,
+    l.product_code,
+    l.capital,
+    i.due_date,
+    i.amount AS installment_amount,
+    COALESCE(p.paid, 0) AS paid_to_date
+FROM ln_loan l
+JOIN ln_installment i ON i.loan_id = l.id
+LEFT JOIN (
+    SELECT r.loan_id, SUM(r.amount) AS paid
+    FROM ln_repayment r
+    JOIN ln_loan rl ON rl.id = r.loan_id
+    WHERE rl.branch_id = :branch_id AND r.payment_date <= :as_of
+    GROUP BY r.loan_id
+) p ON p.loan_id = l.id
+WHERE l.branch_id = :branch_id
+  AND l.status = 1
+  AND (:product_code IS NULL OR l.product_code = :product_code)
+  AND (:capital_from IS NULL OR l.capital >= :capital_from)
+  AND (:capital_to IS NULL OR l.capital <= :capital_to)
+ORDER BY l.id, i.due_date
+"""
+
+LOAN_COLUMNS = (
+    "loan_id",
+    "loan_number",
+    "customer_id",
+    "product_code",
+    "capital",
+    "due_date",
+    "installment_amount",
+    "paid_to_date",
+)
+
+AMOUNT_SCALE = 2
+
+
+def _to_minor_units(values: Sequence[Any]) -> np.ndarray:
+    """
+    Convert DECIMAL(.., 2) amounts to exact int64 minor units (cents).
+
+    Each value goes through Decimal rather than float64, which cannot hold
+    every cent of amounts above 2**53 / 100.
+    """
+    return np.fromiter(
+        (int(Decimal(value).scaleb(AMOUNT_SCALE)) for value in values), dtype=np.int64, count=len(values)
+    )
+
+
+def _to_amount(value: int) -> Decimal:
+    return Decimal(int(value)).scaleb(-AMOUNT_SCALE)
+
+
+class LoanAgingService:
+    """
+    Service class for loan past-due (arrears) aging.
+
+    A branch's loan book is streamed as installment rows in batches. Each
+    batch is aged with vectorized NumPy arithmetic: repayments are allocated
+    to installments oldest first via per-loan cumulative sums, and a loan's
+    days past due is the age of its oldest unpaid overdue installment. Only
+    bucket totals and the requested detail page are kept, so memory stays
+    bounded by the batch size however large the branch is.
+    """
+
+    async def past_due_report(
+        self,
+        session: AsyncSession,
+        branch_id: int,
+        product_code: Optional[str] = None,
+        as_of: Optional[date] = None,
+        min_days: Optional[int] = None,
+        max_days: Optional[int] = None,
+        due_from: Optional[date] = None,
+        due_to: Optional[date] = None,
+        capital_from: Optional[Decimal] = None,
+        capital_to: Optional[Decimal] = None,
+        include_detail: bool = False,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> Dict[str, Any]:
+        """
+        Compute aging bucket totals (and optionally a page of loans).
+
+        Args:
+            session: Database session
+            branch_id: Branch whose loan book is aged
+            product_code: Optional loan product filter
+            as_of: Aging date (default: the database's current date)
+            min_days: Only loans at least this many days past due
+            max_days: Only loans at most this many days past due
+            due_from: Only loans whose oldest overdue installment fell due on/after
+            due_to: Only loans whose oldest overdue installment fell due on/before
+            capital_from: Only loans with at least this capital
+            capital_to: Only loans with at most this capital
+            include_detail: Return a page of past-due loans
+            page: Detail page number (1-based)
+            page_size: Detail page size
+
+        Returns:
+            Dict[str, Any]: Bucket totals, grand totals and the detail page
+        """
+        if as_of is None:
+            as_of = (await database_now(session)).date()
+        as_of_day = np.datetime64(as_of, "D")
+        filters = (min_days, max_days, due_from, due_to)
+
+        bucket_count = len(AGING_BUCKETS)
+        loan_counts = np.zeros(bucket_count, dtype=np.int64)
+        arrears_totals = np.zeros(bucket_count, dtype=np.int64)
+        outstanding_totals = np.zeros(bucket_count, dtype=np.int64)
+        loans_scanned = 0
+        detail_count = 0
+        detail: List[Dict[str, Any]] = []
+        offset = (page - 1) * page_size
+
+        binds = {
+            "branch_id": branch_id,
+            "as_of": as_of,
+            "product_code": product_code,
+            "capital_from": capital_from,
+            "capital_to": capital_to,
+        }
+        result = await session.stream(
+            text(LOAN_INSTALLMENT_SQL).execution_options(yield_per=settings.LOAN_AGING_BATCH_SIZE),
+            binds,
+        )
+
+        pending: List[Any] = []
+        finished = False
+        partitions = result.partitions()
+        while not finished:
+            try:
+                rows = pending + list(await partitions.__anext__())
+            except StopAsyncIteration:
+                rows, finished = pending, True
+            if not rows:
+                continue
+
+            # A loan's installments may straddle batches; hold the last loan
+            # back until its remaining rows arrive
+            split = len(rows)
+            if not finished:
+                last_loan = rows[-1][0]
+                while split > 0 and rows[split - 1][0] == last_loan:
+                    split -= 1
+            rows, pending = rows[:split], rows[split:]
+            if not rows:
+                continue
+
+            loans = self._age_loans(rows, as_of_day)
+            selected = self._filter(loans, as_of_day, *filters)
+            loans_scanned += len(loans["loan_id"])
+
+            bucket = loans["bucket"][selected]
+            loan_counts += np.bincount(bucket, minlength=bucket_count)
+            np.add.at(arrears_totals, bucket, loans["arrears"][selected])
+            np.add.at(outstanding_totals, bucket, loans["outstanding"][selected])
+
+            if include_detail:
+                past_due = np.flatnonzero(selected & (loans["days_past_due"] > 0))
+                wanted = past_due[max(offset - detail_count, 0):max(offset + page_size - detail_count, 0)]
+                detail.extend(self._detail_row(loans, i, as_of_day) for i in wanted.tolist())
+                detail_count += len(past_due)
+
+            # Yield between batches so a large branch does not stall requests
+            await asyncio.sleep(0)
+
+        buckets = [
+            {
+                "bucket": label,
+                "min_days": low,
+                "max_days": high,
+                "loan_count": int(loan_counts[b]),
+                "arrears_amount": _to_amount(arrears_totals[b]),
+                "outstanding_amount": _to_amount(outstanding_totals[b]),
+            }
+            for b, (label, low, high) in enumerate(AGING_BUCKETS)
+        ]
+
+        report = {
+            "branch_id": branch_id,
+            "product_code": product_code,
+            "as_of": as_of,
+            "loans_scanned": loans_scanned,
+            "buckets": buckets,
+            "total_loan_count": int(loan_counts.sum()),
+            "total_arrears_amount": _to_amount(arrears_totals.sum()),
+            "total_outstanding_amount": _to_amount(outstanding_totals.sum()),
+        }
+        if include_detail:
+            report.update(loans=detail, detail_count=detail_count, page=page, page_size=page_size)
+        return report
+
+    def _age_loans(self, rows: List[Any], as_of_day: np.datetime64) -> Dict[str, Any]:
+        """
+        Age a batch of installment rows covering complete loans.
+
+        Returns:
+            Dict of per-loan arrays (plus the raw loan columns)
+        """
+        columns = dict(zip(LOAN_COLUMNS, zip(*rows)))
+        loan_ids = np.asarray(columns["loan_id"], dtype=np.int64)
+        due = np.array(columns["due_date"], dtype="datetime64[s]").astype("datetime64[D]")
+        amount = _to_minor_units(columns["installment_amount"])
+        paid = _to_minor_units(columns["paid_to_date"])
+
+        is_start = np.empty(len(loan_ids), dtype=bool)
+        is_start[0] = True
+        np.not_equal(loan_ids[1:], loan_ids[:-1], out=is_start[1:])
+        starts = np.flatnonzero(is_start)
+        loan_index = np.cumsum(is_start) - 1
+
+        # Amount fallen due up to and including each installment, per loan;
+        # whatever the repayments do not cover is unpaid, oldest first
+        cumulative = np.cumsum(amount)
+        due_to_date = cumulative - (cumulative - amount)[starts][loan_index]
+        unpaid = np.clip(due_to_date - paid, 0, amount)
+
+        days_overdue = (as_of_day - due).astype(np.int64)
+        overdue = (days_overdue > 0) & (unpaid > 0)
+
+        days_past_due = np.maximum.reduceat(np.where(overdue, days_overdue, 0), starts)
+        return {
+            "loan_id": loan_ids[starts],
+            "starts": starts,
+            "columns": columns,
+            "capital": _to_minor_units(columns["capital"])[starts],
+            "days_past_due": days_past_due,
+            "bucket": np.digitize(days_past_due, _BUCKET_EDGES),
+            "overdue_installments": np.add.reduceat(overdue.astype(np.int64), starts),
+            "arrears": np.add.reduceat(np.where(overdue, unpaid, 0), starts),
+            "outstanding": np.add.reduceat(unpaid, starts),
+        }
+
+    def _filter(
+        self,
+        loans: Dict[str, Any],
+        as_of_day: np.datetime64,
+        min_days: Optional[int],
+        max_days: Optional[int],
+        due_from: Optional[date],
+        due_to: Optional[date],
+    ) -> np.ndarray:
+        days = loans["days_past_due"]
+        selected = np.ones(len(days), dtype=bool)
+        if min_days is not None:
+            selected &= days >= min_days
+        if max_days is not None:
+            selected &= days <= max_days
+        if due_from is not None or due_to is not None:
+            oldest_due = as_of_day - days.astype("timedelta64[D]")
+            selected &= days > 0
+            if due_from is not None:
+                selected &= oldest_due >= np.datetime64(due_from, "D")
+            if due_to is not None:
+                selected &= oldest_due <= np.datetime64(due_to, "D")
+        return selected
+
+    def _detail_row(self, loans: Dict[str, Any], i: int, as_of_day: np.datetime64) -> Dict[str, Any]:
+        row = loans["starts"][i]
+        columns = loans["columns"]
+        days = int(loans["days_past_due"][i])
+        oldest_due = (as_of_day - np.timedelta64(days, "D")).astype(date) if days > 0 else None
+        return {
+            "loan_id": int(loans["loan_id"][i]),
+            "loan_number": columns["loan_number"][row],
+            "customer_id": columns["customer_id"][row],
+            "product_code": columns["product_code"][row],
+            "capital": _to_amount(loans["capital"][i]),
+            "days_past_due": days,
+            "bucket": AGING_BUCKETS[loans["bucket"][i]][0],
+            "overdue_installments": int(loans["overdue_installments"][i]),
+            "oldest_due_date": oldest_due,
+            "arrears_amount": _to_amount(loans["arrears"][i]),
+            "outstanding_amount": _to_amount(loans["outstanding"][i]),
+        }
+
+
+loan_aging_service = LoanAgingService()
@@ -0,0 +1,506 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, bindparam, or_, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.config import settings
+from config.database import AsyncSessionLocal, database_now, engine
+from services.language_service import localize_sql
+from services.report_registry import ReportDefinition, ReportParameter, register_report
+
+logger = logging.getLogger(__name__)
+
+# Summary tables live in their own metadata so they are never part of
+# SQLModel.metadata.create_all for the core banking tables.
+summary_metadata = MetaData()
+
+view_state_table = Table(
+    "rpt_materialized_view_state",
+    summary_metadata,
+    Column("view_name", String(100), primary_key=True),
+    # NULL until the first full refresh completes (the row may exist earlier
+    # as a refresh claim)
+    Column("watermark", DateTime, nullable=True),
+    Column("refreshed_at", DateTime, nullable=True),
+    Column("full_refreshed_at", DateTime, nullable=True),
+    Column("reconciled_at", DateTime, nullable=True),
+    Column("claimed_at", DateTime, nullable=True),
+)
+
+# Partition keys are refreshed in chunks to keep IN lists bounded
+_PARTITION_CHUNK_SIZE = 500
+
+
+@dataclass(frozen=True)
+class SummaryColumn:
+    """A column of a summary table and the SQL expression that computes it"""
+
+    name: str
+    expression: str
+    type: Any = Integer
+    label: Optional[str] = None
+
+    @property
+    def output_label(self) -> str:
+        return self.label or self.name
+
+
+@dataclass(frozen=True)
+class MaterializedView:
+    """
+    Declarative definition of a pre-aggregated report.
+
+    The same definition produces the base report SQL (registered in the
+    report registry), the summary table DDL, the INSERT ... SELECT that
+    populates it and the SELECT that serves the report from it, so the two
+    paths always return the same columns in the same order.
+
+    Incremental refreshes recompute whole partitions (e.g. a branch): the
+    change_sql queries return the partition keys touched since :_since, and
+    on the slower reconcile schedule count_sql (partition key, base row
+    count) is compared with the stored count_measure to catch rows deleted
+    from or moved out of a partition.
+    """
+
+    name: str
+    report: str
+    title: str
+    source: str
+    dimensions: Tuple[SummaryColumn, ...]
+    measures: Tuple[SummaryColumn, ...]
+    group_by: Tuple[str, ...]
+    partition_column: str
+    filters: Tuple[str, ...] = ()
+    order_by: Tuple[str, ...] = ()
+    change_sql: Tuple[str, ...] = ()
+    count_sql: Optional[str] = None
+    count_measure: Optional[str] = None
+
+    @property
+    def columns(self) -> Tuple[SummaryColumn, ...]:
+        return self.dimensions + self.measures
+
+    def column(self, name: str) -> SummaryColumn:
+        return next(column for column in self.columns if column.name == name)
+
+    @property
+    def staging_name(self) -> str:
+        return f"{self.name}_staging"
+
+    @property
+    def retired_name(self) -> str:
+        return f"{self.name}_retired"
+
+    def table(self) -> Table:
+        existing = summary_metadata.tables.get(self.name)
+        if existing is not None:
+            return existing
+        return Table(
+            self.name,
+            summary_metadata,
+            *[Column(column.name, column.type) for column in self.columns],
+            Index(f"ix_{self.name}_filters", *(self.filters or (self.partition_column,))),
+        )
+
+    def staging_table(self) -> Table:
+        """The summary table's columns under the staging name, without indexes."""
+        return Table(
+            self.staging_name,
+            MetaData(),
+            *[Column(column.name, column.type) for column in self.columns],
+        )
+
+    def report_definition(self) -> ReportDefinition:
+        """The report computed from the base tables."""
+        select_list = ",\n    ".join(
+            f"{column.expression} AS `{column.output_label}`" for column in self.columns
+        )
+        where = "\n    AND ".join(
+            f"(:{name} IS NULL OR {self.column(name).expression} = :{name})" for name in self.filters
+        ) or "1 = 1"
+        order = ", ".join(f"`{self.column(name).output_label}`" for name in self.order_by)
+        sql = (
+            f"SELECT\n    {select_list}\n{self.source}\nWHERE\n    {where}\n"
+            f"GROUP BY {', '.join(self.group_by)}"
+        )
+        if order:
+            sql += f"\nORDER BY {order}"
+
+        return ReportDefinition(
+            name=self.report,
+            title=self.title,
+            sql=sql,
+            parameters=tuple(ReportParameter(name, int) for name in self.filters),
+        )
+
+    def serving_sql(self) -> str:
+        """The report served from the summary table."""
+        select_list = ", ".join(f"{column.name} AS `{column.output_label}`" for column in self.columns)
+        where = " AND ".join(
+            f"(:{name} IS NULL OR {name} = :{name})" for name in self.filters
+        ) or "1 = 1"
+        sql = f"SELECT {select_list} FROM {self.name} WHERE {where}"
+        if self.order_by:
+            sql += f" ORDER BY {', '.join(self.order_by)}"
+        return sql
+
+    def populate_sql(self, partition_filter: str = "", into: Optional[str] = None) -> str:
+        """
+        INSERT ... SELECT for all partitions, or for those matching
+        partition_filter (e.g. "IN :partition_keys" or "IS NULL"), into the
+        summary table or the table named by into.
+        """
+        names = ", ".join(column.name for column in self.columns)
+        # Summary tables hold the default (_ln1) language
+        expressions = localize_sql(", ".join(column.expression for column in self.columns))
+        where = ""
+        if partition_filter:
+            where = f"WHERE {self.column(self.partition_column).expression} {partition_filter}"
+        return (
+            f"INSERT INTO {into or self.name} ({names}) SELECT {expressions} {self.source} "
+            f"{where} GROUP BY {', '.join(self.group_by)}"
+        )
+
+
+MATERIALIZED_VIEWS: Dict[str, MaterializedView] = {}
+
+
+def register_view(view: MaterializedView) -> MaterializedView:
+    """Register a materialized view and the base report it accelerates."""
+    MATERIALIZED_VIEWS[view.name] = view
+    view.table()
+    register_report(view.report_definition())
+    return view
+
+
+register_view(MaterializedView(
+    name="rpt_customer_summary",
+    report="customer_summary",
+    title="Customer Summary",
+    source="""FROM
+    ci_customer AS c
+    LEFT JOIN gl_branch AS b
+        ON c.branch_id = b.id
+    LEFT JOIN ci_customer_type AS ct
+        ON c.customer_type_id = ct.id""",
+    dimensions=(
+        SummaryColumn("branch_id", "c.branch_id"),
+        SummaryColumn("branch_name", "MAX({ln:b.name})", String(300), "Branch Name"),
+        SummaryColumn("customer_type_id", "c.customer_type_id"),
+        SummaryColumn("customer_type", "MAX({ln:ct.type})", String(150), "Customer type"),
+    ),
+    measures=(
+        SummaryColumn("customer_count", "COUNT(c.id)", Integer, "Customer count"),
+        SummaryColumn(
+            "active_count", "COUNT(CASE WHEN c.status = 1 THEN 1 END)", Integer, "Active customers"
+        ),
+    ),
+    group_by=("c.branch_id", "c.customer_type_id"),
+    partition_column="branch_id",
+    filters=("branch_id", "customer_type_id"),
+    order_by=("branch_name", "customer_type", "branch_id", "customer_type_id"),
+    change_sql=(
+        "SELECT DISTINCT c.branch_id FROM ci_customer AS c WHERE c.m_at >= :_since OR c.c_at >= :_since",
+        "SELECT b.id FROM gl_branch AS b WHERE b.m_at >= :_since",
+        "SELECT DISTINCT c.branch_id FROM ci_customer AS c JOIN ci_customer_type AS ct "
+        "ON c.customer_type_id = ct.id WHERE ct.m_at >= :_since",
+    ),
+    count_sql="SELECT c.branch_id, COUNT(*) FROM ci_customer AS c GROUP BY c.branch_id",
+    count_measure="customer_count",
+))
+
+
+class MaterializationService:
+    """
+    Service class for maintaining summary tables and routing reports to them.
+
+    Each view is fully rebuilt when it has no recorded state or its last full
+    rebuild is older than MATERIALIZED_VIEW_FULL_REFRESH_SECONDS. A full
+    rebuild fills a staging table and swaps it in with RENAME TABLE, so the
+    live table is never locked or empty while it is recomputed; otherwise
+    only partitions touched since the stored watermark are recomputed, plus
+    partitions whose row counts drifted, checked every
+    MATERIALIZED_VIEW_RECONCILE_SECONDS. The refresh state is kept in
+    rpt_materialized_view_state so it survives restarts and is shared by all
+    workers; each interval one worker claims the refresh through that row.
+    """
+
+    def __init__(self):
+        self._populated: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def view_for_report(self, report_name: str, language: int = 1) -> Optional[MaterializedView]:
+        """
+        Get the populated summary view that can serve a report, if any.
+
+        Summary tables hold the default language, so other languages are
+        always served from the base tables.
+        """
+        if language != 1:
+            return None
+        for view in MATERIALIZED_VIEWS.values():
+            if view.report == report_name and view.name in self._populated:
+                return view
+        return None
+
+    async def refresh_view(self, view: MaterializedView, full: bool = False) -> Dict[str, Any]:
+        """
+        Refresh a summary table.
+
+        Args:
+            view: The view to refresh
+            full: Rebuild every partition regardless of the stored state
+
+        Returns:
+            Dict[str, Any]: Refresh mode and number of partitions recomputed
+        """
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                now = await database_now(session)
+                state = await self._load_state(session, view)
+
+                full = full or state is None or state["full_refreshed_at"] is None or (
+                    now - state["full_refreshed_at"]
+                    >= timedelta(seconds=settings.MATERIALIZED_VIEW_FULL_REFRESH_SECONDS)
+                )
+
+                reconcile = full or state["reconciled_at"] is None or (
+                    now - state["reconciled_at"]
+                    >= timedelta(seconds=settings.MATERIALIZED_VIEW_RECONCILE_SECONDS)
+                )
+
+                if not full:
+                    since = state["watermark"] - timedelta(
+                        seconds=settings.REPORT_SNAPSHOT_WATERMARK_LAG_SECONDS
+                    )
+                    keys = set()
+                    for sql in view.change_sql:
+                        result = await session.execute(text(sql), {"_since": since})
+                        keys.update(row[0] for row in result)
+                    if reconcile:
+                        keys.update(await self._mismatched_partitions(session, view))
+                    partitions = len(keys)
+                    await self._refresh_partitions(session, view, keys)
+                    await self._save_state(session, view, now, full, reconcile, state)
+
+        if full:
+            partitions = None
+            await self._rebuild(view)
+            async with AsyncSessionLocal() as session:
+                async with session.begin():
+                    await self._save_state(session, view, now, full, reconcile, state)
+
+        self._populated.add(view.name)
+        mode = "full" if full else "incremental"
+        if full or partitions:
+            logger.info(f"Refreshed summary table '{view.name}' ({mode}, partitions: {partitions or 'all'})")
+        return {"view": view.name, "mode": mode, "partitions": partitions}
+
+    async def refresh_claimed(self, view: MaterializedView, full: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Refresh a view if this worker can claim it, as the background loop does.
+
+        Returns:
+            The refresh result, or None if the view was refreshed or claimed
+            by a worker within the last half interval
+        """
+        if not await self._claim(view):
+            return None
+        return await self.refresh_view(view, full=full)
+
+    async def _rebuild(self, view: MaterializedView) -> None:
+        """
+        Recompute every partition into a staging table and swap it in.
+
+        Each step is its own short transaction: the INSERT ... SELECT only
+        locks the staging table, and readers of the live table see either the
+        previous contents or the rebuilt ones.
+        """
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                connection = await session.connection()
+                mysql = connection.dialect.name == "mysql"
+                await session.execute(text(f"DROP TABLE IF EXISTS {view.staging_name}"))
+                if mysql:
+                    await session.execute(text(f"CREATE TABLE {view.staging_name} LIKE {view.name}"))
+                else:
+                    await connection.run_sync(view.staging_table().create)
+
+            async with session.begin():
+                await session.execute(text(view.populate_sql(into=view.staging_name)))
+
+            async with session.begin():
+                connection = await session.connection()
+                await session.execute(text(f"DROP TABLE IF EXISTS {view.retired_name}"))
+                if mysql:
+                    # Both renames happen atomically
+                    await session.execute(text(
+                        f"RENAME TABLE {view.name} TO {view.retired_name}, "
+                        f"{view.staging_name} TO {view.name}"
+                    ))
+                else:
+                    # Other dialects (SQLite in development) rename inside the
+                    # transaction and rebuild the index the staging table lacks
+                    await session.execute(text(f"ALTER TABLE {view.name} RENAME TO {view.retired_name}"))
+                    await session.execute(text(f"ALTER TABLE {view.staging_name} RENAME TO {view.name}"))
+                await session.execute(text(f"DROP TABLE {view.retired_name}"))
+                if not mysql:
+                    for index in view.table().indexes:
+                        await connection.run_sync(index.create)
+
+    async def _mismatched_partitions(self, session: AsyncSession, view: MaterializedView) -> Set[Any]:
+        if not view.count_sql or not view.count_measure:
+            return set()
+        base = {row[0]: row[1] for row in await session.execute(text(view.count_sql))}
+        stored_sql = (
+            f"SELECT {view.partition_column}, SUM({view.count_measure}) "
+            f"FROM {view.name} GROUP BY {view.partition_column}"
+        )
+        stored = {row[0]: row[1] for row in await session.execute(text(stored_sql))}
+        return {key for key in set(base) | set(stored) if base.get(key, 0) != stored.get(key, 0)}
+
+    async def _refresh_partitions(self, session: AsyncSession, view: MaterializedView, keys: Set[Any]) -> None:
+        if None in keys:
+            keys.discard(None)
+            await session.execute(text(f"DELETE FROM {view.name} WHERE {view.partition_column} IS NULL"))
+            await session.execute(text(view.populate_sql("IS NULL")))
+
+        key_list = sorted(keys)
+        for i in range(0, len(key_list), _PARTITION_CHUNK_SIZE):
+            chunk = key_list[i:i + _PARTITION_CHUNK_SIZE]
+            delete = text(
+                f"DELETE FROM {view.name} WHERE {view.partition_column} IN :partition_keys"
+            ).bindparams(bindparam("partition_keys", expanding=True))
+            insert = text(view.populate_sql("IN :partition_keys")).bindparams(
+                bindparam("partition_keys", expanding=True)
+            )
+            await session.execute(delete, {"partition_keys": chunk})
+            await session.execute(insert, {"partition_keys": chunk})
+
+    async def _load_state(self, session: AsyncSession, view: MaterializedView) -> Optional[Dict[str, Any]]:
+        result = await session.execute(
+            view_state_table.select().where(view_state_table.c.view_name == view.name)
+        )
+        row = result.mappings().one_or_none()
+        return dict(row) if row is not None else None
+
+    async def _save_state(
+        self,
+        session: AsyncSession,
+        view: MaterializedView,
+        now: datetime,
+        full: bool,
+        reconciled: bool,
+        state: Optional[Dict[str, Any]],
+    ) -> None:
+        full_refreshed_at = now if full or state is None else state["full_refreshed_at"]
+        reconciled_at = now if reconciled or state is None else state["reconciled_at"]
+        await session.execute(
+            view_state_table.delete().where(view_state_table.c.view_name == view.name)
+        )
+        await session.execute(view_state_table.insert().values(
+            view_name=view.name,
+            watermark=now,
+            refreshed_at=now,
+            full_refreshed_at=full_refreshed_at,
+            reconciled_at=reconciled_at,
+            claimed_at=now,
+        ))
+
+    async def _claim(self, view: MaterializedView) -> bool:
+        """
+        Claim this interval's refresh of a view for the calling worker.
+
+        Every worker runs the refresh loop; a conditional UPDATE of claimed_at
+        lets only one of them through per interval. A worker that loses the
+        claim still starts serving from the summary table once another worker
+        has populated it.
+
+        Returns:
+            bool: True if this worker should refresh the view now
+        """
+        # Half an interval, so loops drifting against each other still refresh
+        # every interval rather than skipping one
+        window = timedelta(seconds=settings.MATERIALIZED_VIEW_REFRESH_SECONDS / 2)
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                now = await database_now(session)
+                result = await session.execute(
+                    view_state_table.update()
+                    .where(view_state_table.c.view_name == view.name)
+                    .where(or_(
+                        view_state_table.c.claimed_at.is_(None),
+                        view_state_table.c.claimed_at <= now - window,
+                    ))
+                    .values(claimed_at=now)
+                )
+                if result.rowcount:
+                    return True
+                state = await self._load_state(session, view)
+
+        if state is not None:
+            if state["full_refreshed_at"] is not None:
+                self._populated.add(view.name)
+            return False
+
+        try:
+            async with AsyncSessionLocal() as session:
+                async with session.begin():
+                    await session.execute(
+                        view_state_table.insert().values(view_name=view.name, claimed_at=now)
+                    )
+        except IntegrityError:
+            # Another worker inserted the first claim
+            return False
+        return True
+
+    async def refresh_all(self) -> List[Dict[str, Any]]:
+        """Refresh every view this worker claims, logging (not raising) failures."""
+        results = []
+        for view in MATERIALIZED_VIEWS.values():
+            try:
+                result = await self.refresh_claimed(view)
+                if result is not None:
+                    results.append(result)
+            except Exception as e:
+                logger.warning(f"Failed to refresh summary table '{view.name}': {str(e)}")
+        return results
+
+    async def start(self) -> None:
+        """
+        Create missing summary tables (unless STARTUP_RUN_DDL is off) and
+        start the background refresher.
+        """
+        if not settings.MATERIALIZED_VIEWS_ENABLED or self._task is not None:
+            return
+        if settings.STARTUP_RUN_DDL:
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(summary_metadata.create_all)
+            except Exception as e:
+                logger.warning(f"Failed to create summary tables: {str(e)}")
+                return
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop the background refresher."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await self.refresh_all()
+            await asyncio.sleep(settings.MATERIALIZED_VIEW_REFRESH_SECONDS)
+
+
+materialization_service = MaterializationService()
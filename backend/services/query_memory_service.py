@@ -0,0 +1,207 @@
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import logging
+import mmap
+import sys
+import tempfile
+import threading
+
+from config.config import settings
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Bytes streamed per chunk when serving a spilled result back
+SPILL_READ_CHUNK = 256 * 1024
+
+
+class QueryMemoryExceeded(ValueError):
+    """Raised when a query result cannot be held within its memory budget."""
+
+
+def estimate_size(rows: List[Any]) -> int:
+    """
+    Estimate the memory held by result rows.
+
+    Counts each row container plus its values; column-name keys are shared
+    between rows and are not counted.
+    """
+    getsizeof = sys.getsizeof
+    total = 0
+    for row in rows:
+        values = row.values() if isinstance(row, dict) else row
+        total += getsizeof(row) + sum(map(getsizeof, values))
+    return total
+
+
+class MemoryBudget:
+    """
+    Process-wide budget for query result memory.
+
+    Every in-flight query charges the bytes it holds against this budget,
+    so many moderately large queries cannot together exhaust the worker.
+    """
+
+    def __init__(self, limit_bytes: int):
+        self.limit_bytes = limit_bytes
+        self.reserved = 0
+        self._lock = threading.Lock()
+
+    def try_reserve(self, size: int) -> bool:
+        with self._lock:
+            if self.reserved + size > self.limit_bytes:
+                return False
+            self.reserved += size
+            return True
+
+    def release(self, size: int) -> None:
+        with self._lock:
+            self.reserved = max(self.reserved - size, 0)
+
+
+global_budget = MemoryBudget(settings.QUERY_MEMORY_GLOBAL_LIMIT_MB * MB)
+
+
+class QueryMemory:
+    """Memory accounting for a single query against its own and the global budget."""
+
+    def __init__(self, limit_bytes: Optional[int] = None, budget: MemoryBudget = global_budget):
+        self.limit_bytes = limit_bytes if limit_bytes is not None else settings.QUERY_MEMORY_LIMIT_MB * MB
+        self.budget = budget
+        self.used = 0
+        self.peak = 0
+
+    def charge(self, size: int) -> bool:
+        """
+        Account for size more bytes.
+
+        Returns:
+            False (and charges nothing) if either budget would be exceeded
+        """
+        if self.used + size > self.limit_bytes or not self.budget.try_reserve(size):
+            return False
+        self.used += size
+        self.peak = max(self.peak, self.used)
+        return True
+
+    def release(self, size: Optional[int] = None) -> None:
+        """Release size bytes (default: everything charged)."""
+        size = self.used if size is None else min(size, self.used)
+        self.budget.release(size)
+        self.used -= size
+
+
+class ResultBuffer:
+    """
+    Converted result rows held in memory up to the query's budget.
+
+    Once the budget is exceeded the buffer either raises
+    QueryMemoryExceeded (overflow "fail") or moves its rows to a temporary
+    file and appends every later batch there (overflow "spill"). Spilled
+    rows are stored pre-encoded as a JSON array body and served back
+    through a memory map, so they never return to the Python heap.
+    """
+
+    def __init__(self, memory: QueryMemory, overflow: Optional[str] = None):
+        self.memory = memory
+        self.overflow = overflow or settings.QUERY_MEMORY_OVERFLOW
+        self.rows: List[Dict[str, Any]] = []
+        self.row_count = 0
+        self.spill_bytes = 0
+        self._file = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def extend(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Add a batch of converted rows.
+
+        Raises:
+            QueryMemoryExceeded: If the budget is exceeded and spilling is
+                disabled, or the spill file reaches its size limit
+        """
+        self.row_count += len(rows)
+        if not self.spilled:
+            if self.memory.charge(estimate_size(rows)):
+                self.rows.extend(rows)
+                return
+            if self.overflow != "spill":
+                raise QueryMemoryExceeded(
+                    f"Query result exceeds the memory limit of {self.memory.limit_bytes // MB} MB "
+                    f"after {self.row_count - len(rows)} rows; add a LIMIT or narrow the query"
+                )
+            self._open_spill()
+            rows, self.rows = self.rows + rows, []
+            self.memory.release()
+        self._write(rows)
+
+    def _open_spill(self) -> None:
+        self._file = tempfile.TemporaryFile(prefix="query-spill-", dir=settings.QUERY_SPILL_DIR)
+        logger.info(f"Query result exceeded {self.memory.limit_bytes // MB} MB; spilling to disk")
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        encoded = ",".join(json.dumps(row, default=str) for row in rows).encode("utf-8")
+        if self.spill_bytes:
+            encoded = b"," + encoded
+        if self.spill_bytes + len(encoded) > settings.QUERY_SPILL_MAX_MB * MB:
+            raise QueryMemoryExceeded(
+                f"Query result exceeds the spill limit of {settings.QUERY_SPILL_MAX_MB} MB; "
+                f"add a LIMIT or narrow the query"
+            )
+        self._file.write(encoded)
+        self.spill_bytes += len(encoded)
+
+    def drop_columns(self, columns: List[str]) -> None:
+        """Remove columns from the rows still held in memory."""
+        for row in self.rows:
+            for column in columns:
+                row.pop(column, None)
+
+    def iter_spilled(self) -> Iterator[bytes]:
+        """Yield the spilled rows as the chunks of a JSON array."""
+        yield b"["
+        if self.spill_bytes:
+            self._file.flush()
+            with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start in range(0, self.spill_bytes, SPILL_READ_CHUNK):
+                    yield mapped[start:start + SPILL_READ_CHUNK]
+        yield b"]"
+
+    def metadata(self) -> Dict[str, Any]:
+        return {
+            "peak_bytes": self.memory.peak,
+            "limit_bytes": self.memory.limit_bytes,
+            "spilled": self.spilled,
+            "spill_bytes": self.spill_bytes,
+        }
+
+    def close(self) -> None:
+        """Release the memory charge and delete any spill file."""
+        self.memory.release()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def iter_spilled_response(result: Dict[str, Any], buffer: ResultBuffer) -> Iterator[bytes]:
+    """
+    Serialize an executor response whose rows were spilled to disk.
+
+    The body has the same shape as the regular JSON response; data and its
+    rows alias are both streamed from the spill file. The file is removed
+    once the body has been sent (or the client goes away).
+    """
+    try:
+        metadata = {key: value for key, value in result.items() if key not in ("data", "rows")}
+        yield json.dumps(metadata, default=str)[:-1].encode("utf-8") + b', "data": '
+        yield from buffer.iter_spilled()
+        yield b', "rows": '
+        yield from buffer.iter_spilled()
+        yield b"}"
+    finally:
+        buffer.close()
@@ -0,0 +1,254 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple, Type
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+from pydantic import BaseModel
+from sqlalchemy import func
+from sqlmodel import SQLModel, select
+
+from config.config import settings
+from config.database import AsyncSessionLocal
+from models.ci_customer_type import CiCustomerType
+from models.gl_branch import GlBranch
+from models.it_institute import ItInstitute
+from models.it_language import ItLanguage
+from schemas.language_schemas import LanguageResponse
+from services.shared_cache_service import shared_cache
+from schemas.reference_data_schemas import (
+    BranchResponse,
+    CustomerTypeResponse,
+    InstituteResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReferenceTable:
+    """Definition of a small, slow-changing table held in memory"""
+
+    name: str
+    model: Type[SQLModel]
+    schema: Type[BaseModel]
+    change_column: str
+    filters: Tuple[Any, ...] = ()
+    order_by: Tuple[Any, ...] = ()
+    limit: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """Immutable, versioned copy of a reference table"""
+
+    name: str
+    items: Tuple[BaseModel, ...]
+    version: int
+    etag: str
+    probe: Tuple[Any, ...]
+    loaded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+REFERENCE_TABLES: Dict[str, ReferenceTable] = {
+    "branches": ReferenceTable(
+        name="branches",
+        model=GlBranch,
+        schema=BranchResponse,
+        change_column="m_at",
+        filters=(GlBranch.status == 1,),
+        order_by=(GlBranch.name_ln1,),
+    ),
+    "customer_types": ReferenceTable(
+        name="customer_types",
+        model=CiCustomerType,
+        schema=CustomerTypeResponse,
+        change_column="m_at",
+        filters=(CiCustomerType.status == 1,),
+        order_by=(CiCustomerType.type_ln1,),
+    ),
+    "institute": ReferenceTable(
+        name="institute",
+        model=ItInstitute,
+        schema=InstituteResponse,
+        change_column="m_at",
+        order_by=(ItInstitute.id,),
+        limit=1,
+    ),
+    "languages": ReferenceTable(
+        name="languages",
+        model=ItLanguage,
+        schema=LanguageResponse,
+        change_column="updated_at",
+        filters=(ItLanguage.is_active == True,),
+        order_by=(ItLanguage.display_name,),
+    ),
+}
+
+
+class ReferenceDataService:
+    """
+    Service class for serving reference data from memory.
+
+    Each table in REFERENCE_TABLES is loaded into an immutable snapshot.
+    A background task probes MAX(change_column)/COUNT(*) every
+    REFERENCE_DATA_PROBE_SECONDS and reloads a table when the probe changes
+    or the snapshot is older than REFERENCE_DATA_REFRESH_SECONDS. Readers
+    only ever swap in a complete snapshot, so no locking is needed.
+    """
+
+    def __init__(self, tables: Dict[str, ReferenceTable] = REFERENCE_TABLES):
+        self.tables = tables
+        self._snapshots: Dict[str, ReferenceSnapshot] = {}
+        self._loaded_monotonic: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def get_snapshot(self, name: str) -> Optional[ReferenceSnapshot]:
+        """
+        Get the current snapshot of a reference table.
+
+        Args:
+            name: Key of the table in REFERENCE_TABLES
+
+        Returns:
+            The snapshot, or None if the table has not been loaded yet
+        """
+        return self._snapshots.get(name)
+
+    async def get_or_load(self, name: str) -> ReferenceSnapshot:
+        """Get a snapshot, loading it from the database on first use."""
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            snapshot = await self.refresh_table(name, force=True)
+        return snapshot
+
+    async def load_all(self) -> None:
+        """Load every reference table concurrently, logging (not raising) failures."""
+        names = list(self.tables)
+        results = await asyncio.gather(
+            *(self.refresh_table(name, force=True) for name in names), return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to load reference table '{name}': {str(result)}")
+
+    async def refresh_table(self, name: str, force: bool = False) -> ReferenceSnapshot:
+        """
+        Reload a table if its change probe moved or its snapshot expired.
+
+        Args:
+            name: Key of the table in REFERENCE_TABLES
+            force: Reload even when the probe is unchanged
+
+        Returns:
+            The current (possibly new) snapshot
+        """
+        table = self.tables[name]
+        current = self._snapshots.get(name)
+
+        async with AsyncSessionLocal() as session:
+            probe = await self._probe(session, table)
+            expired = (
+                time.monotonic() - self._loaded_monotonic.get(name, 0.0)
+                >= settings.REFERENCE_DATA_REFRESH_SECONDS
+            )
+            if current is not None and not force and not expired and probe == current.probe:
+                return current
+
+            # Another worker on this host may already have loaded this
+            # exact table state; expiry-driven reloads always go to the DB
+            cache_key = f"{name}:{hashlib.sha1(repr(probe).encode('utf-8')).hexdigest()}"
+            payload = None if expired else shared_cache.get("reference", cache_key)
+            if payload is not None:
+                items = tuple(table.schema.model_validate(item) for item in json.loads(payload))
+            else:
+                items = await self._load_items(session, table)
+                payload = json.dumps(
+                    [item.model_dump(mode="json") for item in items], sort_keys=True
+                ).encode("utf-8")
+                await asyncio.to_thread(
+                    shared_cache.put, "reference", cache_key, payload, ttl=settings.REFERENCE_DATA_REFRESH_SECONDS
+                )
+
+        # The ETag depends on the content only, so every worker serving the
+        # same data hands out the same tag; version is this process's counter
+        etag = f'"{name}-{hashlib.sha1(payload).hexdigest()[:16]}"'
+
+        if current is not None and current.etag == etag:
+            version = current.version
+        else:
+            version = current.version + 1 if current is not None else 1
+
+        snapshot = ReferenceSnapshot(
+            name=name,
+            items=items,
+            version=version,
+            etag=etag,
+            probe=probe,
+        )
+        self._snapshots[name] = snapshot
+        self._loaded_monotonic[name] = time.monotonic()
+
+        if current is None or version != current.version:
+            logger.info(f"Loaded reference table '{name}' v{version} ({len(items)} rows)")
+        return snapshot
+
+    async def start(self) -> None:
+        """
+        Start the background refresher.
+
+        The initial load runs in the startup warm-up (see warmup_service)
+        so it does not hold up startup; until then get_or_load() loads a
+        table on first use.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop the background refresher."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.REFERENCE_DATA_PROBE_SECONDS)
+            for name in self.tables:
+                try:
+                    await self.refresh_table(name)
+                except Exception as e:
+                    logger.warning(f"Failed to refresh reference table '{name}': {str(e)}")
+
+    async def _probe(self, session, table: ReferenceTable) -> Tuple[Any, ...]:
+        change_column = getattr(table.model, table.change_column)
+        statement = select(func.max(change_column), func.count())
+        for condition in table.filters:
+            statement = statement.where(condition)
+        result = await session.execute(statement.select_from(table.model))
+        return tuple(result.one())
+
+    async def _load_items(self, session, table: ReferenceTable) -> Tuple[BaseModel, ...]:
+        columns = [getattr(table.model, name) for name in table.schema.model_fields]
+        statement = select(*columns)
+        for condition in table.filters:
+            statement = statement.where(condition)
+        if table.order_by:
+            statement = statement.order_by(*table.order_by)
+        if table.limit:
+            statement = statement.limit(table.limit)
+
+        result = await session.execute(statement)
+        return tuple(table.schema.model_validate(dict(row._mapping)) for row in result)
+
+
+reference_data_service = ReferenceDataService()
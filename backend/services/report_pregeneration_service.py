@@ -0,0 +1,437 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time as clock_time, timedelta
+from itertools import product
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, Type
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: runs are not coordinated between workers
+    fcntl = None
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+
+from config.config import settings
+from config.database import read_only_session
+from middleware.compression_middleware import negotiate_encoding
+from schemas.loan_schemas import LoanPastDueResponse
+from schemas.report_schemas import ReportRunResponse
+from services.reference_data_service import reference_data_service
+from services.report_registry import REPORTS
+
+logger = logging.getLogger(__name__)
+
+# Report parameters expanded over the active reference data, and the
+# reference table that lists their values
+PARTITION_PARAMETERS = {
+    "branch_id": "branches",
+    "customer_type_id": "customer_types",
+}
+
+
+@dataclass(frozen=True)
+class PregeneratedReport:
+    """
+    A report generated off-peak for every active branch (and customer type).
+
+    run produces the same result the endpoint would return for the given
+    parameters; response_model serializes it exactly as the endpoint does.
+    """
+
+    name: str
+    partitions: Tuple[Tuple[str, bool], ...]  # (parameter, required)
+    run: Callable[[AsyncSession, Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+    response_model: Type[BaseModel]
+    # Date-relative reports (aged "as of today") are only valid on the day
+    # they were generated
+    same_day: bool = False
+
+
+class PregeneratedPayload(NamedTuple):
+    """A stored, gzip-compressed JSON response"""
+
+    content: bytes
+    generated_at: datetime
+
+    @property
+    def age_seconds(self) -> int:
+        return max(int((datetime.now() - self.generated_at).total_seconds()), 0)
+
+
+async def _run_registered_report(name: str, session: AsyncSession, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    from services.report_service import report_service
+
+    result = await report_service.run_report(session, REPORTS[name], params)
+    return result if result["success"] else None
+
+
+# The loan past-due screen asks for the first page of loan detail with the
+# endpoint's default page size; that is the page stored with the totals
+LOANS_PAST_DUE_PAGE_SIZE = 50
+
+# Fields of a loans_past_due payload that only detail requests receive
+LOANS_PAST_DUE_DETAIL_FIELDS = ("loans", "detail_count", "page", "page_size")
+
+
+async def _run_loans_past_due(session: AsyncSession, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Imported here so NumPy is not loaded at application startup
+    from services.loan_aging_service import loan_aging_service
+
+    return await loan_aging_service.past_due_report(
+        session, params["branch_id"], include_detail=True, page=1, page_size=LOANS_PAST_DUE_PAGE_SIZE
+    )
+
+
+PREGENERATED_JOBS: Dict[str, PregeneratedReport] = {
+    "loans_past_due": PregeneratedReport(
+        name="loans_past_due",
+        partitions=(("branch_id", True),),
+        run=_run_loans_past_due,
+        response_model=LoanPastDueResponse,
+        same_day=True,
+    ),
+}
+
+
+def get_pregenerated_report(name: str) -> Optional[PregeneratedReport]:
+    """
+    The pre-generation job for a name: an entry of PREGENERATED_JOBS or a
+    registered report, expanded over its branch/customer type parameters.
+    """
+    job = PREGENERATED_JOBS.get(name)
+    if job is not None or name not in REPORTS:
+        return job
+    definition = REPORTS[name]
+    return PregeneratedReport(
+        name=name,
+        partitions=tuple(
+            (parameter.name, parameter.required)
+            for parameter in definition.parameters
+            if parameter.name in PARTITION_PARAMETERS
+        ),
+        run=lambda session, params: _run_registered_report(name, session, params),
+        response_model=ReportRunResponse,
+    )
+
+
+def configured_reports() -> List[str]:
+    """Names of the reports to pre-generate (REPORT_PREGENERATE_REPORTS)."""
+    return [name.strip() for name in settings.REPORT_PREGENERATE_REPORTS.split(",") if name.strip()]
+
+
+def parse_schedule(schedule: str) -> List[clock_time]:
+    """
+    Parse a comma separated list of local times ("02:00,13:30").
+
+    Raises:
+        ValueError: If a time is malformed
+    """
+    times = []
+    for item in schedule.split(","):
+        if item.strip():
+            hour, _, minute = item.strip().partition(":")
+            times.append(clock_time(int(hour), int(minute or 0)))
+    return sorted(times)
+
+
+class ReportPregenerationService:
+    """
+    Service class for generating common reports off-peak and serving them.
+
+    At each time in REPORT_PREGENERATE_TIMES (server local time) every
+    report in REPORT_PREGENERATE_REPORTS is run for each active branch
+    (and each customer type, plus all types, where the report takes one).
+    Results are stored as gzip-compressed JSON files, exactly as the
+    endpoint would send them, in REPORT_PREGENERATE_DIR. The file's mtime
+    is its generation time; report endpoints serve a stored payload while
+    it is younger than the requested (or configured) maximum age, passing
+    the gzip bytes straight through to clients that accept them.
+
+    Workers on a host share the directory; a run takes an exclusive file
+    lock, so only one worker generates while the others keep serving.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or settings.REPORT_PREGENERATE_DIR
+        self._task: Optional[asyncio.Task] = None
+        self._running: Optional[asyncio.Task] = None
+        self._last_run: Optional[Dict[str, Any]] = None
+
+    def _path(self, name: str, params: Dict[str, Any]) -> str:
+        key = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.sha1(f"{name}:{key}".encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.directory, f"{name}-{digest}.json.gz")
+
+    async def get(
+        self, name: str, params: Dict[str, Any], max_age_seconds: Optional[int] = None
+    ) -> Optional[PregeneratedPayload]:
+        """
+        Get a stored payload that is fresh enough.
+
+        Args:
+            name: Report (or job) name
+            params: Bind parameters, in the form the job was generated with
+            max_age_seconds: Oldest acceptable payload (default
+                REPORT_PREGENERATE_MAX_AGE_SECONDS; 0 never serves one)
+
+        Returns:
+            The payload, or None if there is no fresh one
+        """
+        if max_age_seconds is None:
+            max_age_seconds = settings.REPORT_PREGENERATE_MAX_AGE_SECONDS
+        if not settings.REPORT_PREGENERATE_ENABLED or max_age_seconds <= 0 or name not in configured_reports():
+            return None
+        job = get_pregenerated_report(name)
+        if job is None:
+            return None
+        payload = await run_in_threadpool(self._read, self._path(name, params))
+        if payload is None or payload.age_seconds > max_age_seconds:
+            return None
+        if job.same_day and payload.generated_at.date() != date.today():
+            return None
+        return payload
+
+    def _read(self, path: str) -> Optional[PregeneratedPayload]:
+        try:
+            with open(path, "rb") as f:
+                generated_at = datetime.fromtimestamp(os.fstat(f.fileno()).st_mtime)
+                return PregeneratedPayload(f.read(), generated_at)
+        except FileNotFoundError:
+            return None
+
+    def _generated_at(self, path: str) -> datetime:
+        try:
+            return datetime.fromtimestamp(os.path.getmtime(path))
+        except FileNotFoundError:
+            return datetime.min
+
+    def response(
+        self, payload: PregeneratedPayload, accept_encoding: str, omit: Tuple[str, ...] = ()
+    ) -> Response:
+        """
+        The HTTP response for a stored payload: the gzip bytes as stored, or
+        decompressed for clients that do not accept gzip.
+
+        Args:
+            payload: The stored payload
+            accept_encoding: The request's Accept-Encoding header
+            omit: Top-level fields to send as null (the payload is then
+                re-encoded, and compressed by the middleware if at all)
+        """
+        headers = {
+            "Age": str(payload.age_seconds),
+            "X-Report-Generated-At": payload.generated_at.astimezone().isoformat(),
+            "Vary": "Accept-Encoding",
+        }
+        if omit:
+            content = json.loads(gzip.decompress(payload.content))
+            content.update(dict.fromkeys(omit))
+            return Response(json.dumps(content).encode("utf-8"), media_type="application/json", headers=headers)
+        if negotiate_encoding(accept_encoding, ["gzip"]) == "gzip":
+            headers["Content-Encoding"] = "gzip"
+            return Response(payload.content, media_type="application/json", headers=headers)
+        return Response(gzip.decompress(payload.content), media_type="application/json", headers=headers)
+
+    async def _partition_values(self, job: PregeneratedReport) -> List[Dict[str, Any]]:
+        values = []
+        for parameter, required in job.partitions:
+            snapshot = await reference_data_service.get_or_load(PARTITION_PARAMETERS[parameter])
+            ids = [item.id for item in snapshot.items]
+            values.append(ids if required else [None] + ids)
+        names = [parameter for parameter, _ in job.partitions]
+        return [dict(zip(names, combination)) for combination in product(*values)]
+
+    async def generate(self, job: PregeneratedReport, params: Dict[str, Any]) -> bool:
+        """
+        Run one report and store its payload.
+
+        Returns:
+            Whether a payload was stored (False if the report failed)
+        """
+        if job.name in REPORTS:
+            params = REPORTS[job.name].bind_parameters(params)
+        async with read_only_session() as session:
+            result = await job.run(session, params)
+        if result is None:
+            return False
+        content = job.response_model.model_validate(result).model_dump_json().encode("utf-8")
+        await run_in_threadpool(self._write, self._path(job.name, params), content)
+        return True
+
+    def _write(self, path: str, content: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            # Compressed once, served many times: use the best ratio
+            f.write(gzip.compress(content, compresslevel=9))
+        os.replace(tmp_path, path)
+
+    async def run_all(self, since: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Generate every configured report for every partition.
+
+        Args:
+            since: Skip payloads already generated at or after this time
+                (by another worker for the same scheduled run)
+
+        Returns:
+            Dict[str, Any]: Run summary (generated, skipped and failed counts)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        lock = open(os.path.join(self.directory, ".lock"), "wb")
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    logger.info("Report pre-generation is already running in another worker")
+                    return {"started_at": datetime.now().isoformat(), "running_elsewhere": True}
+            return await self._run_all(since)
+        finally:
+            lock.close()
+
+    async def _run_all(self, since: Optional[datetime]) -> Dict[str, Any]:
+        started_at = datetime.now()
+        started = time.perf_counter()
+        summary = {"started_at": started_at.isoformat(), "generated": 0, "skipped": 0, "failed": 0}
+        for name in configured_reports():
+            job = get_pregenerated_report(name)
+            if job is None:
+                logger.warning(f"Report '{name}' cannot be pre-generated: not registered")
+                continue
+            for params in await self._partition_values(job):
+                if since is not None and self._generated_at(self._path(name, params)) >= since:
+                    summary["skipped"] += 1
+                    continue
+                try:
+                    stored = await self.generate(job, params)
+                except Exception as e:
+                    logger.warning(f"Failed to pre-generate report '{name}' for {params}: {str(e)}")
+                    stored = False
+                summary["generated" if stored else "failed"] += 1
+
+        await run_in_threadpool(self._remove_expired)
+        summary["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Pre-generated reports: {summary}")
+        self._last_run = summary
+        return summary
+
+    def _remove_expired(self) -> None:
+        """Delete payloads too old to be served (e.g. of deactivated branches)."""
+        cutoff = time.time() - settings.REPORT_PREGENERATE_MAX_AGE_SECONDS
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json.gz") and entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def trigger(self) -> bool:
+        """
+        Start a run now in the background.
+
+        Returns:
+            False if a run is already in progress in this or another worker
+        """
+        if self._running is not None and not self._running.done():
+            return False
+        if self.running_elsewhere():
+            return False
+        self._running = asyncio.create_task(self.run_all())
+        return True
+
+    def running_elsewhere(self) -> bool:
+        """Whether another worker currently holds the run lock."""
+        if fcntl is None:
+            return False
+        try:
+            with open(os.path.join(self.directory, ".lock"), "rb") as lock:
+                try:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return True
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        except FileNotFoundError:
+            pass
+        return False
+
+    def next_run(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """The next scheduled run after now (server local time)."""
+        now = now or datetime.now()
+        times = parse_schedule(settings.REPORT_PREGENERATE_TIMES)
+        if not times:
+            return None
+        for day in (now.date(), now.date() + timedelta(days=1)):
+            for at in times:
+                scheduled = datetime.combine(day, at)
+                if scheduled > now:
+                    return scheduled
+        return None
+
+    def status(self) -> Dict[str, Any]:
+        entries = 0
+        total_bytes = 0
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json.gz"):
+                    entries += 1
+                    total_bytes += entry.stat().st_size
+        next_run = self.next_run() if settings.REPORT_PREGENERATE_ENABLED else None
+        return {
+            "enabled": settings.REPORT_PREGENERATE_ENABLED,
+            "reports": configured_reports(),
+            "schedule": settings.REPORT_PREGENERATE_TIMES,
+            "max_age_seconds": settings.REPORT_PREGENERATE_MAX_AGE_SECONDS,
+            "next_run": next_run.isoformat() if next_run else None,
+            "last_run": self._last_run,
+            "running": self._running is not None and not self._running.done(),
+            "entries": entries,
+            "bytes": total_bytes,
+        }
+
+    async def start(self) -> None:
+        """Start the scheduler (nothing is generated at startup)."""
+        if not settings.REPORT_PREGENERATE_ENABLED or self._task is not None:
+            return
+        try:
+            parse_schedule(settings.REPORT_PREGENERATE_TIMES)
+        except ValueError:
+            logger.warning(f"Invalid REPORT_PREGENERATE_TIMES '{settings.REPORT_PREGENERATE_TIMES}'; scheduler not started")
+            return
+        self._task = asyncio.create_task(self._schedule_loop())
+
+    async def stop(self) -> None:
+        """Stop the scheduler and any run in progress."""
+        for task in (self._task, self._running):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._running = None
+
+    async def _schedule_loop(self) -> None:
+        while True:
+            scheduled = self.next_run()
+            if scheduled is None:
+                return
+            await asyncio.sleep(max((scheduled - datetime.now()).total_seconds(), 0))
+            try:
+                self._running = asyncio.create_task(self.run_all(since=scheduled))
+                await self._running
+            except Exception as e:
+                logger.warning(f"Report pre-generation failed: {str(e)}")
+
+
+report_pregeneration_service = ReportPregenerationService()
@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from services.language_service import localize_sql
+
+
+@dataclass(frozen=True)
+class ReportParameter:
+    """A bind parameter accepted by a registered report"""
+
+    name: str
+    type: type = int
+    required: bool = False
+
+
+@dataclass(frozen=True)
+class ReportDefinition:
+    """
+    A named, parameterized report query.
+
+    The SQL uses :name bind parameters and may contain a {delta} slot inside
+    its WHERE clause; for delta refreshes the slot becomes
+    "AND (<change column> >= :_since OR ...)" and otherwise it is removed.
+    Multilingual fields are written {ln:alias.field} and resolve to the
+    caller's _lnN column (see language_service.localize_sql).
+    """
+
+    name: str
+    title: str
+    sql: str
+    parameters: Tuple[ReportParameter, ...] = ()
+    primary_key: Optional[str] = None
+    order_by: Tuple[str, ...] = ()
+    change_columns: Tuple[str, ...] = ()
+
+    @property
+    def supports_delta(self) -> bool:
+        return bool(self.primary_key and self.change_columns and "{delta}" in self.sql)
+
+    def render_sql(self, delta: bool = False, language: int = 1) -> str:
+        """
+        Render the report SQL, with or without the delta predicate, with
+        {ln:field} placeholders resolved for a language column slot.
+        """
+        predicate = ""
+        if delta:
+            predicate = "AND (" + " OR ".join(
+                f"{column} >= :_since" for column in self.change_columns
+            ) + ")"
+        return localize_sql(self.sql.replace("{delta}", predicate), language)
+
+    def bind_parameters(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate and coerce request parameters.
+
+        Raises:
+            ValueError: If a parameter is unknown, missing or has the wrong type
+        """
+        known = {parameter.name: parameter for parameter in self.parameters}
+        unknown = set(params) - set(known)
+        if unknown:
+            raise ValueError(f"Unknown parameter(s) for report '{self.name}': {', '.join(sorted(unknown))}")
+
+        binds = {}
+        for name, parameter in known.items():
+            value = params.get(name)
+            if value is None or value == "":
+                if parameter.required:
+                    raise ValueError(f"Parameter '{name}' is required for report '{self.name}'")
+                binds[name] = None
+                continue
+            try:
+                binds[name] = parameter.type(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Parameter '{name}' must be of type {parameter.type.__name__}")
+        return binds
+
+
+REPORTS: Dict[str, ReportDefinition] = {}
+
+
+def register_report(definition: ReportDefinition) -> ReportDefinition:
+    """Add a report to the registry (replacing one with the same name)."""
+    REPORTS[definition.name] = definition
+    return definition
+
+
+def get_report(name: str) -> ReportDefinition:
+    """
+    Look up a registered report.
+
+    Raises:
+        ValueError: If no report with that name is registered
+    """
+    definition = REPORTS.get(name)
+    if definition is None:
+        raise ValueError(f"Report '{name}' not found")
+    return definition
+
+
+register_report(ReportDefinition(
+    name="customer_list",
+    title="Customer List",
+    sql="""
+SELECT
+    c.id                           AS `customer_id`,
+    c.customer_number              AS `Ref member number`,
+    {ln:ct.type}                   AS `Customer type`,
+    {ln:c.full_name}               AS `Name`,
+    {ln:c.address}                 AS `Address`,
+    c.home_phone                   AS `Phone`,
+    c.mobile_1                     AS `Mobile`,
+    c.date_of_birth                AS `Date of Birth`,
+    c.gender                       AS `Sex`,
+    {ln:b.name}                    AS `Branch Name`
+FROM
+    ci_customer AS c
+    LEFT JOIN gl_branch AS b
+        ON c.branch_id = b.id
+    LEFT JOIN ci_customer_type AS ct
+        ON c.customer_type_id = ct.id
+WHERE
+    c.branch_id = :branch_id
+    AND (:customer_type_id IS NULL OR c.customer_type_id = :customer_type_id)
+    {delta}
+ORDER BY
+    c.customer_number
+""",
+    parameters=(
+        ReportParameter("branch_id", int, required=True),
+        ReportParameter("customer_type_id", int),
+    ),
+    primary_key="customer_id",
+    order_by=("Ref member number",),
+    change_columns=("c.m_at", "c.c_at", "b.m_at", "ct.m_at"),
+))
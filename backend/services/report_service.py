@@ -0,0 +1,264 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.config import settings
+from config.database import read_only_session
+from schemas.aggregation_schemas import AggregationSpec
+from services.index_advisor_service import index_advisor_service
+from services.materialization_service import materialization_service
+from services.report_registry import REPORTS, ReportDefinition
+from services.report_snapshot_service import report_snapshot_service
+from services.sql_executor_service import sql_executor_service
+
+logger = logging.getLogger(__name__)
+
+
+class ReportService:
+    """Service class for running registered (named) reports"""
+
+    def list_reports(self) -> List[ReportDefinition]:
+        """Get all registered reports ordered by name."""
+        return sorted(REPORTS.values(), key=lambda definition: definition.name)
+
+    async def execute(
+        self,
+        session: AsyncSession,
+        sql: str,
+        binds: Dict[str, Any],
+        aggregate: Optional[AggregationSpec] = None,
+    ) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Execute rendered report SQL and convert the rows.
+
+        Returns:
+            Tuple of (columns, row dictionaries)
+        """
+        started = time.perf_counter()
+        result = await session.execute(text(sql), binds)
+        columns, rows = list(result.keys()), result.fetchall()
+        index_advisor_service.record(sql, (time.perf_counter() - started) * 1000)
+        if aggregate is not None:
+            from services.aggregation_service import aggregation_service
+
+            columns, rows = aggregation_service.aggregate(columns, rows, aggregate)
+        data, columns, _ = sql_executor_service.convert_rows(columns, rows)
+        return columns, data
+
+    async def run_report(
+        self,
+        session: AsyncSession,
+        definition: ReportDefinition,
+        params: Dict[str, Any],
+        mode: str = "live",
+        aggregate: Optional[AggregationSpec] = None,
+        language: int = 1,
+    ) -> Dict[str, Any]:
+        """
+        Run a registered report.
+
+        Args:
+            session: Database session
+            definition: The report to run
+            params: Raw request parameters
+            mode: "live" to serve from a materialized summary table when one
+                is populated (else the base tables), "base" to always query
+                the base tables, "snapshot" to refresh a stored result
+                incrementally from c_at/m_at
+            aggregate: Optional grouping/subtotal/pivot spec (not available
+                in snapshot mode)
+            language: Column slot of the caller's language; multilingual
+                fields fall back to _ln1 where empty
+
+        Returns:
+            Dict[str, Any]: Report results and metadata
+
+        Raises:
+            ValueError: If the parameters are invalid or the mode is unsupported
+        """
+        binds = definition.bind_parameters(params)
+        if mode == "snapshot" and not definition.supports_delta:
+            raise ValueError(f"Report '{definition.name}' does not support snapshot mode")
+        if mode == "snapshot" and aggregate is not None:
+            raise ValueError("Aggregation is not available in snapshot mode")
+
+        try:
+            snapshot = None
+            source = "base"
+            view = materialization_service.view_for_report(definition.name, language) if mode == "live" else None
+            if mode == "snapshot":
+                columns, data, snapshot = await report_snapshot_service.run(
+                    session, definition, binds, self.execute, language
+                )
+            elif view is not None:
+                columns, data = await self.execute(session, view.serving_sql(), binds, aggregate)
+                source = f"materialized:{view.name}"
+            else:
+                columns, data = await self.execute(
+                    session, definition.render_sql(language=language), binds, aggregate
+                )
+
+            return {
+                "success": True,
+                "report": definition.name,
+                "data": data,
+                "columns": columns,
+                "row_count": len(data),
+                "source": source,
+                "snapshot": snapshot,
+            }
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error running report '{definition.name}': {str(e)}")
+            return {
+                "success": False,
+                "report": definition.name,
+                "error": sql_executor_service.friendly_error(e),
+                "data": [],
+            }
+
+    def stream_report(
+        self,
+        definition: ReportDefinition,
+        params: Dict[str, Any],
+        mode: str = "live",
+        language: int = 1,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run a registered report progressively, as (event, data) pairs.
+
+        Parameters are validated up front, so errors surface before any
+        event is produced. The report runs in its own read-only session
+        (the stream outlives the request handler) and yields, in order:
+
+        - "columns": column names, source and the planner's row estimate,
+          as soon as the query returns its first result
+        - "rows": the first REPORT_STREAM_FIRST_PAGE_ROWS rows, then
+          batches of QUERY_FETCH_BATCH_SIZE
+        - "progress": rows fetched, elapsed time and estimated total,
+          every REPORT_STREAM_PROGRESS_SECONDS (also while the database
+          is still working on the next batch)
+        - "complete" with the row count and duration, or "error"
+
+        Rows are converted and handed out batch by batch, never held.
+
+        Args:
+            definition: The report to run
+            params: Raw request parameters
+            mode: "live" (materialized summary table when populated) or "base"
+            language: Column slot of the caller's language
+
+        Raises:
+            ValueError: If the parameters are invalid or the mode is unsupported
+        """
+        binds = definition.bind_parameters(params)
+        if mode not in ("live", "base"):
+            raise ValueError(f"Mode '{mode}' is not available for streamed reports")
+        return self._stream(definition, binds, mode, language)
+
+    async def _stream(
+        self, definition: ReportDefinition, binds: Dict[str, Any], mode: str, language: int
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        started = time.perf_counter()
+        view = materialization_service.view_for_report(definition.name, language) if mode == "live" else None
+        sql = view.serving_sql() if view is not None else definition.render_sql(language=language)
+        source = f"materialized:{view.name}" if view is not None else "base"
+        row_count = 0
+        estimated_total = None
+        omitted_columns = set()
+        fetch = None
+
+        def progress() -> Dict[str, Any]:
+            return {
+                "rows_fetched": row_count,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "estimated_total": estimated_total,
+            }
+
+        try:
+            async with read_only_session() as session:
+                estimated_total = await self.estimate_rows(session, sql, binds)
+                result = await session.stream(text(sql), binds)
+                try:
+                    columns = list(result.keys())
+                    yield "columns", {
+                        "report": definition.name,
+                        "columns": columns,
+                        "source": source,
+                        "estimated_total": estimated_total,
+                    }
+
+                    size = settings.REPORT_STREAM_FIRST_PAGE_ROWS
+                    last_progress = time.perf_counter()
+                    while True:
+                        fetch = asyncio.ensure_future(result.fetchmany(size))
+                        while True:
+                            done, _ = await asyncio.wait({fetch}, timeout=settings.REPORT_STREAM_PROGRESS_SECONDS)
+                            if done:
+                                break
+                            last_progress = time.perf_counter()
+                            yield "progress", progress()
+                        rows, fetch = fetch.result(), None
+                        if not rows:
+                            break
+
+                        data, _, batch_omitted = sql_executor_service.convert_rows(columns, rows)
+                        omitted_columns.update(batch_omitted)
+                        yield "rows", {"offset": row_count, "rows": data}
+                        row_count += len(rows)
+                        size = settings.QUERY_FETCH_BATCH_SIZE
+                        if time.perf_counter() - last_progress >= settings.REPORT_STREAM_PROGRESS_SECONDS:
+                            last_progress = time.perf_counter()
+                            yield "progress", progress()
+                finally:
+                    try:
+                        if fetch is not None:
+                            # The client went away while a batch was being
+                            # fetched; let the fetch unwind before the cursor
+                            # is closed, so the connection never has two
+                            # operations in flight
+                            fetch.cancel()
+                            await asyncio.wait({fetch})
+                    finally:
+                        await result.close()
+
+            duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            index_advisor_service.record(sql, duration_ms)
+            yield "complete", {
+                "report": definition.name,
+                "row_count": row_count,
+                "duration_ms": duration_ms,
+                "source": source,
+                "omitted_columns": sorted(omitted_columns) or None,
+            }
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error streaming report '{definition.name}': {str(e)}")
+            yield "error", {"report": definition.name, "error": sql_executor_service.friendly_error(e), **progress()}
+        except Exception as e:
+            logger.error(f"Unexpected error streaming report '{definition.name}': {str(e)}")
+            yield "error", {"report": definition.name, "error": "Internal server error", **progress()}
+
+    async def estimate_rows(self, session: AsyncSession, sql: str, binds: Dict[str, Any]) -> Optional[int]:
+        """
+        The planner's estimate of the rows a query returns (MySQL EXPLAIN of
+        the driving table); None where no estimate is available.
+        """
+        if session.bind.dialect.name != "mysql":
+            return None
+        try:
+            plan = (await session.execute(text(f"EXPLAIN {sql}"), binds)).mappings().first()
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not estimate report rows: {str(e)}")
+            return None
+        if not plan or not plan.get("rows"):
+            return None
+        return int(plan["rows"] * float(plan.get("filtered") or 100) / 100)
+
+
+report_service = ReportService()
@@ -0,0 +1,146 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.config import settings
+from config.database import database_now
+from services.report_registry import ReportDefinition
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReportSnapshot:
+    """Locally stored result of a report for one parameter set"""
+
+    columns: List[str]
+    rows: Dict[Any, Dict[str, Any]]
+    watermark: datetime
+    full_refreshed_at: float
+    refreshed_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+def _sort_key(order_by: Tuple[str, ...]):
+    return lambda row: tuple((row.get(column) is None, row.get(column)) for column in order_by)
+
+
+class ReportSnapshotService:
+    """
+    Service class for snapshot-mode report execution.
+
+    The first run of a report for a parameter set stores the full result,
+    keyed by primary key, together with a watermark taken from the database
+    clock before the query started. Later runs only fetch rows whose change
+    columns (c_at/m_at of the report's tables) moved past the watermark and
+    merge them in by primary key. Deleted rows, and rows that stopped
+    matching the filters, are only dropped by the periodic full reconcile
+    (REPORT_SNAPSHOT_RECONCILE_SECONDS).
+    """
+
+    def __init__(self, max_entries: int = settings.REPORT_SNAPSHOT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._snapshots: "OrderedDict[Tuple[str, str, int], ReportSnapshot]" = OrderedDict()
+        self._locks: Dict[Tuple[str, str, int], asyncio.Lock] = {}
+
+    def _key(self, definition: ReportDefinition, binds: Dict[str, Any], language: int) -> Tuple[str, str, int]:
+        return definition.name, json.dumps(binds, sort_keys=True, default=str), language
+
+    def invalidate(self, report_name: Optional[str] = None) -> None:
+        """Drop stored snapshots, for one report or all of them."""
+        for key in list(self._snapshots):
+            if report_name is None or key[0] == report_name:
+                del self._snapshots[key]
+
+    async def run(
+        self,
+        session: AsyncSession,
+        definition: ReportDefinition,
+        binds: Dict[str, Any],
+        execute,
+        language: int = 1,
+    ) -> Tuple[List[str], List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Run a report in snapshot mode.
+
+        Args:
+            session: Database session
+            definition: The report to run (must support delta refresh)
+            binds: Validated bind parameters
+            execute: Coroutine (session, sql, binds) -> (columns, row dicts)
+            language: Language column slot (snapshots are kept per language)
+
+        Returns:
+            Tuple of (columns, rows, snapshot metadata)
+        """
+        key = self._key(definition, binds, language)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            snapshot = self._snapshots.get(key)
+            watermark = await database_now(session)
+
+            reconcile_due = (
+                snapshot is not None
+                and time.monotonic() - snapshot.full_refreshed_at >= settings.REPORT_SNAPSHOT_RECONCILE_SECONDS
+            )
+
+            if snapshot is None or reconcile_due:
+                columns, rows = await execute(session, definition.render_sql(language=language), binds)
+                snapshot = ReportSnapshot(
+                    columns=columns,
+                    rows={row[definition.primary_key]: row for row in rows},
+                    watermark=watermark,
+                    full_refreshed_at=time.monotonic(),
+                )
+                refresh, delta_rows = "full", len(rows)
+            else:
+                since = snapshot.watermark - timedelta(seconds=settings.REPORT_SNAPSHOT_WATERMARK_LAG_SECONDS)
+                columns, rows = await execute(
+                    session, definition.render_sql(delta=True, language=language), {**binds, "_since": since}
+                )
+                # Stored rows stay in report order; re-sort when a row is new
+                # or an update moved one of its order_by values
+                sort_key = _sort_key(definition.order_by)
+                reorder = False
+                for row in rows:
+                    row_key = row[definition.primary_key]
+                    previous = snapshot.rows.get(row_key)
+                    reorder = reorder or previous is None or sort_key(previous) != sort_key(row)
+                    snapshot.rows[row_key] = row
+                if reorder and definition.order_by:
+                    snapshot.rows = {
+                        row[definition.primary_key]: row
+                        for row in sorted(snapshot.rows.values(), key=_sort_key(definition.order_by))
+                    }
+                if columns:
+                    snapshot.columns = columns
+                snapshot.watermark = watermark
+                snapshot.refreshed_at = datetime.now(timezone.utc)
+                refresh, delta_rows = "delta", len(rows)
+
+            self._snapshots[key] = snapshot
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_entries:
+                evicted, _ = self._snapshots.popitem(last=False)
+                self._locks.pop(evicted, None)
+
+            logger.info(
+                f"Report '{definition.name}' snapshot {refresh} refresh: "
+                f"{delta_rows} rows fetched, {len(snapshot.rows)} rows stored"
+            )
+            return snapshot.columns, list(snapshot.rows.values()), {
+                "refresh": refresh,
+                "fetched_rows": delta_rows,
+                "watermark": snapshot.watermark.isoformat(),
+                "refreshed_at": snapshot.refreshed_at.isoformat(),
+            }
+
+
+report_snapshot_service = ReportSnapshotService()
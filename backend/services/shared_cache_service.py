@@ -0,0 +1,451 @@
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: the cache is disabled
+    fcntl = None
+
+from config.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ABCACHE2"
+
+# magic, slot count, segment count, segment size, namespace slots,
+# hits, misses, evictions, access clock, active segment, live slots, tombstones
+_HEADER = struct.Struct("<8sIIIIQQQQIQQ")
+_HEADER_SIZE = 128
+# name hash, version
+_NAMESPACE = struct.Struct("<QQ")
+# bytes used, last access (clock)
+_SEGMENT = struct.Struct("<QQ")
+_STAMP = struct.Struct("<Q")
+# key hash, namespace version, expires at, segment, offset, key length, value length, namespace slot
+_SLOT = struct.Struct("<QQdIIIII")
+# Stored ahead of each key and value in the data area: key hash, key length,
+# value length. Eviction walks these to find a segment's index slots.
+_ENTRY = struct.Struct("<QII")
+
+_EMPTY = 0
+_TOMBSTONE = 1
+_MAX_LOAD = 0.75
+
+
+def _hash(data: bytes) -> int:
+    # 0 and 1 mark empty and deleted slots
+    return max(int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little"), 2)
+
+
+def _default_path() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "ai_banker_shared_cache")
+
+
+class SharedCache:
+    """
+    Host-wide cache of serialized values in a shared memory-mapped file.
+
+    Every worker process maps the same file (in /dev/shm where available),
+    so a value cached by one worker is a hit for all of them and memory
+    scales with the data, not with the worker count. Values are stored as
+    bytes (typically ready-to-send JSON) and handed out as such; nothing is
+    deserialized unless the caller needs it.
+
+    Layout: a header, a namespace table, a segment table, an open-addressing
+    index of fixed slots, and a data area split into equal segments. Writes
+    are appended to the active segment; when no segment is free the least
+    recently used one is evicted as a whole, by looking up each of its
+    entries in the index. Each namespace has a version stored in the file,
+    and bumping it invalidates all of its entries in every worker at once.
+    Entries also expire after their TTL.
+
+    Writers take an exclusive flock on the file and readers a shared one,
+    so gets in different workers run concurrently. A get never waits: while
+    a writer holds the lock it is a miss. Gets only stamp their segment's
+    last access; hit/miss counters are kept per process and folded into the
+    file by the next write or stats call. Where flock is unavailable the
+    cache is disabled and every get is a miss.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        size_mb: Optional[int] = None,
+        segment_kb: Optional[int] = None,
+        slot_count: Optional[int] = None,
+        namespace_slots: int = 64,
+    ):
+        self.segment_size = (segment_kb or settings.SHARED_CACHE_SEGMENT_KB) * 1024
+        size = (size_mb or settings.SHARED_CACHE_SIZE_MB) * 1024 * 1024
+        self.segment_count = max(size // self.segment_size, 2)
+        self.slot_count = slot_count or settings.SHARED_CACHE_INDEX_SLOTS
+        self.namespace_slots = namespace_slots
+        # The layout is part of the file name, so workers configured
+        # differently never map the same file with different offsets
+        base = path or settings.SHARED_CACHE_PATH or _default_path()
+        self.path = f"{base}-{self.segment_count}x{self.segment_size}-{self.slot_count}"
+
+        self.namespace_offset = _HEADER_SIZE
+        self.segment_offset = self.namespace_offset + namespace_slots * _NAMESPACE.size
+        self.slot_offset = self.segment_offset + self.segment_count * _SEGMENT.size
+        self.data_offset = self.slot_offset + self.slot_count * _SLOT.size
+        self.total_size = self.data_offset + self.segment_count * self.segment_size
+
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._thread_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._disabled = not settings.SHARED_CACHE_ENABLED or fcntl is None
+
+    @property
+    def enabled(self) -> bool:
+        return not self._disabled
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        """
+        Get a cached value.
+
+        Returns:
+            The value bytes, or None on a miss (absent, expired, invalidated
+            or the cache locked by a writer)
+        """
+        if not self._open():
+            return None
+        key_bytes = key.encode("utf-8")
+        with self._locked(shared=True, blocking=False) as held:
+            namespace_entry = self._namespace(namespace, register=False) if held else None
+            fields = None
+            if namespace_entry is not None:
+                _, fields = self._find(namespace_entry[0], key_bytes)
+            if fields is None or fields[1] != namespace_entry[1] or fields[2] < time.time():
+                self._misses += 1
+                return None
+
+            _, _, _, segment, offset, key_length, value_length, _ = fields
+            self._hits += 1
+            # Only readers run concurrently with this, so the clock is stable
+            # and the stamp is the single field written
+            _STAMP.pack_into(
+                self._map, self.segment_offset + segment * _SEGMENT.size + 8, self._header()[8]
+            )
+
+            start = self.data_offset + segment * self.segment_size + offset + _ENTRY.size + key_length
+            return self._map[start:start + value_length]
+
+    def put(self, namespace: str, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        """
+        Store a value under the namespace's current version.
+
+        Args:
+            namespace: Invalidation group (e.g. "nav_menu")
+            key: Key within the namespace
+            value: Serialized value
+            ttl: Seconds until the entry expires (default SHARED_CACHE_TTL_SECONDS)
+
+        Returns:
+            False if the cache is disabled or the value is too large
+        """
+        key_bytes = key.encode("utf-8")
+        size = _ENTRY.size + len(key_bytes) + len(value)
+        if size > min(self.segment_size, settings.SHARED_CACHE_MAX_ITEM_KB * 1024) or not self._open():
+            return False
+
+        expires_at = time.time() + (settings.SHARED_CACHE_TTL_SECONDS if ttl is None else ttl)
+        with self._locked():
+            self._flush_counters()
+            ns_slot, ns_version = self._namespace(namespace)
+            existing, _ = self._find(ns_slot, key_bytes)
+            if existing is not None:
+                self._delete_slot(existing)
+
+            # Keep the index under its load factor: drop tombstones first,
+            # then evict least recently used segments
+            header = self._header()
+            if header[10] + header[11] + 1 > self.slot_count * _MAX_LOAD:
+                self._rebuild_index()
+            while self._header()[10] + 1 > self.slot_count * _MAX_LOAD:
+                self._evict_segment(self._lru_segment(exclude=self._header()[9]))
+
+            key_hash = _hash(key_bytes)
+            segment, offset = self._allocate(size)
+            start = self.data_offset + segment * self.segment_size + offset
+            _ENTRY.pack_into(self._map, start, key_hash, len(key_bytes), len(value))
+            self._map[start + _ENTRY.size:start + size] = key_bytes + value
+
+            self._write_slot(
+                self._probe_free(key_hash),
+                (key_hash, ns_version, expires_at, segment, offset, len(key_bytes), len(value), ns_slot),
+            )
+            header = list(self._header())
+            header[10] += 1
+            self._write_header(header)
+        return True
+
+    def invalidate(self, namespace: str) -> int:
+        """
+        Invalidate every entry of a namespace in all workers.
+
+        Returns:
+            The namespace's new version
+        """
+        if not self._open():
+            return 0
+        with self._locked():
+            self._flush_counters()
+            ns_slot, version = self._namespace(namespace)
+            name_hash = _hash(namespace.encode("utf-8"))
+            _NAMESPACE.pack_into(self._map, self.namespace_offset + ns_slot * _NAMESPACE.size, name_hash, version + 1)
+        logger.info(f"Shared cache namespace '{namespace}' invalidated (v{version + 1})")
+        return version + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache-wide counters (shared by all workers)."""
+        if not self._open():
+            return {"enabled": False}
+        with self._locked():
+            self._flush_counters()
+            header = self._header()
+            used = sum(self._segment(s)[0] for s in range(self.segment_count))
+        lookups = header[5] + header[6]
+        return {
+            "enabled": True,
+            "path": self.path,
+            "size_bytes": self.total_size,
+            "used_bytes": used,
+            "entries": header[10],
+            "hits": header[5],
+            "misses": header[6],
+            "hit_rate": round(header[5] / lookups, 4) if lookups else None,
+            "evictions": header[7],
+        }
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            os.close(self._fd)
+            self._map, self._fd = None, None
+
+    # Storage -------------------------------------------------------------
+
+    def _open(self) -> bool:
+        if self._map is not None:
+            return True
+        if self._disabled:
+            return False
+        with self._thread_lock:
+            if self._map is not None:
+                return True
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    if os.fstat(fd).st_size < self.total_size:
+                        os.ftruncate(fd, self.total_size)
+                    mapped = mmap.mmap(fd, self.total_size)
+                    header = _HEADER.unpack_from(mapped, 0)
+                    layout = (MAGIC, self.slot_count, self.segment_count, self.segment_size, self.namespace_slots)
+                    if header[:5] != layout:
+                        # New file
+                        mapped[:self.data_offset] = bytes(self.data_offset)
+                        _HEADER.pack_into(mapped, 0, *layout, 0, 0, 0, 0, 0, 0, 0)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+            except OSError as e:
+                logger.warning(f"Shared cache disabled, cannot map {self.path}: {str(e)}")
+                self._disabled = True
+                return False
+            self._fd, self._map = fd, mapped
+            logger.info(f"Shared cache mapped at {self.path} ({self.total_size // (1024 * 1024)} MB)")
+            return True
+
+    class _Lock:
+        """
+        flock on the file (shared or exclusive) plus the in-process thread lock.
+
+        flock is held per open file, which this process's threads share, so
+        they are serialized by the thread lock. Entering yields whether the
+        lock was taken; only a non-blocking attempt can fail.
+        """
+
+        def __init__(self, cache: "SharedCache", shared: bool, blocking: bool):
+            self.cache = cache
+            self.operation = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | (0 if blocking else fcntl.LOCK_NB)
+            self.blocking = blocking
+            self.held = False
+
+        def __enter__(self) -> bool:
+            if not self.cache._thread_lock.acquire(blocking=self.blocking):
+                return False
+            try:
+                fcntl.flock(self.cache._fd, self.operation)
+            except BlockingIOError:
+                self.cache._thread_lock.release()
+                return False
+            self.held = True
+            return True
+
+        def __exit__(self, *exc_info):
+            if self.held:
+                fcntl.flock(self.cache._fd, fcntl.LOCK_UN)
+                self.cache._thread_lock.release()
+                self.held = False
+
+    def _locked(self, shared: bool = False, blocking: bool = True) -> "SharedCache._Lock":
+        return SharedCache._Lock(self, shared, blocking)
+
+    def _flush_counters(self) -> None:
+        """Fold this process's hit/miss counts into the header (exclusive lock held)."""
+        if self._hits or self._misses:
+            header = list(self._header())
+            header[5] += self._hits
+            header[6] += self._misses
+            self._write_header(header)
+            self._hits = self._misses = 0
+
+    def _header(self) -> Tuple[Any, ...]:
+        return _HEADER.unpack_from(self._map, 0)
+
+    def _write_header(self, header) -> None:
+        _HEADER.pack_into(self._map, 0, *header)
+
+    def _segment(self, segment: int) -> Tuple[int, int]:
+        return _SEGMENT.unpack_from(self._map, self.segment_offset + segment * _SEGMENT.size)
+
+    def _write_segment(self, segment: int, used: int, last_access: int) -> None:
+        _SEGMENT.pack_into(self._map, self.segment_offset + segment * _SEGMENT.size, used, last_access)
+
+    def _slot(self, slot: int) -> Tuple[Any, ...]:
+        return _SLOT.unpack_from(self._map, self.slot_offset + slot * _SLOT.size)
+
+    def _write_slot(self, slot: int, fields) -> None:
+        _SLOT.pack_into(self._map, self.slot_offset + slot * _SLOT.size, *fields)
+
+    def _namespace(self, namespace: str, register: bool = True) -> Optional[Tuple[int, int]]:
+        """
+        Find (or register) a namespace; returns (table slot, version), or
+        None if it is not registered and register is False.
+        """
+        name_hash = _hash(namespace.encode("utf-8"))
+        start = name_hash % self.namespace_slots
+        for i in range(self.namespace_slots):
+            ns_slot = (start + i) % self.namespace_slots
+            stored_hash, version = _NAMESPACE.unpack_from(self._map, self.namespace_offset + ns_slot * _NAMESPACE.size)
+            if stored_hash == name_hash:
+                return ns_slot, version
+            if stored_hash == _EMPTY:
+                if not register:
+                    return None
+                _NAMESPACE.pack_into(self._map, self.namespace_offset + ns_slot * _NAMESPACE.size, name_hash, 1)
+                return ns_slot, 1
+        raise RuntimeError("Shared cache namespace table is full")
+
+    def _find(self, ns_slot: int, key_bytes: bytes) -> Tuple[Optional[int], Optional[Tuple[Any, ...]]]:
+        key_hash = _hash(key_bytes)
+        start = key_hash % self.slot_count
+        for i in range(self.slot_count):
+            slot = (start + i) % self.slot_count
+            fields = self._slot(slot)
+            if fields[0] == _EMPTY:
+                break
+            if fields[0] == key_hash and fields[7] == ns_slot and fields[5] == len(key_bytes):
+                key_start = self.data_offset + fields[3] * self.segment_size + fields[4] + _ENTRY.size
+                if self._map[key_start:key_start + fields[5]] == key_bytes:
+                    return slot, fields
+        return None, None
+
+    def _slot_of(self, key_hash: int, segment: int, offset: int) -> Optional[int]:
+        """The index slot of the entry stored at (segment, offset), if still indexed."""
+        start = key_hash % self.slot_count
+        for i in range(self.slot_count):
+            slot = (start + i) % self.slot_count
+            fields = self._slot(slot)
+            if fields[0] == _EMPTY:
+                break
+            if fields[0] == key_hash and fields[3] == segment and fields[4] == offset:
+                return slot
+        return None
+
+    def _probe_free(self, key_hash: int) -> int:
+        start = key_hash % self.slot_count
+        for i in range(self.slot_count):
+            slot = (start + i) % self.slot_count
+            if self._slot(slot)[0] in (_EMPTY, _TOMBSTONE):
+                return slot
+        raise RuntimeError("Shared cache index is full")
+
+    def _delete_slot(self, slot: int) -> None:
+        header = list(self._header())
+        self._write_slot(slot, (_TOMBSTONE, 0, 0.0, 0, 0, 0, 0, 0))
+        header[10] -= 1
+        header[11] += 1
+        self._write_header(header)
+
+    def _rebuild_index(self) -> None:
+        """Re-insert live slots to clear tombstones."""
+        live = [fields for fields in map(self._slot, range(self.slot_count)) if fields[0] > _TOMBSTONE]
+        self._map[self.slot_offset:self.data_offset] = bytes(self.data_offset - self.slot_offset)
+        for fields in live:
+            self._write_slot(self._probe_free(fields[0]), fields)
+        header = list(self._header())
+        header[10], header[11] = len(live), 0
+        self._write_header(header)
+
+    def _allocate(self, size: int) -> Tuple[int, int]:
+        """Reserve size bytes in the active segment, moving to a new one if full."""
+        header = list(self._header())
+        # Writes count as accesses for LRU
+        header[8] += 1
+        self._write_header(header)
+        active = header[9]
+        used, _ = self._segment(active)
+        if used + size <= self.segment_size:
+            self._write_segment(active, used + size, header[8])
+            return active, used
+
+        empty = [s for s in range(self.segment_count) if s != active and self._segment(s)[0] == 0]
+        segment = empty[0] if empty else self._lru_segment(exclude=active)
+        if not empty:
+            self._evict_segment(segment)
+        header = list(self._header())
+        header[9] = segment
+        self._write_header(header)
+        self._write_segment(segment, size, header[8])
+        return segment, 0
+
+    def _lru_segment(self, exclude: Optional[int] = None) -> int:
+        """The least recently used non-empty segment, preferring any but exclude."""
+        candidates = [
+            (s == exclude, last_access, s)
+            for s, (used, last_access) in enumerate(map(self._segment, range(self.segment_count)))
+            if used
+        ]
+        return min(candidates)[2]
+
+    def _evict_segment(self, segment: int) -> None:
+        """Drop every entry stored in a segment and mark it free."""
+        used, _ = self._segment(segment)
+        base = self.data_offset + segment * self.segment_size
+        offset = 0
+        while offset < used:
+            key_hash, key_length, value_length = _ENTRY.unpack_from(self._map, base + offset)
+            # Replaced or invalidated-and-rewritten entries are no longer indexed
+            slot = self._slot_of(key_hash, segment, offset)
+            if slot is not None:
+                self._delete_slot(slot)
+            offset += _ENTRY.size + key_length + value_length
+        self._write_segment(segment, 0, 0)
+        header = list(self._header())
+        header[7] += 1
+        self._write_header(header)
+
+
+shared_cache = SharedCache()
@@ -1,19 +1,62 @@
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 import re
+import time
 import json
 
+from config.config import settings
+from models.ci_customer import CiCustomer, LOB_COLUMNS
+from models.ci_customer_type import CiCustomerType
+from models.gl_branch import GlBranch
+from models.it_institute import ItInstitute
+from schemas.aggregation_schemas import AggregationSpec
+from services.index_advisor_service import index_advisor_service
+from services.language_service import localize_sql, localized_column
+from services.query_memory_service import (
+    MB,
+    QueryMemory,
+    QueryMemoryExceeded,
+    ResultBuffer,
+    estimate_size,
+)
+
 logger = logging.getLogger(__name__)
 
+# Tables whose wildcard selects (`alias.*` and single-table `SELECT *`) are
+# expanded into explicit column lists: always for tables with LOB columns,
+# which are never selected through the executor, and for multilingual
+# tables when the caller names a language, so each _ln1/_ln2/_ln3 field is
+# fetched as one column in that language
+WILDCARD_TABLE_COLUMNS = {
+    model.__tablename__: [
+        column.name for column in model.__table__.columns if column.name not in LOB_COLUMNS
+    ]
+    for model in (CiCustomer, GlBranch, ItInstitute, CiCustomerType)
+}
+_LOB_TABLES = {CiCustomer.__tablename__}
+
+# Words that can follow a table name without being its alias
+_NON_ALIAS_KEYWORDS = {
+    "WHERE", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "FULL", "NATURAL", "JOIN",
+    "STRAIGHT_JOIN", "ON", "USING", "GROUP", "ORDER", "HAVING", "LIMIT", "UNION",
+    "WINDOW", "FOR", "LOCK",
+}
+
 
 class SqlExecutorService:
     """Service class for executing SQL queries safely"""
 
     async def execute_query(
-        self, session: AsyncSession, query: str, limit: Optional[int] = None
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: Optional[int] = None,
+        aggregate: Optional[AggregationSpec] = None,
+        overflow: Optional[str] = None,
+        language: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Execute a SQL query and return results
@@ -22,10 +65,21 @@ class SqlExecutorService:
             session: Database session
             query (str): The SQL query to execute
             limit (int, optional): Maximum number of rows to return
+            aggregate (AggregationSpec, optional): Group/subtotal/pivot the
+                rows server-side before returning them
+            overflow (str, optional): "spill" or "fail" when the result
+                exceeds its memory budget (default QUERY_MEMORY_OVERFLOW)
+            language (int, optional): Column slot of the caller's language;
+                {ln:field} placeholders resolve to it (default _ln1) and
+                wildcard selects of multilingual tables return one column
+                per field
 
         Returns:
-            Dict[str, Any]: Dictionary containing query results and metadata
+            Dict[str, Any]: Dictionary containing query results and metadata.
+                If the rows were spilled to disk, "spill" holds the
+                ResultBuffer to stream them from (see iter_spilled_response)
         """
+        buffer = None
         try:
             # Strip comments from the query
             query = self._strip_sql_comments(query)
@@ -33,6 +87,11 @@ class SqlExecutorService:
             # Add backticks to aliases with spaces
             query = self._add_backticks_to_aliases(query)
 
+            # Resolve multilingual fields, and keep photo/signature LOBs out of
+            # wildcard selects
+            query = localize_sql(query, language or 1)
+            query = self._expand_wildcards(query, language)
+
             # Validate query (basic security check)
             if not self._is_safe_query(query):
                 return {
@@ -50,60 +109,155 @@ class SqlExecutorService:
                 if "LIMIT" not in query_upper:
                     query = f"{query} LIMIT {limit}"
 
-            # Execute query
-            result = await session.execute(text(query))
-
-            # Fetch results
-            rows = result.fetchall()
-            columns = list(result.keys()) if rows else []
-
-            # Convert rows to list of dictionaries
-            data = []
-            for row in rows:
-                row_dict = {}
-                for i, column in enumerate(columns):
-                    value = row[i]
-                    # Handle datetime and other special types
-                    if hasattr(value, "isoformat"):
-                        value = value.isoformat()
-                    elif value is None:
-                        value = None
-                    else:
-                        # Convert to string if it's not a basic type
-                        try:
-                            json.dumps(value)
-                        except (TypeError, ValueError):
-                            value = str(value)
-                    row_dict[column] = value
-                data.append(row_dict)
-
-            return {
+            # Stream the result in batches, charging each against the
+            # query's memory budget as it is fetched and converted
+            started = time.perf_counter()
+            buffer = ResultBuffer(QueryMemory(), overflow)
+            result = await session.stream(text(query))
+            try:
+                result_columns = list(result.keys())
+                columns = []
+                omitted_columns = set()
+                raw_rows = []
+                async for partition in result.partitions(settings.QUERY_FETCH_BATCH_SIZE):
+                    if aggregate is not None:
+                        # Aggregation needs every input row; it cannot spill
+                        if not buffer.memory.charge(estimate_size(partition)):
+                            raise QueryMemoryExceeded(
+                                f"Query result exceeds the memory limit of "
+                                f"{buffer.memory.limit_bytes // MB} MB before aggregation; "
+                                f"narrow the query"
+                            )
+                        raw_rows.extend(partition)
+                        continue
+
+                    # Convert rows to list of dictionaries
+                    data, columns, batch_omitted = self.convert_rows(result_columns, partition)
+                    if set(batch_omitted) - omitted_columns:
+                        omitted_columns.update(batch_omitted)
+                        buffer.drop_columns(batch_omitted)
+                    buffer.extend(data)
+            finally:
+                await result.close()
+
+            if aggregate is not None:
+                # NumPy is imported on first use, not at startup
+                from services.aggregation_service import aggregation_service
+
+                columns, rows = aggregation_service.aggregate(result_columns, raw_rows, aggregate)
+                del raw_rows
+                data, columns, omitted_columns = self.convert_rows(columns, rows)
+                buffer.memory.release()
+                buffer.extend(data)
+
+            duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            index_advisor_service.record(query, duration_ms)
+            if duration_ms >= settings.LOG_SLOW_QUERY_MS:
+                logger.warning(
+                    "Slow query",
+                    extra={"slow": True, "duration_ms": duration_ms, "row_count": buffer.row_count, "query": query},
+                )
+
+            columns = [column for column in columns if column not in omitted_columns]
+            response = {
                 "success": True,
-                "data": data,
-                "rows": data,
+                "data": buffer.rows,
+                "rows": buffer.rows,
                 "columns": columns,
-                "row_count": len(data),
+                "row_count": buffer.row_count,
                 "query": query,
+                "omitted_columns": sorted(omitted_columns) or None,
+                "memory": buffer.metadata(),
+                "duration_ms": duration_ms,
             }
+            if buffer.spilled:
+                # The caller streams the rows back from the spill file and
+                # releases the buffer when done
+                response["spill"], buffer = buffer, None
+            return response
 
         except SQLAlchemyError as e:
             logger.error(f"Database error executing query: {str(e)}")
-            error_msg = str(e)
-
-            # Provide more user-friendly error messages
-            if "doesn't exist" in error_msg.lower():
-                error_msg = "One or more tables in the query don't exist."
-            elif "not found" in error_msg.lower():
-                error_msg = "One or more columns in the query don't exist."
-            elif "syntax" in error_msg.lower():
-                error_msg = "SQL syntax error in the query."
-            else:
-                error_msg = f"Database error: {error_msg}"
+            error_msg = self.friendly_error(e)
 
             return {"success": False, "error": error_msg, "data": []}
+        except QueryMemoryExceeded as e:
+            logger.warning(f"Query stopped by memory budget: {str(e)}")
+            return {"success": False, "error": str(e), "data": [], "memory": buffer.metadata()}
+        except ValueError as e:
+            return {"success": False, "error": str(e), "data": []}
         except Exception as e:
             logger.error(f"Unexpected error executing query: {str(e)}")
             return {"success": False, "error": f"Unexpected error: {str(e)}", "data": []}
+        finally:
+            if buffer is not None:
+                buffer.close()
+
+    def convert_rows(
+        self, columns: List[str], rows: List[Any]
+    ) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+        """
+        Convert result rows into JSON-serializable dictionaries
+
+        Args:
+            columns (List[str]): Result column names
+            rows (List[Any]): Result rows (sequences in column order)
+
+        Returns:
+            Tuple of (row dictionaries, serialized columns, omitted binary columns)
+        """
+        data = []
+        omitted_columns = set()
+        for row in rows:
+            row_dict = {}
+            for i, column in enumerate(columns):
+                value = row[i]
+                # Binary values (LOBs) are never serialized into JSON results
+                if isinstance(value, (bytes, bytearray, memoryview)):
+                    omitted_columns.add(column)
+                    continue
+                # Handle datetime and other special types
+                if hasattr(value, "isoformat"):
+                    value = value.isoformat()
+                elif value is None:
+                    value = None
+                else:
+                    # Convert to string if it's not a basic type
+                    try:
+                        json.dumps(value)
+                    except (TypeError, ValueError):
+                        value = str(value)
+                row_dict[column] = value
+            data.append(row_dict)
+
+        if omitted_columns:
+            for row_dict in data:
+                for column in omitted_columns:
+                    row_dict.pop(column, None)
+            columns = [column for column in columns if column not in omitted_columns]
+
+        return data, columns, sorted(omitted_columns)
+
+    def friendly_error(self, error: SQLAlchemyError) -> str:
+        """
+        Turn a database error into a user-friendly message
+
+        Args:
+            error (SQLAlchemyError): The database error
+
+        Returns:
+            str: Error message suitable for API responses
+        """
+        error_msg = str(error)
+
+        # Provide more user-friendly error messages
+        if "doesn't exist" in error_msg.lower():
+            return "One or more tables in the query don't exist."
+        elif "not found" in error_msg.lower():
+            return "One or more columns in the query don't exist."
+        elif "syntax" in error_msg.lower():
+            return "SQL syntax error in the query."
+        return f"Database error: {error_msg}"
 
     def _strip_sql_comments(self, query: str) -> str:
         """Remove SQL comments from query"""
@@ -152,6 +306,66 @@ class SqlExecutorService:
         result = re.sub(pattern, replace_alias, query, flags=re.IGNORECASE)
         return result
 
+    def _wildcard_columns(self, columns: List[str], qualifier: str, language: Optional[int]) -> str:
+        """
+        Column list replacing a wildcard; with a language, each multilingual
+        field is one column named after the field (full_name_ln1..3 -> full_name)
+        """
+        prefix = f"{qualifier}." if qualifier else ""
+        items = []
+        for column in columns:
+            field = column[:-4]
+            multilingual = (
+                language is not None
+                and column[-4:] in ("_ln1", "_ln2", "_ln3")
+                and all(f"{field}_ln{slot}" in columns for slot in (1, 2, 3))
+            )
+            if not multilingual:
+                items.append(f"{prefix}{column}")
+            elif column.endswith("_ln1"):
+                items.append(f"{localized_column(prefix + field, language)} AS {field}")
+        return ", ".join(items)
+
+    def _expand_wildcards(self, query: str, language: Optional[int] = None) -> str:
+        """
+        Expand wildcard selects into explicit column lists: over tables with
+        LOB columns (leaving the LOBs out), and with a language, over
+        multilingual tables (one column per field in that language)
+
+        Args:
+            query (str): SQL query to process
+            language (int, optional): Column slot of the caller's language
+
+        Returns:
+            str: Query with `alias.*` (and single-table `SELECT *`) expanded
+        """
+        for table, columns in WILDCARD_TABLE_COLUMNS.items():
+            if language is None and table not in _LOB_TABLES:
+                continue
+            aliases = {table}
+            for match in re.finditer(
+                rf"\b{table}\b`?(?:\s+AS)?\s+`?(\w+)`?", query, flags=re.IGNORECASE
+            ):
+                if match.group(1).upper() not in _NON_ALIAS_KEYWORDS:
+                    aliases.add(match.group(1))
+
+            for alias in aliases:
+                expanded = self._wildcard_columns(columns, alias, language)
+                query = re.sub(
+                    rf"(?<![\w.`])`?{re.escape(alias)}`?\.\*", lambda m: expanded, query
+                )
+
+            # Bare `SELECT *` is only expanded when the table is the sole FROM item
+            query = re.sub(
+                rf"^(\s*SELECT\s+(?:DISTINCT\s+)?)\*(?=\s+FROM\s+`?{table}`?"
+                rf"(?:\s+(?:AS\s+)?\w+)?\s*(?:\bWHERE\b|\bGROUP\b|\bORDER\b|\bLIMIT\b|;|$))",
+                lambda m: m.group(1) + self._wildcard_columns(columns, "", language),
+                query,
+                flags=re.IGNORECASE,
+            )
+
+        return query
+
     def _is_safe_query(self, query: str) -> bool:
         """
         Basic security check for SQL queries
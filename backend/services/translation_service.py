@@ -1,9 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from typing import Dict, Any
+import asyncio
 import json
 
 from models.it_language_nav_items import ItLanguageNavItems
+from schemas.translation_schemas import TranslationResponse
+from services.shared_cache_service import shared_cache
 
 
 class TranslationService:
@@ -31,3 +34,20 @@ class TranslationService:
             return translations
         except json.JSONDecodeError:
             return {}
+    
+    async def get_nav_translations_json(self) -> bytes:
+        """
+        Get navigation item translations as a serialized response body,
+        from the host-wide shared cache when present.
+        
+        Returns:
+            TranslationResponse encoded as JSON
+        """
+        cached = shared_cache.get("translations", "nav-items")
+        if cached is not None:
+            return cached
+        
+        translations = await self.get_nav_translations()
+        payload = TranslationResponse(translations=translations).model_dump_json().encode("utf-8")
+        await asyncio.to_thread(shared_cache.put, "translations", "nav-items", payload)
+        return payload
@@ -2,11 +2,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from typing import List, Optional
+import asyncio
 
 from models.it_user_nav_rights import ItUserNavRights
 from models.it_nav_menu import ItNavMenu
 from models.it_user_master import ItUserMaster
-from schemas.nav_schemas import UserNavRightResponse
+from schemas.nav_schemas import UserNavRightResponse, UserNavRightsListResponse
+from services.shared_cache_service import shared_cache
 
 
 class UserNavService:
@@ -85,4 +87,33 @@ class UserNavService:
         # Format response
         formatted_nav_rights = await self.format_nav_rights_response(nav_rights)
         
-        return formatted_nav_rights, len(formatted_nav_rights)
\ No newline at end of file
+        return formatted_nav_rights, len(formatted_nav_rights)
+    
+    async def get_user_navigation_menu_json(self, user_id: int) -> bytes:
+        """
+        Get a user's navigation menu as a serialized response body.
+        
+        Served from the host-wide shared cache when another worker (or
+        startup warm-up) already built it; otherwise built and cached.
+        
+        Args:
+            user_id: The ID of the user
+            
+        Returns:
+            UserNavRightsListResponse encoded as JSON
+            
+        Raises:
+            ValueError: If user not found
+        """
+        cached = shared_cache.get("nav_menu", str(user_id))
+        if cached is not None:
+            return cached
+        
+        nav_rights, total_count = await self.get_user_navigation_menu(user_id)
+        payload = UserNavRightsListResponse(
+            user_id=user_id,
+            nav_rights=nav_rights,
+            total_count=total_count
+        ).model_dump_json().encode("utf-8")
+        await asyncio.to_thread(shared_cache.put, "nav_menu", str(user_id), payload)
+        return payload
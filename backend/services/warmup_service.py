@@ -0,0 +1,216 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlmodel import select
+
+from config.config import settings
+from config.database import AsyncSessionLocal, engine
+from models.it_user_nav_rights import ItUserNavRights
+from services.reference_data_service import reference_data_service
+from services.shared_cache_service import shared_cache
+from services.translation_service import TranslationService
+from services.user_nav_service import UserNavService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupPhase:
+    """One independent warm-up step and its outcome"""
+
+    name: str
+    run: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    # The application is not ready until required phases succeed
+    required: bool = False
+    status: str = "pending"
+    duration_ms: Optional[float] = None
+    detail: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class WarmupService:
+    """
+    Service class for the startup warm-up that runs behind /ready.
+
+    Startup itself only starts background tasks; this service then opens
+    pool connections, loads reference data, primes the shared nav-menu and
+    translation cache and compiles the registered report SQL, all phases
+    concurrently. The application reports ready once the required phases
+    (the database pool) succeed; those are retried until they do, while
+    failures of the other phases are only logged since every cache they
+    prime is also filled on first use.
+    """
+
+    def __init__(self):
+        self.phases: List[WarmupPhase] = [
+            WarmupPhase("database_pool", self._warm_pool, required=True),
+            WarmupPhase("reference_data", self._warm_reference_data),
+            WarmupPhase("translations", self._warm_translations),
+            WarmupPhase("nav_menus", self._warm_nav_menus),
+            WarmupPhase("report_sql", self._compile_report_sql),
+        ]
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.ready_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the warm-up in the background (or report ready at once when disabled)."""
+        self.started_at = time.perf_counter()
+        if not settings.STARTUP_WARMUP:
+            self._mark_ready()
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel a warm-up that is still running."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness and per-phase timings, as reported by /ready."""
+        return {
+            "status": "ready" if self.ready else "starting",
+            "ready_ms": self.ready_ms,
+            "phases": {
+                phase.name: {
+                    "status": phase.status,
+                    "required": phase.required,
+                    "duration_ms": phase.duration_ms,
+                    "detail": phase.detail,
+                    "error": phase.error,
+                }
+                for phase in self.phases
+            },
+        }
+
+    async def _run(self) -> None:
+        pending = self.phases
+        while True:
+            await asyncio.gather(*(self._run_phase(phase) for phase in pending))
+            pending = [phase for phase in self.phases if phase.required and phase.status == "failed"]
+            if not pending:
+                break
+            await asyncio.sleep(settings.STARTUP_WARMUP_RETRY_SECONDS)
+        self._mark_ready()
+
+    async def _run_phase(self, phase: WarmupPhase) -> None:
+        phase.status, phase.error = "running", None
+        started = time.perf_counter()
+        try:
+            phase.detail = await phase.run()
+            phase.status = "ok"
+        except Exception as e:
+            phase.status, phase.error = "failed", str(e)
+            logger.warning("Warm-up phase '%s' failed: %s", phase.name, e)
+        phase.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    def _mark_ready(self) -> None:
+        self.ready = True
+        self.ready_ms = round((time.perf_counter() - self.started_at) * 1000, 1)
+        logger.info(
+            "Application ready after %.0f ms",
+            self.ready_ms,
+            extra={"warmup": {phase.name: phase.duration_ms for phase in self.phases}},
+        )
+
+    # Phases --------------------------------------------------------------
+
+    async def _warm_pool(self) -> Dict[str, Any]:
+        """Open (and ping) pool connections concurrently so first requests skip the connect."""
+        count = max(settings.STARTUP_WARM_CONNECTIONS, 1)
+        pool_size = getattr(engine.pool, "size", None)
+        if callable(pool_size):
+            # Beyond pool_size the connections would only be overflow, closed on return
+            count = min(count, pool_size())
+        # Hold all connections open at once so the pool really grows to count
+        connections = await asyncio.gather(*(engine.connect() for _ in range(count)))
+        try:
+            await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in connections))
+        finally:
+            await asyncio.gather(*(conn.close() for conn in connections))
+        return {"connections": count}
+
+    async def _warm_reference_data(self) -> Dict[str, Any]:
+        await reference_data_service.load_all()
+        loaded = sum(reference_data_service.get_snapshot(name) is not None for name in reference_data_service.tables)
+        if not loaded and reference_data_service.tables:
+            raise RuntimeError("no reference table could be loaded")
+        return {"tables": loaded}
+
+    async def _warm_translations(self) -> Dict[str, Any]:
+        async with AsyncSessionLocal() as session:
+            payload = await TranslationService(session).get_nav_translations_json()
+        return {"bytes": len(payload)}
+
+    async def _warm_nav_menus(self) -> Dict[str, Any]:
+        """Build and share the nav menus of the first STARTUP_WARM_NAV_USERS users with rights."""
+        if not shared_cache.enabled or settings.STARTUP_WARM_NAV_USERS <= 0:
+            return {"users": 0}
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(ItUserNavRights.user_id)
+                .where(ItUserNavRights.is_active == True)
+                .distinct()
+                .order_by(ItUserNavRights.user_id)
+                .limit(settings.STARTUP_WARM_NAV_USERS)
+            )
+            user_ids = list(result.scalars().all())
+
+        # Spread the users over as many sessions as the pool was warmed with
+        workers = max(min(settings.STARTUP_WARM_CONNECTIONS, len(user_ids)), 1)
+
+        async def prime(chunk: List[int]) -> int:
+            primed = 0
+            async with AsyncSessionLocal() as session:
+                service = UserNavService(session)
+                for user_id in chunk:
+                    try:
+                        await service.get_user_navigation_menu_json(user_id)
+                        primed += 1
+                    except ValueError:
+                        # Rights left behind for a deleted user
+                        pass
+            return primed
+
+        primed = await asyncio.gather(*(prime(user_ids[i::workers]) for i in range(workers)))
+        return {"users": sum(primed)}
+
+    async def _compile_report_sql(self) -> Dict[str, Any]:
+        """
+        Render and compile every registered report's SQL for the database
+        dialect, so template mistakes surface at startup and the first
+        report request does not pay for loading the compiler.
+        """
+        # Imported here, after startup, rather than with the application;
+        # this also registers the materialized views' reports
+        from services.materialization_service import MATERIALIZED_VIEWS
+        from services.report_registry import REPORTS
+
+        statements = []
+        for definition in REPORTS.values():
+            statements.append(definition.render_sql())
+            if definition.supports_delta:
+                statements.append(definition.render_sql(delta=True))
+        for view in MATERIALIZED_VIEWS.values():
+            statements.extend((view.serving_sql(), view.populate_sql()))
+
+        for sql in statements:
+            text(sql).compile(dialect=engine.dialect)
+            # Compiling is CPU-bound; let requests in between statements
+            await asyncio.sleep(0)
+        return {"statements": len(statements)}
+
+
+warmup_service = WarmupService()
@@ -0,0 +1,51 @@
+import os
+import sys
+
+# Settings and the engine are built at import time; point them at SQLite and
+# keep background services off before any application module is imported.
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("STARTUP_RUN_DDL", "false")
+os.environ.setdefault("CUSTOMER_SEARCH_ENABLED", "false")
+os.environ.setdefault("MATERIALIZED_VIEWS_ENABLED", "false")
+os.environ.setdefault("SHARED_CACHE_ENABLED", "false")
+os.environ.setdefault("REPORT_PREGENERATE_ENABLED", "false")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+import config.database as database
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def sqlite_engine(tmp_path):
+    """
+    File-backed SQLite engine bound to AsyncSessionLocal for the test.
+
+    Tests create the tables they need through the create_tables fixture.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    previous = database.AsyncSessionLocal.kw.get("bind")
+    database.AsyncSessionLocal.configure(bind=engine)
+    try:
+        yield engine
+    finally:
+        database.AsyncSessionLocal.configure(bind=previous)
+        await engine.dispose()
+
+
+@pytest.fixture
+def create_tables(sqlite_engine):
+    """Create the named model tables on the test engine."""
+    async def create(*names: str) -> None:
+        tables = [SQLModel.metadata.tables[name] for name in names]
+        async with sqlite_engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: SQLModel.metadata.create_all(sync_conn, tables=tables))
+    return create
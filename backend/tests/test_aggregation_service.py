@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+import numpy as np
+
+from schemas.aggregation_schemas import AggregationSpec, MeasureSpec
+from services.aggregation_service import AggregationService, _group_codes
+
+
+def test_group_codes_do_not_overflow_with_high_cardinality_keys():
+    rng = np.random.default_rng(7)
+    length, distinct = 20000, 5000
+    key_codes = [rng.permutation(np.arange(length) % distinct) for _ in range(6)]
+    # Duplicate some rows so groups hold more than one row
+    for codes in key_codes:
+        codes[length // 2:] = codes[:length // 2]
+
+    group_ids, uniques = _group_codes(key_codes, [distinct] * 6, length)
+
+    expected = np.unique(np.stack(key_codes, axis=1), axis=0)
+    assert len(uniques) == len(expected)
+    np.testing.assert_array_equal(uniques, expected)
+    # Every row maps back to its own key tuple
+    np.testing.assert_array_equal(uniques[group_ids], np.stack(key_codes, axis=1))
+
+
+def test_group_codes_small_key_space_matches_tuple_grouping():
+    key_codes = [np.array([1, 0, 1, 1]), np.array([2, 0, 2, 0])]
+
+    group_ids, uniques = _group_codes(key_codes, [2, 3], 4)
+
+    np.testing.assert_array_equal(uniques, [[0, 0], [1, 0], [1, 2]])
+    np.testing.assert_array_equal(group_ids, [2, 0, 2, 1])
+
+
+def test_aggregate_with_high_cardinality_group_by():
+    columns = [f"k{i}" for i in range(6)] + ["amount"]
+    multipliers = (1, 3, 7, 9, 11, 13)
+    rows = [tuple(f"v{(n * m + n // 5000) % 5000}" for m in multipliers) + (n,) for n in range(10000)]
+    rows += [row[:6] + (0,) for row in rows[:10]]
+    assert all(len({row[i] for row in rows}) == 5000 for i in range(6))
+    spec = AggregationSpec(
+        group_by=columns[:6],
+        measures=[MeasureSpec(column="amount", function="sum"), MeasureSpec(column="*", function="count")],
+        rollup=False,
+    )
+
+    output_columns, output = AggregationService().aggregate(columns, rows, spec)
+
+    expected = {}
+    for row in rows:
+        total, count = expected.get(row[:6], (0, 0))
+        expected[row[:6]] = (total + row[6], count + 1)
+    amount, count = output_columns.index("Sum of amount"), output_columns.index("Count")
+    assert {row[:6]: (row[amount], row[count]) for row in output} == expected
+    assert len(output) == len(expected)
+
+
+def test_sums_that_would_overflow_int64_stay_exact():
+    big = Decimal("40000000000000000.25")
+    rows = [("a", big, 2 ** 62), ("a", big, 2 ** 62), ("a", big, 2 ** 62), ("b", Decimal("1.5"), 1)]
+    spec = AggregationSpec(
+        group_by=["k"],
+        measures=[
+            MeasureSpec(column="amount", function="sum"),
+            MeasureSpec(column="amount", function="max"),
+            MeasureSpec(column="units", function="sum"),
+        ],
+        rollup=False,
+    )
+
+    _, output = AggregationService().aggregate(["k", "amount", "units"], rows, spec)
+
+    assert {row[0]: row[1:4] for row in output} == {
+        "a": (Decimal("120000000000000000.75"), big, 3 * 2 ** 62),
+        "b": (Decimal("1.5"), Decimal("1.5"), 1),
+    }
@@ -0,0 +1,89 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.baseline import compare
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SUMMARY_FIELDS = {
+    "requests", "errors", "throughput_rps", "p50_ms", "p90_ms", "p99_ms",
+    "bytes_sent", "bytes_per_request", "peak_rss_mb",
+}
+
+
+def run_benchmark(module, *args):
+    """Run a benchmark in a fresh interpreter; returns (exit code, report, lines after it)."""
+    completed = subprocess.run(
+        [sys.executable, "-m", module, *args], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=300
+    )
+    assert completed.stdout, completed.stderr
+    report, end = json.JSONDecoder().raw_decode(completed.stdout)
+    return completed.returncode, report, completed.stdout[end:].split("\n")
+
+
+@pytest.fixture
+def api_args(tmp_path):
+    return (
+        "--customers", "200", "--users", "5", "--requests", "5", "--concurrency", "2",
+        "--warmup-requests", "1", "--data-dir", str(tmp_path / "data"), "--baseline-dir", str(tmp_path),
+    )
+
+
+def test_api_benchmark_smoke(api_args, tmp_path):
+    code, report, _ = run_benchmark("benchmarks.api_benchmark", *api_args, "--save-baseline")
+
+    assert code == 0
+    assert report["config"]["customers"] == 200
+    assert set(report["results"]) == {"run_query", "nav_menu", "translations", "languages"}
+    for name, summary in report["results"].items():
+        assert set(summary) == SUMMARY_FIELDS
+        assert summary["requests"] == 5 and summary["errors"] == 0, name
+    baseline = json.loads((tmp_path / "api.json").read_text())
+    assert baseline["config"] == report["config"]
+    assert "run_query.p50_ms" in baseline["metrics"]
+
+    # Against an impossibly good baseline every compared metric regresses
+    baseline["metrics"] = {
+        metric: value * (1000 if metric.endswith("throughput_rps") else 0.001)
+        for metric, value in baseline["metrics"].items()
+    }
+    (tmp_path / "api.json").write_text(json.dumps(baseline))
+    code, _, lines = run_benchmark("benchmarks.api_benchmark", *api_args, "--scenarios", "languages")
+
+    # A different scenario selection still matches the recorded configuration
+    assert code == 1
+    regressions = [line for line in lines if line.startswith("REGRESSION languages.")]
+    assert {line.split(":")[0].split(".", 1)[1] for line in regressions} == {
+        "throughput_rps", "p50_ms", "p99_ms", "bytes_per_request", "peak_rss_mb",
+    }
+
+
+def test_startup_benchmark_smoke(tmp_path):
+    args = ("--runs", "1", "--timeout", "30", "--baseline-dir", str(tmp_path))
+    code, report, _ = run_benchmark("benchmarks.startup_benchmark", *args, "--save-baseline")
+
+    assert code == 0
+    assert report["runs"] == 1
+    assert set(report["metrics"]) == {"import_total_ms", "startup_import_ms", "startup_serving_ms", "startup_ready_ms"}
+    assert report["metrics"]["startup_ready_ms"] is not None
+    assert "database_pool" in report["phases_ms"]
+    assert json.loads((tmp_path / "startup.json").read_text()) == report["metrics"]
+
+    (tmp_path / "startup.json").write_text(json.dumps({metric: 0.001 for metric in report["metrics"]}))
+    code, _, lines = run_benchmark("benchmarks.startup_benchmark", *args, "--imports-only")
+    assert code == 1
+    assert any(line.startswith("REGRESSION import_total_ms") for line in lines)
+
+
+def test_compare_flags_only_regressions_beyond_the_tolerance():
+    baseline = {"p50_ms": 10.0, "throughput_rps": 100.0, "peak_rss_mb": 50.0, "new_ms": None}
+    current = {"p50_ms": 11.5, "throughput_rps": 70.0, "peak_rss_mb": 40.0, "new_ms": 5.0}
+
+    regressions = compare(current, baseline, 0.2, higher_is_better=("throughput_rps",))
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("throughput_rps: 100.0 -> 70.0")
@@ -0,0 +1,70 @@
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from middleware.compression_middleware import CompressionMiddleware, negotiate_encoding
+from routes.reference_data_routes import not_modified
+from services.reference_data_service import ReferenceSnapshot
+
+BODY = b"x" * 4096
+SNAPSHOT = ReferenceSnapshot(name="branches", items=(), version=3, etag='"branches-3-abc"', probe=())
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+
+@app.get("/large")
+def large():
+    return Response(BODY, media_type="text/plain", headers={"ETag": '"v1"'})
+
+
+@app.get("/small")
+def small():
+    return Response(b"tiny", media_type="text/plain", headers={"ETag": '"v1"'})
+
+
+@app.get("/weak")
+def weak():
+    return Response(BODY, media_type="text/plain", headers={"ETag": 'W/"v1"'})
+
+
+@app.get("/snapshot")
+def snapshot(request: Request, response: Response):
+    if not_modified(request, response, SNAPSHOT):
+        return Response(status_code=304, headers=dict(response.headers))
+    return Response(BODY, media_type="text/plain", headers=dict(response.headers))
+
+
+client = TestClient(app)
+
+
+def test_compressed_response_gets_a_weak_etag():
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert response.content == BODY
+
+
+def test_uncompressed_responses_keep_a_strong_etag():
+    assert client.get("/small", headers={"Accept-Encoding": "gzip"}).headers["etag"] == '"v1"'
+    assert client.get("/large", headers={"Accept-Encoding": "identity"}).headers["etag"] == '"v1"'
+
+
+def test_weak_etag_is_not_weakened_twice():
+    assert client.get("/weak", headers={"Accept-Encoding": "gzip"}).headers["etag"] == 'W/"v1"'
+
+
+def test_weakened_etag_still_revalidates():
+    etag = client.get("/snapshot", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    assert etag == 'W/"branches-3-abc"'
+
+    response = client.get("/snapshot", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+def test_negotiate_encoding_prefers_client_q_then_server_order():
+    preference = ["zstd", "br", "gzip"]
+    assert negotiate_encoding("gzip, br", preference) == "br"
+    assert negotiate_encoding("gzip;q=1, br;q=0.5", preference) == "gzip"
+    assert negotiate_encoding("*;q=0, gzip;q=0", preference) is None
@@ -0,0 +1,73 @@
+import io
+import os
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import text
+
+import config.database as database
+from config.database import get_session
+from models.ci_customer import CiCustomer  # noqa: F401  registers the tables
+from models.ci_customer_type import CiCustomerType  # noqa: F401
+from models.gl_branch import GlBranch  # noqa: F401
+from routes import customer_routes
+from services.customer_blob_service import customer_blob_service
+
+pytestmark = pytest.mark.anyio
+
+
+def png(width: int, height: int) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), "navy").save(output, format="PNG")
+    return output.getvalue()
+
+
+@pytest.fixture
+async def client(sqlite_engine, create_tables, tmp_path, monkeypatch):
+    await create_tables("gl_branch", "ci_customer_type", "ci_customer")
+    async with sqlite_engine.begin() as conn:
+        for customer_id, photo in ((1, png(400, 300)), (2, b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)):
+            await conn.execute(
+                text("INSERT INTO ci_customer (id, photo, m_at) VALUES (:id, :photo, :at)"),
+                {"id": customer_id, "photo": photo, "at": datetime(2024, 1, 1)},
+            )
+
+    monkeypatch.setattr(customer_blob_service, "cache_dir", str(tmp_path / "thumbnails"))
+    monkeypatch.setattr(customer_blob_service, "_cache_bytes", None)
+
+    async def session_override():
+        async with database.AsyncSessionLocal() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(customer_routes.router)
+    app.dependency_overrides[get_session] = session_override
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+async def test_thumbnail_is_cached_under_its_etag(client, tmp_path):
+    response = client.get("/customers/1/photo", params={"size": 64})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+    assert response.headers["etag"].endswith('-64"')
+    with Image.open(io.BytesIO(response.content)) as thumbnail:
+        assert max(thumbnail.size) == 64
+    assert len(os.listdir(tmp_path / "thumbnails")) == 1
+
+
+async def test_undecodable_blob_thumbnail_is_415_and_not_cached(client, tmp_path):
+    response = client.get("/customers/2/photo", params={"size": 64})
+
+    assert response.status_code == 415
+    assert "etag" not in response.headers
+    assert not (tmp_path / "thumbnails").exists()
+
+    # The original bytes are still served as stored
+    original = client.get("/customers/2/photo")
+    assert original.status_code == 200
+    assert original.headers["content-type"] == "image/png"
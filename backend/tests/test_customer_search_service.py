@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from models.ci_customer import CiCustomer  # noqa: F401  registers the tables
+from models.ci_customer_type import CiCustomerType  # noqa: F401
+from models.gl_branch import GlBranch  # noqa: F401
+from services.customer_search_service import CustomerSearchService
+
+pytestmark = pytest.mark.anyio
+
+CREATED_AT = datetime(2020, 1, 1)
+
+
+@pytest.fixture
+async def customers(sqlite_engine, create_tables):
+    await create_tables("gl_branch", "ci_customer_type", "ci_customer")
+    async with sqlite_engine.begin() as conn:
+        for customer_id, name in ((1, "Nimal Perera"), (2, "Kamal Silva"), (3, "Sunil Perera")):
+            await conn.execute(
+                text(
+                    "INSERT INTO ci_customer (id, customer_number, full_name_ln1, status, c_at, m_at) "
+                    "VALUES (:id, :number, :name, 1, :at, :at)"
+                ),
+                {"id": customer_id, "number": f"C{customer_id:06d}", "name": name, "at": CREATED_AT},
+            )
+    return sqlite_engine
+
+
+def ids(service, query):
+    results, _, _ = service.search(query)
+    return sorted(result.id for result in results)
+
+
+async def test_refresh_reindexes_only_rows_past_the_watermark(customers):
+    service = CustomerSearchService()
+    await service.build()
+    assert ids(service, "perera") == [1, 3]
+
+    service._watermark = datetime(2024, 1, 1)
+    async with customers.begin() as conn:
+        await conn.execute(
+            text("UPDATE ci_customer SET full_name_ln1 = 'Nimal Fernando', m_at = :at WHERE id = 1"),
+            {"at": datetime(2024, 6, 1)},
+        )
+
+    assert await service.refresh() == 1
+    assert ids(service, "perera") == [3]
+    assert ids(service, "fernando") == [1]
+    # The watermark moved to the database clock, past the updated row
+    assert await service.refresh() == 0
+
+
+async def test_rebuild_drops_deleted_customers(customers):
+    service = CustomerSearchService()
+    await service.build()
+    assert not service.rebuild_due()
+
+    async with customers.begin() as conn:
+        await conn.execute(text("DELETE FROM ci_customer WHERE id = 3"))
+
+    await service.refresh()
+    assert ids(service, "perera") == [1, 3]
+
+    await service.build()
+    assert ids(service, "perera") == [1]
+    assert len(service) == 2
+
+
+def test_short_queries_score_a_capped_candidate_set(monkeypatch):
+    service = CustomerSearchService()
+    for customer_id in range(1, 51):
+        service.index_row(CiCustomer(
+            id=customer_id,
+            customer_number=f"C{customer_id:06d}",
+            full_name_ln1=f"Customer {customer_id}",
+            mobile_1=f"07{customer_id:08d}",
+        ))
+    monkeypatch.setattr("config.config.settings.CUSTOMER_SEARCH_MAX_CANDIDATES", 10)
+    scored = []
+    score = service._score
+    monkeypatch.setattr(service, "_score", lambda doc, tokens: scored.append(doc.id) or score(doc, tokens))
+
+    results, total_count, truncated = service.search("07")
+    assert truncated
+    assert len(scored) == total_count == 10
+    assert len(results) == 10
+
+    scored.clear()
+    results, total_count, truncated = service.search("C000042")
+    assert not truncated
+    assert [result.id for result in results] == [42]
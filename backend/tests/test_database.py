@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, text
+
+import config.database as database
+from config.config import settings
+from config.database import SharedSnapshot, read_only_session
+
+pytestmark = pytest.mark.anyio
+
+SNAPSHOT = "START TRANSACTION READ ONLY, WITH CONSISTENT SNAPSHOT"
+
+
+@pytest.fixture
+def statements(sqlite_engine, monkeypatch):
+    """
+    SQL sent on the test engine's connections, with the engine posing as
+    MySQL: transaction control statements are recorded and then replaced
+    by SELECT 1, which SQLite can run.
+    """
+    sent = []
+    sync_engine = sqlite_engine.sync_engine
+    monkeypatch.setattr(sync_engine.dialect, "name", "mysql")
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        sent.append(statement)
+        if statement.startswith(("SET TRANSACTION", "START TRANSACTION")):
+            return "SELECT 1", ()
+        return statement, parameters
+
+    listeners = [
+        ("before_cursor_execute", before_cursor_execute),
+        ("commit", lambda conn: sent.append("COMMIT")),
+        ("rollback", lambda conn: sent.append("ROLLBACK")),
+    ]
+    for name, listener in listeners:
+        event.listen(sync_engine, name, listener, retval=name == "before_cursor_execute")
+    yield sent
+    for name, listener in listeners:
+        event.remove(sync_engine, name, listener)
+
+
+async def select_one(session):
+    return (await session.execute(text("SELECT 1"))).scalar_one()
+
+
+async def test_plain_sessions_start_no_read_only_transaction(statements):
+    async with database.AsyncSessionLocal() as session:
+        await select_one(session)
+
+    assert statements == ["SELECT 1", "ROLLBACK"]
+
+
+async def test_read_only_session_takes_a_consistent_snapshot(statements):
+    async with read_only_session() as session:
+        assert statements == []  # no round trip until the first query
+        await select_one(session)
+        await select_one(session)
+
+    assert statements == [SNAPSHOT, "SELECT 1", "SELECT 1", "ROLLBACK"]
+
+
+@pytest.mark.parametrize("level, expected", [
+    ("read committed", ["SET TRANSACTION ISOLATION LEVEL READ COMMITTED", "START TRANSACTION READ ONLY"]),
+    ("SERIALIZABLE", ["SET TRANSACTION ISOLATION LEVEL SERIALIZABLE", "START TRANSACTION READ ONLY"]),
+    ("REPEATABLE READ", ["SET TRANSACTION ISOLATION LEVEL REPEATABLE READ", SNAPSHOT]),
+])
+async def test_requested_isolation_level_is_set_first(statements, level, expected):
+    async with read_only_session(level) as session:
+        await select_one(session)
+
+    assert statements == expected + ["SELECT 1", "ROLLBACK"]
+
+
+async def test_configured_isolation_level_is_the_default(statements, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_ISOLATION_LEVEL", "READ COMMITTED")
+
+    async with read_only_session() as session:
+        await select_one(session)
+
+    assert statements[:2] == ["SET TRANSACTION ISOLATION LEVEL READ COMMITTED", "START TRANSACTION READ ONLY"]
+
+
+async def test_read_only_transactions_can_be_switched_off(statements, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_READ_ONLY_TRANSACTIONS", False)
+
+    async with read_only_session("SERIALIZABLE") as session:
+        await select_one(session)
+
+    assert statements == ["SELECT 1", "ROLLBACK"]
+
+
+async def test_unknown_isolation_level_is_rejected():
+    with pytest.raises(ValueError, match="Unknown isolation level"):
+        async with read_only_session("snapshot"):
+            pass
+
+
+async def test_other_databases_are_left_alone(sqlite_engine):
+    sent = []
+    listener = lambda conn, cursor, statement, *args: sent.append(statement)  # noqa: E731
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        async with read_only_session() as session:
+            await select_one(session)
+    finally:
+        event.remove(sqlite_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert sent == ["SELECT 1"]
+
+
+async def test_shared_snapshot_runs_concurrent_queries_one_at_a_time(statements):
+    running, overlaps = set(), []
+
+    async def query(session, n):
+        running.add(n)
+        overlaps.append(len(running))
+        await asyncio.sleep(0.01)
+        value = await select_one(session)
+        running.discard(n)
+        return n * value
+
+    async with read_only_session() as session:
+        snapshot = SharedSnapshot(session)
+        results = await asyncio.gather(*(snapshot.run(query, n) for n in range(5)))
+
+    assert results == [0, 1, 2, 3, 4]
+    assert max(overlaps) == 1
+    # One snapshot for all five queries, rolled back at the end
+    assert statements == [SNAPSHOT] + ["SELECT 1"] * 5 + ["ROLLBACK"]
+
+
+async def test_shared_snapshot_is_rolled_back_when_a_query_fails(statements):
+    async def failing(session):
+        await select_one(session)
+        raise RuntimeError("query failed")
+
+    with pytest.raises(RuntimeError):
+        async with read_only_session() as session:
+            snapshot = SharedSnapshot(session)
+            await asyncio.gather(snapshot.run(select_one), snapshot.run(failing))
+
+    assert statements == [SNAPSHOT, "SELECT 1", "SELECT 1", "ROLLBACK"]
+    assert "COMMIT" not in statements
@@ -0,0 +1,102 @@
+import pytest
+
+import config.database as database
+from config.config import settings
+from models.ci_customer import CiCustomer  # noqa: F401  registers the tables
+from models.ci_customer_type import CiCustomerType  # noqa: F401
+from models.gl_branch import GlBranch  # noqa: F401
+from services.index_advisor_service import (
+    Candidate,
+    IndexAdvisorService,
+    covers,
+    fingerprint_id,
+    index_ddl,
+    normalize_query,
+    parse_query,
+)
+
+
+def shapes(sql):
+    return parse_query(normalize_query(sql))
+
+
+def test_normalize_query_strips_literals_and_keeps_like_prefix_shape():
+    first = normalize_query("SELECT id FROM ci_customer WHERE branch_id = 3 AND nic LIKE '%12' AND id IN (1, 2, 3)")
+    second = normalize_query("select id\nfrom ci_customer where branch_id = :branch and nic like '%99' and id in (7);")
+
+    assert first == "select id from ci_customer where branch_id = ? and nic like '%?' and id in (?)"
+    assert first == second
+    assert fingerprint_id(first) == fingerprint_id(second)
+    assert normalize_query("SELECT 1 FROM t WHERE name LIKE 'Per%'").endswith("like '?'")
+
+
+def test_parse_join_where_and_order_columns():
+    [shape] = shapes(
+        "SELECT c.id FROM ci_customer AS c LEFT JOIN gl_branch b ON c.branch_id = b.id "
+        "WHERE c.status = 1 AND c.customer_type_id IN (1, 2) AND c.c_at >= '2024-01-01' "
+        "ORDER BY c.full_name_ln1"
+    )
+
+    assert shape.tables == {"c": "ci_customer", "b": "gl_branch"}
+    assert shape.equality == [("c", "status"), ("c", "customer_type_id")]
+    assert shape.ranges == [("c", "c_at")]
+    assert shape.joins == [("c", "branch_id"), ("b", "id")]
+    assert shape.sort == [("c", "full_name_ln1")]
+
+
+def test_parse_subqueries_unions_and_using():
+    # The derived table has no indexes; only the subquery itself yields a shape
+    [inner] = shapes("SELECT x.n FROM (SELECT branch_id AS n FROM ci_customer WHERE status = 2) AS x")
+    assert inner.tables == {"ci_customer": "ci_customer"}
+    assert inner.equality == [(None, "status")]
+
+    suffix, prefix = shapes(
+        "SELECT id FROM ci_customer WHERE nic LIKE '%123' UNION SELECT id FROM ci_customer WHERE mobile_1 LIKE '077%'"
+    )
+    # Only a prefix pattern can use an index
+    assert suffix.ranges == []
+    assert prefix.ranges == [(None, "mobile_1")]
+
+    [loans] = shapes("SELECT * FROM ln_loan l JOIN ln_installment i USING (loan_id) WHERE l.branch_id = :b")
+    assert ("i", "loan_id") in loans.joins
+    assert loans.equality == [("l", "branch_id")]
+
+
+def test_covers_allows_any_equality_order_but_not_sort_order():
+    candidate = Candidate("ci_customer", ("status", "branch_id", "full_name_ln1"), equality_count=2)
+
+    assert covers(["branch_id", "status", "full_name_ln1", "id"], candidate)
+    assert not covers(["branch_id", "full_name_ln1", "status"], candidate)
+    assert not covers(["status", "branch_id"], candidate)
+
+
+def test_index_ddl_names_fit_mysql_identifier_limit():
+    ddl, name = index_ddl("ci_customer", ("branch_id", "status"))
+    assert ddl == "CREATE INDEX `ix_ci_customer_branch_id_status` ON `ci_customer` (`branch_id`, `status`);"
+
+    _, long_name = index_ddl("ci_customer", ("customer_type_id", "full_name_ln1", "full_name_ln2", "full_name_ln3"))
+    assert len(long_name) <= 64
+
+
+@pytest.mark.anyio
+async def test_suggest_ranks_by_time_and_skips_indexed_columns(sqlite_engine, create_tables, monkeypatch):
+    monkeypatch.setattr(settings, "INDEX_ADVISOR_ENABLED", True)
+    await create_tables("gl_branch", "ci_customer_type", "ci_customer")
+    advisor = IndexAdvisorService()
+    for branch in range(5):
+        advisor.record(
+            f"SELECT id FROM ci_customer WHERE branch_id = {branch} AND status = 1 ORDER BY full_name_ln1", 40.0
+        )
+    advisor.record("SELECT id FROM ci_customer WHERE nic = '123V'", 5.0)
+    # customer_number already has an index
+    advisor.record("SELECT id FROM ci_customer WHERE customer_number = 'C1'", 90.0)
+
+    async with database.AsyncSessionLocal() as session:
+        result = await advisor.suggest(session)
+
+    assert result["fingerprints_analyzed"] == 3
+    suggested = [(s["table"], tuple(s["columns"])) for s in result["suggestions"]]
+    assert suggested == [
+        ("ci_customer", ("branch_id", "status", "full_name_ln1")),
+        ("ci_customer", ("nic",)),
+    ]
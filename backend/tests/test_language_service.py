@@ -0,0 +1,104 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+import config.database as database
+from models.ci_customer import CiCustomer  # noqa: F401  registers the tables
+from models.ci_customer_type import CiCustomerType  # noqa: F401
+from models.gl_branch import GlBranch  # noqa: F401
+from models.it_language import ItLanguage  # noqa: F401
+from services.language_service import localize_sql, localized_column, resolve_language_slot
+from services.reference_data_service import reference_data_service
+from services.report_registry import get_report
+from services.sql_executor_service import sql_executor_service
+
+
+def test_localized_column_falls_back_to_ln1():
+    assert localized_column("full_name") == "full_name_ln1"
+    assert localized_column("c.full_name", 1) == "c.full_name_ln1"
+    assert localized_column("c.full_name", 3) == "COALESCE(NULLIF(c.full_name_ln3, ''), c.full_name_ln1)"
+
+
+def test_localize_sql_rewrites_every_placeholder():
+    sql = "SELECT {ln:c.full_name} AS name, {ln:b.name} AS branch, '{ln:' AS x FROM ci_customer c"
+
+    assert localize_sql(sql) == "SELECT c.full_name_ln1 AS name, b.name_ln1 AS branch, '{ln:' AS x FROM ci_customer c"
+    assert localize_sql(sql, 2).startswith(
+        "SELECT COALESCE(NULLIF(c.full_name_ln2, ''), c.full_name_ln1) AS name, "
+        "COALESCE(NULLIF(b.name_ln2, ''), b.name_ln1) AS branch"
+    )
+
+
+def test_report_sql_is_rendered_in_the_language():
+    sql = get_report("customer_list").render_sql(language=2)
+
+    assert "{ln:" not in sql
+    assert "COALESCE(NULLIF(c.full_name_ln2, ''), c.full_name_ln1)" in sql
+
+
+def test_wildcards_without_language_only_drop_lobs():
+    expanded = sql_executor_service._expand_wildcards("SELECT c.*, b.* FROM ci_customer c JOIN gl_branch b ON b.id = c.branch_id")
+
+    assert "c.photo" not in expanded and "c.signature" not in expanded
+    assert "c.full_name_ln2" in expanded
+    assert "b.*" in expanded
+
+
+def test_wildcards_with_language_project_one_column_per_field():
+    expanded = sql_executor_service._expand_wildcards("SELECT b.* FROM gl_branch AS b", language=2)
+
+    assert "COALESCE(NULLIF(b.name_ln2, ''), b.name_ln1) AS name" in expanded
+    assert "b.name_ln3" not in expanded
+    assert "b.id" in expanded
+
+    bare = sql_executor_service._expand_wildcards("SELECT * FROM gl_branch WHERE status = 1", language=1)
+    assert bare.startswith("SELECT id, ")
+    assert "name_ln1 AS name, address_ln1 AS address" in bare
+    # Bare * over a join is ambiguous and left alone
+    join = "SELECT * FROM gl_branch b JOIN ci_customer c ON c.branch_id = b.id"
+    assert sql_executor_service._expand_wildcards(join, language=2).startswith("SELECT * FROM")
+
+
+@pytest.fixture
+async def branches(sqlite_engine, create_tables):
+    await create_tables("gl_branch", "it_language")
+    now = datetime(2024, 1, 1)
+    async with sqlite_engine.begin() as conn:
+        await conn.execute(
+            text("INSERT INTO gl_branch (id, name_ln1, name_ln2, status) VALUES (1, 'Colombo', :si, 1), (2, 'Kandy', '', 1)"),
+            {"si": "කොළඹ"},
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO it_language (id, language, display_name, is_active, created_at, updated_at) VALUES "
+                "(1, 'en', 'English', 1, :n, :n), (2, 'si', 'Sinhala', 1, :n, :n), (4, 'fr', 'French', 1, :n, :n)"
+            ),
+            {"n": now},
+        )
+    # Reference snapshots live in a process-wide singleton
+    reference_data_service._snapshots.pop("languages", None)
+    yield
+    reference_data_service._snapshots.pop("languages", None)
+
+
+@pytest.mark.anyio
+async def test_resolve_language_slot(branches):
+    assert await resolve_language_slot(None) is None
+    assert await resolve_language_slot("si") == 2
+    assert await resolve_language_slot("2") == 2
+    # Languages beyond the three column slots read _ln1
+    assert await resolve_language_slot("fr") == 1
+    with pytest.raises(ValueError):
+        await resolve_language_slot("de")
+
+
+@pytest.mark.anyio
+async def test_query_results_use_the_language_with_fallback(branches):
+    async with database.AsyncSessionLocal() as session:
+        result = await sql_executor_service.execute_query(
+            session, "SELECT b.* FROM gl_branch b ORDER BY b.id", language=2
+        )
+
+    assert result["success"], result
+    assert [row["name"] for row in result["data"]] == ["කොළඹ", "Kandy"]
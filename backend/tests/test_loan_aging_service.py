@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+
+import config.database as database
+from config.config import settings
+from services.loan_aging_service import AGING_BUCKETS, _to_minor_units, loan_aging_service
+
+AS_OF = date(2025, 3, 31)
+
+
+def installment(loan_id, days_overdue, amount="100.00", paid="0.00"):
+    return (
+        loan_id, f"L{loan_id}", loan_id, "GL", Decimal("1000.00"),
+        AS_OF - timedelta(days=days_overdue), Decimal(amount), Decimal(paid),
+    )
+
+
+@pytest.mark.parametrize("days, bucket", [
+    (-5, "current"),
+    (0, "current"),
+    (1, "1-30"),
+    (30, "1-30"),
+    (31, "31-60"),
+    (60, "31-60"),
+    (61, "61-90"),
+    (90, "61-90"),
+    (91, "90+"),
+    (400, "90+"),
+])
+def test_bucket_day_boundaries(days, bucket):
+    loans = loan_aging_service._age_loans([installment(1, days)], np.datetime64(AS_OF, "D"))
+
+    assert int(loans["days_past_due"][0]) == max(days, 0)
+    assert AGING_BUCKETS[loans["bucket"][0]][0] == bucket
+
+
+def test_minor_units_are_exact_beyond_float_precision():
+    amounts = [Decimal("90071992547409.93"), Decimal("0.29"), Decimal("1.00"), 7]
+
+    assert _to_minor_units(amounts).tolist() == [9007199254740993, 29, 100, 700]
+
+
+def test_repayments_clear_oldest_installments_first():
+    rows = [
+        installment(1, 45, paid="150.00"),
+        installment(1, 15, paid="150.00"),
+        installment(1, -15, paid="150.00"),
+    ]
+
+    loans = loan_aging_service._age_loans(rows, np.datetime64(AS_OF, "D"))
+
+    # The 45-day installment is paid; half of the 15-day one is still owed
+    assert int(loans["days_past_due"][0]) == 15
+    assert int(loans["arrears"][0]) == 5000
+    assert int(loans["outstanding"][0]) == 15000
+
+
+@pytest.fixture
+async def loan_book(sqlite_engine):
+    async with sqlite_engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TABLE ln_loan (id INTEGER PRIMARY KEY, loan_number TEXT, customer_id INT, "
+            "product_code TEXT, capital NUMERIC, branch_id INT, status INT)"
+        ))
+        await conn.execute(text("CREATE TABLE ln_installment (loan_id INT, due_date DATE, amount NUMERIC)"))
+        await conn.execute(text("CREATE TABLE ln_repayment (loan_id INT, payment_date DATE, amount NUMERIC)"))
+        for loan_id, days in enumerate((0, 1, 30, 31, 60, 61, 90, 91), start=1):
+            await conn.execute(
+                text("INSERT INTO ln_loan VALUES (:id, :number, :id, 'GL', 1000, 1, 1)"),
+                {"id": loan_id, "number": f"L{loan_id}"},
+            )
+            # An older paid installment ahead of the overdue one
+            for due, amount in ((days + 30, 100), (days, 100)):
+                await conn.execute(
+                    text("INSERT INTO ln_installment VALUES (:id, :due, :amount)"),
+                    {"id": loan_id, "due": AS_OF - timedelta(days=due), "amount": amount},
+                )
+            await conn.execute(
+                text("INSERT INTO ln_repayment VALUES (:id, :paid_on, 100)"),
+                {"id": loan_id, "paid_on": AS_OF - timedelta(days=days + 30)},
+            )
+
+
+@pytest.mark.anyio
+async def test_report_buckets_with_loans_straddling_batches(loan_book, monkeypatch):
+    # Three installment rows per batch, so every other loan is split across batches
+    monkeypatch.setattr(settings, "LOAN_AGING_BATCH_SIZE", 3)
+
+    async with database.AsyncSessionLocal() as session:
+        report = await loan_aging_service.past_due_report(
+            session, branch_id=1, as_of=AS_OF, include_detail=True, page_size=10
+        )
+
+    assert report["loans_scanned"] == 8
+    assert {bucket["bucket"]: bucket["loan_count"] for bucket in report["buckets"]} == {
+        "current": 1, "1-30": 2, "31-60": 2, "61-90": 2, "90+": 1,
+    }
+    assert report["total_arrears_amount"] == Decimal("700.00")
+    assert [loan["days_past_due"] for loan in report["loans"]] == [1, 30, 31, 60, 61, 90, 91]
@@ -0,0 +1,91 @@
+import io
+import json
+import logging
+import random
+import threading
+
+import pytest
+
+import config.logging_config as logging_config
+from config.config import settings
+from config.logging_config import SamplingFilter
+
+
+def record(name="app", level=logging.INFO, args=None, **extra):
+    entry = logging.LogRecord(name, level, __file__, 1, "message %s", args, None)
+    entry.__dict__.update(extra)
+    return entry
+
+
+@pytest.fixture
+def sample_rates(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_SQL_ECHO_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "LOG_SUCCESS_SAMPLE_RATE", 0.0)
+
+
+def test_errors_and_slow_queries_always_pass_the_sampler(sample_rates):
+    sampler = SamplingFilter(rng=random.Random(1))
+
+    assert sampler.filter(record("sqlalchemy.engine.Engine", logging.ERROR))
+    assert sampler.filter(record("app", logging.WARNING, sample=True))
+    assert sampler.filter(record("app", sample=True, slow=True))
+    assert sampler.filter(record("uvicorn.access", args=("1.2.3.4", "GET", "/x", "1.1", 500)))
+    assert not sampler.filter(record("uvicorn.access", args=("1.2.3.4", "GET", "/x", "1.1", 200)))
+    assert not sampler.filter(record("sqlalchemy.engine.Engine"))
+    # Records that are not high-volume are never sampled
+    assert sampler.filter(record("app"))
+
+
+def test_sampled_records_are_dropped_at_the_configured_rate(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_SUCCESS_SAMPLE_RATE", 0.1)
+    monkeypatch.setattr(settings, "LOG_SQL_ECHO_SAMPLE_RATE", 0.01)
+    success = SamplingFilter(rng=random.Random(42))
+    echo = SamplingFilter(rng=random.Random(42))
+
+    kept = sum(success.filter(record("app", sample=True)) for _ in range(10000))
+    echoed = sum(echo.filter(record("sqlalchemy.engine.Engine")) for _ in range(10000))
+
+    assert 900 <= kept <= 1100
+    assert 70 <= echoed <= 130
+    # The same seed makes the same decisions
+    replay = SamplingFilter(rng=random.Random(42))
+    assert sum(replay.filter(record("app", sample=True)) for _ in range(10000)) == kept
+
+
+class ThreadRecordingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writers = set()
+
+    def write(self, text):
+        self.writers.add(threading.current_thread().name)
+        return super().write(text)
+
+
+@pytest.fixture
+def listener_output(monkeypatch):
+    stream = ThreadRecordingStream()
+    monkeypatch.setattr(logging_config.sys, "stdout", stream)
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    logging_config.setup_logging()
+    yield stream
+    logging_config.stop_logging()
+    root.handlers, root.level = handlers, level
+
+
+def test_records_reach_the_listener_as_json_off_the_calling_thread(listener_output):
+    handler = logging.getLogger().handlers[0]
+    formatted = []
+    handler.format = lambda entry: formatted.append(entry) or ""
+
+    logging.getLogger("services.report").info("ran %s", "customer_list", extra={"duration_ms": 12})
+    logging_config.stop_logging()
+
+    # Nothing was formatted or written by the calling thread
+    assert formatted == []
+    assert threading.current_thread().name not in listener_output.writers
+    entry = json.loads(listener_output.getvalue().splitlines()[-1])
+    assert entry["logger"] == "services.report"
+    assert entry["message"] == "ran customer_list"
+    assert entry["duration_ms"] == 12
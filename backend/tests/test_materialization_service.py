@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect, text
+
+from config.config import settings
+from models.ci_customer import CiCustomer  # noqa: F401  registers the tables
+from models.ci_customer_type import CiCustomerType  # noqa: F401
+from models.gl_branch import GlBranch  # noqa: F401
+from routes.report_routes import router
+from services.materialization_service import MATERIALIZED_VIEWS, MaterializationService, summary_metadata
+
+pytestmark = pytest.mark.anyio
+
+VIEW = MATERIALIZED_VIEWS["rpt_customer_summary"]
+
+
+@pytest.fixture
+async def customers(sqlite_engine, create_tables):
+    await create_tables("gl_branch", "ci_customer_type", "ci_customer")
+    async with sqlite_engine.begin() as conn:
+        await conn.run_sync(summary_metadata.create_all)
+        await conn.execute(text("INSERT INTO gl_branch (id, name_ln1) VALUES (1, 'Colombo'), (2, 'Kandy')"))
+        for customer_id in range(1, 7):
+            await conn.execute(
+                text(
+                    "INSERT INTO ci_customer (id, branch_id, status, c_at, m_at) "
+                    "VALUES (:id, :branch, 1, :at, :at)"
+                ),
+                {"id": customer_id, "branch": 1 + customer_id % 2, "at": datetime(2020, 1, 1)},
+            )
+    return sqlite_engine
+
+
+async def stored_counts(engine):
+    async with engine.connect() as conn:
+        result = await conn.execute(text(
+            "SELECT branch_id, SUM(customer_count) FROM rpt_customer_summary GROUP BY branch_id"
+        ))
+        return dict(result.all())
+
+
+async def test_one_worker_refreshes_per_interval(customers):
+    first, second = MaterializationService(), MaterializationService()
+
+    assert [result["mode"] for result in await first.refresh_all()] == ["full"]
+    assert await second.refresh_all() == []
+    # The worker that lost the claim still serves from the populated table
+    assert second.view_for_report("customer_summary") is VIEW
+    assert await first.refresh_all() == []
+
+
+async def test_count_reconcile_runs_on_its_own_schedule(customers, monkeypatch):
+    service = MaterializationService()
+    await service.refresh_view(VIEW)
+    assert await stored_counts(customers) == {1: 3, 2: 3}
+
+    # A delete leaves no m_at trace; only the count comparison notices it
+    async with customers.begin() as conn:
+        await conn.execute(text("DELETE FROM ci_customer WHERE id IN (1, 3)"))
+
+    assert (await service.refresh_view(VIEW))["partitions"] == 0
+    assert await stored_counts(customers) == {1: 3, 2: 3}
+
+    monkeypatch.setattr(settings, "MATERIALIZED_VIEW_RECONCILE_SECONDS", 0)
+    assert (await service.refresh_view(VIEW))["partitions"] == 1
+    assert await stored_counts(customers) == {1: 3, 2: 1}
+
+
+async def test_full_refresh_swaps_in_a_staging_table(customers):
+    service = MaterializationService()
+    await service.refresh_view(VIEW)
+
+    async with customers.begin() as conn:
+        await conn.execute(text("UPDATE ci_customer SET branch_id = 1 WHERE id = 1"))
+
+    assert (await service.refresh_view(VIEW, full=True))["mode"] == "full"
+    assert await stored_counts(customers) == {1: 4, 2: 2}
+    async with customers.connect() as conn:
+        tables = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
+        indexes = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes(VIEW.name))
+    assert VIEW.staging_name not in tables and VIEW.retired_name not in tables
+    assert [index["name"] for index in indexes] == [f"ix_{VIEW.name}_filters"]
+
+
+async def test_manual_refresh_goes_through_the_claim(customers):
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    assert client.post(f"/reports/materialized/{VIEW.name}/refresh").json()["mode"] == "full"
+    # The background loop (or another worker) would refresh in between
+    assert client.post(f"/reports/materialized/{VIEW.name}/refresh").status_code == 409
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from config.config import settings
+from services.query_memory_service import (
+    MB,
+    MemoryBudget,
+    QueryMemory,
+    QueryMemoryExceeded,
+    ResultBuffer,
+    estimate_size,
+    iter_spilled_response,
+)
+
+
+def batch(start, count):
+    return [{"id": i, "name": f"customer {i}"} for i in range(start, start + count)]
+
+
+def buffer_for(limit_bytes, overflow, budget=None):
+    budget = budget or MemoryBudget(100 * MB)
+    return ResultBuffer(QueryMemory(limit_bytes, budget), overflow), budget
+
+
+def test_rows_within_budget_stay_in_memory():
+    rows = batch(0, 10)
+    buffer, budget = buffer_for(10 * MB, "spill")
+
+    buffer.extend(rows)
+
+    assert not buffer.spilled
+    assert buffer.rows == rows
+    assert budget.reserved == estimate_size(rows)
+    buffer.close()
+    assert budget.reserved == 0
+
+
+def test_fail_overflow_raises_and_keeps_earlier_charge_releasable():
+    first = batch(0, 10)
+    buffer, budget = buffer_for(estimate_size(first) + 1, "fail")
+    buffer.extend(first)
+
+    with pytest.raises(QueryMemoryExceeded, match="after 10 rows"):
+        buffer.extend(batch(10, 10))
+
+    buffer.close()
+    assert budget.reserved == 0
+
+
+def test_spill_moves_rows_to_disk_in_order():
+    first = batch(0, 10)
+    buffer, budget = buffer_for(estimate_size(first) + 1, "spill")
+
+    buffer.extend(first)
+    buffer.extend(batch(10, 10))
+    buffer.extend(batch(20, 5))
+
+    assert buffer.spilled
+    assert buffer.rows == []
+    assert buffer.row_count == 25
+    # Spilled rows are no longer charged against the budget
+    assert budget.reserved == 0
+    assert json.loads(b"".join(buffer.iter_spilled())) == batch(0, 25)
+    buffer.close()
+
+
+def test_spilled_response_has_the_regular_shape_and_closes_the_file():
+    buffer, _ = buffer_for(1, "spill")
+    buffer.extend(batch(0, 3))
+
+    body = b"".join(iter_spilled_response({"success": True, "data": None, "row_count": 3}, buffer))
+
+    assert json.loads(body) == {"success": True, "row_count": 3, "data": batch(0, 3), "rows": batch(0, 3)}
+    assert not buffer.spilled
+
+
+def test_global_budget_is_shared_between_queries():
+    rows = batch(0, 10)
+    budget = MemoryBudget(estimate_size(rows) * 3 // 2)
+    first, _ = buffer_for(10 * MB, "spill", budget)
+    second, _ = buffer_for(10 * MB, "spill", budget)
+
+    first.extend(rows)
+    second.extend(rows)
+
+    assert not first.spilled
+    assert second.spilled
+    first.close()
+    second.close()
+    assert budget.reserved == 0
+
+
+def test_spill_file_limit(monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_SPILL_MAX_MB", 0)
+    buffer, _ = buffer_for(1, "spill")
+
+    with pytest.raises(QueryMemoryExceeded, match="spill limit"):
+        buffer.extend(batch(0, 3))
+    buffer.close()
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from models.gl_branch import GlBranch  # noqa: F401  registers the tables
+from services.reference_data_service import ReferenceDataService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def branches(sqlite_engine, create_tables):
+    await create_tables("gl_branch")
+    async with sqlite_engine.begin() as conn:
+        await conn.execute(
+            text("INSERT INTO gl_branch (id, name_ln1, status, m_at) VALUES (1, 'Colombo', 1, :at), (2, 'Kandy', 1, :at)"),
+            {"at": datetime(2024, 1, 1)},
+        )
+    return sqlite_engine
+
+
+async def test_snapshot_version_moves_only_when_the_table_changes(branches):
+    service = ReferenceDataService()
+    first = await service.get_or_load("branches")
+    assert [item.id for item in first.items] == [1, 2]
+    assert first.version == 1
+
+    assert await service.refresh_table("branches") is first
+    assert (await service.refresh_table("branches", force=True)).etag == first.etag
+
+    async with branches.begin() as conn:
+        await conn.execute(
+            text("UPDATE gl_branch SET name_ln1 = 'Kandy City', m_at = :at WHERE id = 2"),
+            {"at": datetime(2024, 6, 1)},
+        )
+
+    second = await service.refresh_table("branches")
+    assert second.version == 2
+    assert second.etag != first.etag
+    assert second.items[1].name_ln1 == "Kandy City"
+    # Readers holding the old snapshot are unaffected
+    assert first.items[1].name_ln1 == "Kandy"
+
+
+async def test_workers_loading_the_same_data_agree_on_the_etag(branches):
+    first_worker, second_worker = ReferenceDataService(), ReferenceDataService()
+    # The second worker's counter has moved on through an earlier reload
+    await second_worker.get_or_load("branches")
+    async with branches.begin() as conn:
+        await conn.execute(text("UPDATE gl_branch SET status = 0 WHERE id = 2"))
+    await second_worker.refresh_table("branches", force=True)
+    async with branches.begin() as conn:
+        await conn.execute(text("UPDATE gl_branch SET status = 1 WHERE id = 2"))
+    second = await second_worker.refresh_table("branches", force=True)
+
+    first = await first_worker.get_or_load("branches")
+
+    assert (first.version, second.version) == (1, 3)
+    assert first.etag == second.etag
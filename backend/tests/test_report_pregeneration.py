@@ -0,0 +1,156 @@
+from datetime import date
+import fcntl
+import logging
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import services.report_pregeneration_service as pregeneration
+from config.config import settings
+from routes import loan_routes, report_routes
+from services.loan_aging_service import loan_aging_service
+from services.report_pregeneration_service import (
+    PREGENERATED_JOBS,
+    ReportPregenerationService,
+    configured_reports,
+    get_pregenerated_report,
+)
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = ReportPregenerationService(directory=str(tmp_path))
+
+    async def run_all(since=None):
+        return {}
+
+    # Only the trigger is under test; a real run needs the reference tables
+    service.run_all = run_all
+    return service
+
+
+@pytest.fixture
+def held_lock(tmp_path):
+    """The run lock as held by another worker."""
+    with open(os.path.join(tmp_path, ".lock"), "wb") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        yield
+        fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+@pytest.fixture
+def client(service, monkeypatch):
+    monkeypatch.setattr("services.report_pregeneration_service.report_pregeneration_service", service)
+    app = FastAPI()
+    app.include_router(report_routes.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def pregenerated(tmp_path, monkeypatch):
+    """A service with stored payloads for branch 3, generated by the real jobs over stubbed reports."""
+    monkeypatch.setattr(settings, "REPORT_PREGENERATE_ENABLED", True)
+    monkeypatch.setattr(settings, "REPORT_PREGENERATE_REPORTS", "customer_list,loans_past_due")
+    service = ReportPregenerationService(directory=str(tmp_path))
+    monkeypatch.setattr(pregeneration, "report_pregeneration_service", service)
+    detail_requests = []
+
+    async def run_registered_report(name, session, params):
+        return {"success": True, "report": name, "data": [{"customer_id": 7}], "row_count": 1}
+
+    async def past_due_report(session, branch_id, **detail):
+        detail_requests.append(detail)
+        return {
+            "branch_id": branch_id,
+            "as_of": date.today(),
+            "loans_scanned": 1,
+            "buckets": [],
+            "total_loan_count": 1,
+            "total_arrears_amount": "10.00",
+            "total_outstanding_amount": "10.00",
+            "loans": [],
+            "detail_count": 0,
+            "page": detail["page"],
+            "page_size": detail["page_size"],
+        }
+
+    monkeypatch.setattr(pregeneration, "_run_registered_report", run_registered_report)
+    monkeypatch.setattr(loan_aging_service, "past_due_report", past_due_report)
+    return service, detail_requests
+
+
+async def generate_branch_3(service):
+    await service.generate(get_pregenerated_report("customer_list"), {"branch_id": 3, "customer_type_id": None})
+    await service.generate(PREGENERATED_JOBS["loans_past_due"], {"branch_id": 3})
+
+
+def test_loans_past_due_is_opt_in():
+    assert configured_reports() == ["customer_list"]
+
+
+def test_lock_held_by_another_worker_is_detected(service, held_lock):
+    assert service.running_elsewhere()
+
+
+def test_lock_is_free_before_any_run(service):
+    assert not service.running_elsewhere()
+
+
+def test_trigger_is_refused_while_another_worker_runs(client, held_lock, caplog):
+    with caplog.at_level(logging.INFO, logger="routes.report_routes"):
+        response = client.post("/reports/pregenerated/generate")
+
+    assert response.status_code == 409
+    assert "requested by testclient refused" in caplog.text
+
+
+def test_trigger_logs_the_caller(client, caplog):
+    with caplog.at_level(logging.INFO, logger="routes.report_routes"):
+        response = client.post("/reports/pregenerated/generate")
+
+    assert response.status_code == 200
+    assert response.json() == {"started": True}
+    assert "triggered by testclient" in caplog.text
+
+
+@pytest.mark.anyio
+async def test_customer_list_screen_is_served_the_pregenerated_payload(pregenerated):
+    service, _ = pregenerated
+    await generate_branch_3(service)
+    app = FastAPI()
+    app.include_router(report_routes.router)
+
+    # As CustomerList.tsx sends it: snapshot mode, no customer type chosen
+    response = TestClient(app).post(
+        "/reports/customer_list/run",
+        json={"params": {"branch_id": 3, "customer_type_id": None}, "mode": "snapshot"},
+    )
+
+    assert response.status_code == 200
+    assert "X-Report-Generated-At" in response.headers
+    assert response.json()["data"] == [{"customer_id": 7}]
+
+
+@pytest.mark.anyio
+async def test_loan_past_due_screen_is_served_the_pregenerated_first_page(pregenerated):
+    service, detail_requests = pregenerated
+    await generate_branch_3(service)
+    assert detail_requests == [{"include_detail": True, "page": 1, "page_size": 50}]
+    app = FastAPI()
+    app.include_router(loan_routes.router)
+    client = TestClient(app)
+
+    # As LoanPastDueReports.tsx sends it with no filters set
+    response = client.get("/loans/past-due", params={"branch_id": 3, "include_detail": "true"})
+    assert response.status_code == 200
+    assert "X-Report-Generated-At" in response.headers
+    assert response.json()["page_size"] == 50 and response.json()["loans"] == []
+
+    # Totals only: the same payload without the detail page
+    response = client.get("/loans/past-due", params={"branch_id": 3})
+    assert "X-Report-Generated-At" in response.headers
+    assert response.json()["loans"] is None and response.json()["page"] is None
+    assert response.json()["total_loan_count"] == 1
+    assert len(detail_requests) == 1
@@ -0,0 +1,54 @@
+import pytest
+
+import config.database as database
+from services.report_registry import ReportDefinition
+from services.report_snapshot_service import ReportSnapshotService
+
+pytestmark = pytest.mark.anyio
+
+DEFINITION = ReportDefinition(
+    name="customers",
+    title="Customers",
+    sql="SELECT id, name FROM customer WHERE 1 = 1 {delta} ORDER BY name",
+    primary_key="id",
+    order_by=("name",),
+    change_columns=("m_at",),
+)
+
+
+class FakeReport:
+    """execute callback returning the next queued result set"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+
+    async def __call__(self, session, sql, binds):
+        return ["id", "name"], self.results.pop(0)
+
+
+async def run(service, execute):
+    async with database.AsyncSessionLocal() as session:
+        columns, rows, meta = await service.run(session, DEFINITION, {}, execute)
+    return [row["name"] for row in rows], meta["refresh"]
+
+
+async def test_delta_update_that_changes_the_sort_key_reorders(sqlite_engine):
+    service = ReportSnapshotService()
+    execute = FakeReport(
+        [{"id": 1, "name": "Alwis"}, {"id": 2, "name": "Bandara"}, {"id": 3, "name": "Costa"}],
+        [{"id": 1, "name": "Zoysa"}],
+    )
+
+    assert await run(service, execute) == (["Alwis", "Bandara", "Costa"], "full")
+    assert await run(service, execute) == (["Bandara", "Costa", "Zoysa"], "delta")
+
+
+async def test_delta_appends_new_rows_in_order(sqlite_engine):
+    service = ReportSnapshotService()
+    execute = FakeReport(
+        [{"id": 1, "name": "Alwis"}, {"id": 3, "name": "Costa"}],
+        [{"id": 2, "name": "Bandara"}, {"id": 3, "name": "Costa"}],
+    )
+
+    await run(service, execute)
+    assert await run(service, execute) == (["Alwis", "Bandara", "Costa"], "delta")
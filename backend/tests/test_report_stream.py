@@ -0,0 +1,102 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from config.config import settings
+from models.ci_customer import CiCustomer  # noqa: F401  registers the tables
+from models.ci_customer_type import CiCustomerType  # noqa: F401
+from models.gl_branch import GlBranch  # noqa: F401
+from services import report_service as report_module
+from services.report_registry import ReportDefinition
+from services.report_service import report_service
+from services.sql_executor_service import sql_executor_service
+
+pytestmark = pytest.mark.anyio
+
+DEFINITION = ReportDefinition(
+    name="stream_test",
+    title="Stream test",
+    sql="SELECT id, full_name_ln1 FROM ci_customer ORDER BY id",
+)
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+@pytest.fixture
+async def customers(sqlite_engine, create_tables, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_STREAM_FIRST_PAGE_ROWS", 2)
+    monkeypatch.setattr(settings, "QUERY_FETCH_BATCH_SIZE", 3)
+    await create_tables("gl_branch", "ci_customer_type", "ci_customer")
+    async with sqlite_engine.begin() as conn:
+        for customer_id in range(1, 7):
+            await conn.execute(
+                text("INSERT INTO ci_customer (id, full_name_ln1, m_at) VALUES (:id, :name, :at)"),
+                {"id": customer_id, "name": f"Customer {customer_id}", "at": datetime(2024, 1, 1)},
+            )
+
+
+async def test_stream_yields_columns_row_batches_and_complete(customers):
+    events = await collect(report_service.stream_report(DEFINITION, {}))
+
+    assert [name for name, _ in events] == ["columns", "rows", "rows", "rows", "complete"]
+    assert events[0][1]["columns"] == ["id", "full_name_ln1"]
+    assert [(data["offset"], len(data["rows"])) for name, data in events if name == "rows"] == [(0, 2), (2, 3), (5, 1)]
+    assert events[-1][1]["row_count"] == 6
+
+
+async def test_unexpected_error_becomes_an_error_event(customers, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("conversion failed")
+
+    monkeypatch.setattr(sql_executor_service, "convert_rows", broken)
+
+    events = await collect(report_service.stream_report(DEFINITION, {}))
+
+    assert [name for name, _ in events] == ["columns", "error"]
+    assert events[-1][1]["error"] == "Internal server error"
+
+
+async def test_pending_fetch_is_cancelled_before_the_result_is_closed(monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_STREAM_PROGRESS_SECONDS", 0.01)
+    calls = []
+
+    class SlowResult:
+        def keys(self):
+            return ["id"]
+
+        async def fetchmany(self, size):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                await asyncio.sleep(0.01)
+                calls.append("fetch unwound")
+                raise
+
+        async def close(self):
+            calls.append("close")
+
+    class FakeSession:
+        bind = SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
+
+        async def stream(self, statement, binds):
+            return SlowResult()
+
+    @asynccontextmanager
+    async def fake_session():
+        yield FakeSession()
+
+    monkeypatch.setattr(report_module, "read_only_session", fake_session)
+
+    stream = report_service.stream_report(DEFINITION, {})
+    assert (await stream.__anext__())[0] == "columns"
+    assert (await stream.__anext__())[0] == "progress"
+    # The client disconnects while the batch is still being fetched
+    await stream.aclose()
+
+    assert calls == ["fetch unwound", "close"]
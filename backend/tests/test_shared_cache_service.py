@@ -0,0 +1,116 @@
+import fcntl
+import os
+
+import pytest
+
+from config.config import settings
+from services.shared_cache_service import SharedCache
+
+KB = 1024
+
+
+@pytest.fixture
+def make_cache(tmp_path, monkeypatch):
+    """SharedCache factory over a temporary 1 MB file (four 256 KB segments by default)."""
+    monkeypatch.setattr(settings, "SHARED_CACHE_ENABLED", True)
+    caches = []
+
+    def make(slot_count=64, segment_kb=256):
+        cache = SharedCache(
+            path=str(tmp_path / "cache"), size_mb=1, segment_kb=segment_kb, slot_count=slot_count
+        )
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def value(n):
+    # Two values fill a 256 KB segment
+    return bytes([n]) * (120 * KB)
+
+
+def test_least_recently_used_segment_is_evicted(make_cache):
+    cache = make_cache()
+    for n in range(8):
+        assert cache.put("reports", f"k{n}", value(n))
+
+    # Touch the oldest segment (k0, k1) so the second one (k2, k3) is the LRU
+    assert cache.get("reports", "k0") == value(0)
+    assert cache.put("reports", "k8", value(8))
+
+    assert cache.get("reports", "k2") is None
+    assert cache.get("reports", "k3") is None
+    assert cache.get("reports", "k1") == value(1)
+    assert cache.get("reports", "k8") == value(8)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_index_load_factor_evicts_a_segment(make_cache):
+    # Sixteen 64 KB segments, one entry each, but only 8 index slots (6 usable)
+    cache = make_cache(slot_count=8, segment_kb=64)
+    for n in range(7):
+        assert cache.put("nav", f"k{n}", bytes(40 * KB))
+
+    assert cache.get("nav", "k0") is None
+    assert all(cache.get("nav", f"k{n}") is not None for n in range(1, 7))
+    assert cache.stats()["entries"] == 6
+    assert cache.stats()["evictions"] == 1
+
+
+def test_values_are_shared_between_mappings_and_invalidated_by_namespace(make_cache):
+    writer, reader = make_cache(), make_cache()
+    writer.put("nav_menu", "user:1", b"[1]")
+    writer.put("translations", "si", b"{}")
+
+    assert reader.get("nav_menu", "user:1") == b"[1]"
+    reader.invalidate("nav_menu")
+    assert writer.get("nav_menu", "user:1") is None
+    assert writer.get("translations", "si") == b"{}"
+
+
+def test_expired_and_oversized_entries(make_cache, monkeypatch):
+    cache = make_cache()
+    cache.put("reports", "old", b"x", ttl=-1)
+    assert cache.get("reports", "old") is None
+
+    monkeypatch.setattr(settings, "SHARED_CACHE_MAX_ITEM_KB", 1)
+    assert not cache.put("reports", "big", bytes(2 * KB))
+
+
+def test_gets_share_the_lock_and_never_wait_for_a_writer(make_cache):
+    cache = make_cache()
+    cache.put("nav_menu", "user:1", b"[1]")
+    fd = os.open(cache.path, os.O_RDWR)
+    try:
+        # Another worker reading at the same time
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        assert cache.get("nav_menu", "user:1") == b"[1]"
+        # Another worker writing: a miss instead of blocking the event loop
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        assert cache.get("nav_menu", "user:1") is None
+    finally:
+        os.close(fd)
+
+    assert cache.get("nav_menu", "user:1") == b"[1]"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_eviction_skips_entries_rewritten_into_another_segment(make_cache):
+    # Six 10 KB entries per 64 KB segment, 12 usable index slots
+    cache = make_cache(slot_count=16, segment_kb=64)
+    for n in range(6):
+        assert cache.put("query", f"k{n}", bytes(10 * KB))
+    # k0's stale copy stays in the first segment, the live one moves on
+    assert cache.put("query", "k0", b"rewritten".ljust(10 * KB))
+    for n in range(6, 13):
+        assert cache.put("query", f"k{n}", bytes(10 * KB))
+
+    live = [n for n in range(13) if cache.get("query", f"k{n}") is not None]
+    assert live == [0] + list(range(6, 13))
+    assert cache.get("query", "k0").startswith(b"rewritten")
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 8
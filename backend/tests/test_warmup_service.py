@@ -0,0 +1,131 @@
+import asyncio
+import importlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config.config import settings
+from services.warmup_service import WarmupPhase, WarmupService
+
+pytestmark = pytest.mark.anyio
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def gated_service(gate: asyncio.Event, failures: int = 0) -> WarmupService:
+    """A WarmupService whose required phase waits for gate and fails `failures` times first."""
+    service = WarmupService()
+    attempts = {"pool": 0}
+
+    async def pool():
+        attempts["pool"] += 1
+        await gate.wait()
+        if attempts["pool"] <= failures:
+            raise ConnectionError("database unavailable")
+        return {"connections": 1}
+
+    async def translations():
+        raise RuntimeError("translations table missing")
+
+    service.phases = [
+        WarmupPhase("database_pool", pool, required=True),
+        WarmupPhase("translations", translations),
+    ]
+    service.attempts = attempts
+    return service
+
+
+async def test_optional_phase_failures_do_not_hold_up_readiness():
+    gate = asyncio.Event()
+    service = gated_service(gate)
+    await service.start()
+    # Let the phases start and the optional one fail
+    await asyncio.sleep(0.05)
+
+    assert not service.ready
+    assert service.status()["phases"]["translations"]["status"] == "failed"
+    assert service.status()["phases"]["database_pool"]["status"] == "running"
+
+    gate.set()
+    await service._task
+    status = service.status()
+    assert service.ready and status["status"] == "ready"
+    assert status["phases"]["database_pool"]["detail"] == {"connections": 1}
+    assert status["phases"]["translations"]["status"] == "failed"
+    assert status["phases"]["translations"]["error"] == "translations table missing"
+
+
+async def test_required_phases_are_retried_until_they_succeed(monkeypatch):
+    monkeypatch.setattr(settings, "STARTUP_WARMUP_RETRY_SECONDS", 0)
+    gate = asyncio.Event()
+    gate.set()
+    service = gated_service(gate, failures=2)
+
+    await service.start()
+    await service._task
+
+    assert service.ready
+    assert service.attempts["pool"] == 3
+    assert service.status()["phases"]["database_pool"]["status"] == "ok"
+
+
+async def test_disabled_warmup_is_ready_at_once(monkeypatch):
+    monkeypatch.setattr(settings, "STARTUP_WARMUP", False)
+    service = WarmupService()
+
+    await service.start()
+
+    assert service.ready and service._task is None
+
+
+@pytest.fixture
+def main_module(monkeypatch):
+    # Importing main would route the test run's logging through its listener
+    monkeypatch.setattr("config.logging_config.setup_logging", lambda: None)
+    return importlib.import_module("main")
+
+
+async def test_ready_is_503_until_the_warmup_finishes(main_module, monkeypatch):
+    gate = asyncio.Event()
+    service = gated_service(gate)
+    monkeypatch.setattr(main_module, "warmup_service", service)
+    client = TestClient(main_module.app)
+    await service.start()
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    gate.set()
+    await service._task
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_report_services_are_not_imported_at_startup():
+    script = (
+        "import json, sys, main; "
+        "print(json.dumps(sorted(m for m in sys.modules if m.startswith(('services.', 'numpy', 'PIL')))))"
+    )
+    env = {**os.environ, "DATABASE_URL": "sqlite+aiosqlite://"}
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    loaded = set(json.loads(output.splitlines()[-1]))
+
+    for module in (
+        "services.report_service",
+        "services.report_pregeneration_service",
+        "services.materialization_service",
+        "services.aggregation_service",
+        "services.loan_aging_service",
+        "numpy",
+        "PIL",
+    ):
+        assert module not in loaded
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from "react";
 import CustomerReport from "../CustomerReport";
 import { sqlExecutorApi } from "../../services/sqlExecutorService";
+import { reportApi } from "../../services/reportService";
 import { toast } from "react-toastify";
 import "./CustomerList.css";
 
@@ -74,48 +75,13 @@ const CustomerList: React.FC = () => {
     setError(null);
 
     try {
-      // Build SQL query based on selected filters
-      let query = `
-SELECT
-    c.customer_number              AS \`Ref member number\`,
-    ct.type_ln1                   AS \`Customer type\`,
-    c.full_name_ln1               AS \`Name\`,
-    c.address_ln1                 AS \`Address\`,
-    c.home_phone                  AS \`Phone\`,
-    c.mobile_1                    AS \`Mobile\`,
-    c.date_of_birth               AS \`Date of Birth\`,
-    c.gender                      AS \`Sex\`,
-    b.name_ln1                    AS \`Branch Name\`
-FROM
-    ci_customer AS c
-    LEFT JOIN gl_branch AS b
-        ON c.branch_id = b.id
-    LEFT JOIN ci_customer_type AS ct
-        ON c.customer_type_id = ct.id
-WHERE
-    c.branch_id = ${branchId}`;
-
-      // Add customer type filter if selected
-      if (customerTypeId) {
-        query += `
-    AND c.customer_type_id = ${customerTypeId}`;
-      }
-
-      query += `
-GROUP BY
-    b.name_ln1,
-    ct.type_ln1`;
-
-      // Console log the query being sent
-      console.log("=== SQL Query Being Sent ===");
-      console.log(query);
-      console.log("=== Parameters ===");
-      console.log("Branch ID:", branchId);
-      console.log("Customer Type ID:", customerTypeId || "NULL (not selected)");
-      console.log("==========================");
-
-      // Execute the query
-      const response = await sqlExecutorApi.executeQuery(query);
+      // Customer list is a registered report; snapshot mode only fetches
+      // customers changed since the last run
+      const response = await reportApi.runReport(
+        "customer_list",
+        { branch_id: branchId, customer_type_id: customerTypeId },
+        "snapshot"
+      );
 
       if (response.success && response.data) {
         setSelectedBranch(branchName);
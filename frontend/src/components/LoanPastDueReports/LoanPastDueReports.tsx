@@ -1,8 +1,19 @@
-import React, { useState } from "react";
+import React, { useState, useEffect } from "react";
+import { sqlExecutorApi } from "../../services/sqlExecutorService";
+import { loanApi, LoanPastDueResponse } from "../../services/loanService";
+import { toast } from "react-toastify";
 import "./LoanPastDueReports.css";
 
+interface DropdownOption {
+  id: number;
+  name: string;
+}
+
 const LoanPastDueReports: React.FC = () => {
   const [branchName, setBranchName] = useState("");
+  const [branches, setBranches] = useState<DropdownOption[]>([]);
+  const [report, setReport] = useState<LoanPastDueResponse | null>(null);
+  const [isLoading, setIsLoading] = useState(false);
   const [loanProduct, setLoanProduct] = useState("");
 
   const [installmentFrom, setInstallmentFrom] = useState("");
@@ -14,24 +25,41 @@ const LoanPastDueReports: React.FC = () => {
   const [capitalFrom, setCapitalFrom] = useState("");
   const [capitalTo, setCapitalTo] = useState("");
 
-  const handleGenerateReport = () => {
+  useEffect(() => {
+    sqlExecutorApi
+      .getBranches()
+      .then(setBranches)
+      .catch((err) => console.error("Error loading branches:", err));
+  }, []);
+
+  const toNumber = (value: string) => (value === "" ? undefined : Number(value));
+
+  const handleGenerateReport = async () => {
     if (!branchName) {
-      alert("Please select a Branch Name");
+      toast.error("Please select a Branch Name");
       return;
     }
 
-    console.log("Generating Loan Past Due Report with:", {
-      branchName,
-      loanProduct,
-      installmentFrom,
-      installmentTo,
-      passdueDaysFrom,
-      passdueDaysTo,
-      capitalFrom,
-      capitalTo,
-    });
-
-    // TODO: integrate with service to request report data
+    setIsLoading(true);
+    try {
+      const response = await loanApi.getPastDue({
+        branch_id: Number(branchName),
+        product_code: loanProduct || undefined,
+        due_from: installmentFrom || undefined,
+        due_to: installmentTo || undefined,
+        min_days: toNumber(passdueDaysFrom),
+        max_days: toNumber(passdueDaysTo),
+        capital_from: toNumber(capitalFrom),
+        capital_to: toNumber(capitalTo),
+        include_detail: true,
+      });
+      setReport(response);
+    } catch (err) {
+      const message = err instanceof Error ? err.message : "Failed to generate report";
+      toast.error(message);
+    } finally {
+      setIsLoading(false);
+    }
   };
 
   return (
@@ -50,9 +78,11 @@ const LoanPastDueReports: React.FC = () => {
             className="form-select"
           >
             <option value="">Select Branch</option>
-            <option value="branch1">Branch 1</option>
-            <option value="branch2">Branch 2</option>
-            <option value="branch3">Branch 3</option>
+            {branches.map((branch) => (
+              <option key={branch.id} value={branch.id}>
+                {branch.name}
+              </option>
+            ))}
           </select>
         </div>
 
@@ -99,17 +129,23 @@ const LoanPastDueReports: React.FC = () => {
             <div className="range-row">
               <label className="small-label">From</label>
               <input
-                type="date"
+                type="number"
+                min="0"
+                step="1"
                 value={passdueDaysFrom}
                 onChange={(e) => setPassdueDaysFrom(e.target.value)}
                 className="form-input"
+                placeholder="0"
               />
               <label className="small-label">To</label>
               <input
-                type="date"
+                type="number"
+                min="0"
+                step="1"
                 value={passdueDaysTo}
                 onChange={(e) => setPassdueDaysTo(e.target.value)}
                 className="form-input"
+                placeholder="0"
               />
             </div>
           </div>
@@ -144,10 +180,43 @@ const LoanPastDueReports: React.FC = () => {
         </div>
 
         <div className="form-actions">
-          <button className="btn-generate-report" onClick={handleGenerateReport}>
-            Generate Report
+          <button
+            className="btn-generate-report"
+            onClick={handleGenerateReport}
+            disabled={isLoading}
+          >
+            {isLoading ? "Generating..." : "Generate Report"}
           </button>
         </div>
+
+        {report && (
+          <table className="aging-table">
+            <thead>
+              <tr>
+                <th>Days Past Due</th>
+                <th>Loans</th>
+                <th>Arrears</th>
+                <th>Outstanding</th>
+              </tr>
+            </thead>
+            <tbody>
+              {report.buckets.map((bucket) => (
+                <tr key={bucket.bucket}>
+                  <td>{bucket.bucket}</td>
+                  <td>{bucket.loan_count}</td>
+                  <td>{bucket.arrears_amount}</td>
+                  <td>{bucket.outstanding_amount}</td>
+                </tr>
+              ))}
+              <tr className="aging-total">
+                <td>Total</td>
+                <td>{report.total_loan_count}</td>
+                <td>{report.total_arrears_amount}</td>
+                <td>{report.total_outstanding_amount}</td>
+              </tr>
+            </tbody>
+          </table>
+        )}
       </div>
     </div>
   );
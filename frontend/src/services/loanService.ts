@@ -0,0 +1,79 @@
+// API service for loan past-due (arrears aging) reports
+const API_BASE_URL = "http://localhost:8000/api/v1";
+
+export interface AgingBucketTotal {
+  bucket: string;
+  min_days: number;
+  max_days: number | null;
+  loan_count: number;
+  arrears_amount: string;
+  outstanding_amount: string;
+}
+
+export interface PastDueLoan {
+  loan_id: number;
+  loan_number: string | null;
+  customer_id: number | null;
+  product_code: string | null;
+  capital: string;
+  days_past_due: number;
+  bucket: string;
+  overdue_installments: number;
+  oldest_due_date: string | null;
+  arrears_amount: string;
+  outstanding_amount: string;
+}
+
+export interface LoanPastDueResponse {
+  branch_id: number;
+  product_code: string | null;
+  as_of: string;
+  loans_scanned: number;
+  buckets: AgingBucketTotal[];
+  total_loan_count: number;
+  total_arrears_amount: string;
+  total_outstanding_amount: string;
+  loans?: PastDueLoan[] | null;
+  detail_count?: number | null;
+  page?: number | null;
+  page_size?: number | null;
+}
+
+export interface LoanPastDueParams {
+  branch_id: number;
+  product_code?: string;
+  as_of?: string;
+  min_days?: number;
+  max_days?: number;
+  due_from?: string;
+  due_to?: string;
+  capital_from?: number;
+  capital_to?: number;
+  include_detail?: boolean;
+  page?: number;
+  page_size?: number;
+}
+
+export const loanApi = {
+  /**
+   * Get aging bucket totals (and optionally a page of past-due loans)
+   * @param params - Branch, product and filter parameters
+   */
+  async getPastDue(params: LoanPastDueParams): Promise<LoanPastDueResponse> {
+    const query = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== "") {
+        query.append(key, String(value));
+      }
+    });
+
+    const response = await fetch(`${API_BASE_URL}/loans/past-due?${query}`);
+    const data = await response.json();
+
+    if (!response.ok) {
+      throw new Error(data.detail || "Failed to load loan past-due report");
+    }
+
+    return data;
+  },
+};
@@ -0,0 +1,135 @@
+// API service for registered (named) reports
+const API_BASE_URL = "http://localhost:8000/api/v1";
+
+export type ReportMode = "live" | "snapshot";
+
+export interface ReportSnapshotInfo {
+  refresh: "full" | "delta";
+  fetched_rows: number;
+  watermark: string;
+  refreshed_at: string;
+}
+
+export interface ReportRunResponse {
+  success: boolean;
+  report: string;
+  data: any[];
+  columns?: string[];
+  row_count?: number;
+  snapshot?: ReportSnapshotInfo | null;
+  error?: string;
+}
+
+export interface ReportStreamColumns {
+  report: string;
+  columns: string[];
+  source: string;
+  estimated_total: number | null;
+}
+
+export interface ReportStreamProgress {
+  rows_fetched: number;
+  elapsed_ms: number;
+  estimated_total: number | null;
+}
+
+export interface ReportStreamComplete {
+  report: string;
+  row_count: number;
+  duration_ms: number;
+  source: string;
+  omitted_columns: string[] | null;
+}
+
+export interface ReportStreamHandlers {
+  onColumns?: (event: ReportStreamColumns) => void;
+  onRows: (rows: any[], offset: number) => void;
+  onProgress?: (event: ReportStreamProgress) => void;
+  onComplete?: (event: ReportStreamComplete) => void;
+  onError?: (error: string) => void;
+}
+
+export const reportApi = {
+  /**
+   * Run a registered report
+   * @param reportName - Name of the report (e.g. "customer_list")
+   * @param params - Report parameters
+   * @param mode - "snapshot" refreshes a stored result incrementally
+   * @param language - Optional caller language (it_language code) for names
+   *   and addresses, falling back to _ln1
+   */
+  async runReport(
+    reportName: string,
+    params: Record<string, unknown>,
+    mode: ReportMode = "live",
+    language?: string
+  ): Promise<ReportRunResponse> {
+    const response = await fetch(`${API_BASE_URL}/reports/${reportName}/run`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ params, mode, language }),
+    });
+
+    const data = await response.json();
+
+    if (!response.ok) {
+      throw new Error(data.detail || data.error || "Failed to run report");
+    }
+
+    return data;
+  },
+
+  /**
+   * Run a registered report progressively (Server-Sent Events): columns
+   * arrive first, then rows batch by batch with progress events
+   * @param reportName - Name of the report (e.g. "customer_list")
+   * @param params - Report parameters
+   * @param handlers - Callbacks per event
+   * @param language - Optional caller language (it_language code)
+   * @returns A function that stops the stream
+   */
+  streamReport(
+    reportName: string,
+    params: Record<string, string | number | null | undefined>,
+    handlers: ReportStreamHandlers,
+    language?: string
+  ): () => void {
+    const query = new URLSearchParams();
+    if (language) {
+      query.append("language", language);
+    }
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== null && value !== undefined && value !== "") {
+        query.append(key, String(value));
+      }
+    });
+    const source = new EventSource(
+      `${API_BASE_URL}/reports/${reportName}/stream?${query.toString()}`
+    );
+
+    source.addEventListener("columns", (event) => {
+      handlers.onColumns?.(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener("rows", (event) => {
+      const data = JSON.parse((event as MessageEvent).data);
+      handlers.onRows(data.rows, data.offset);
+    });
+    source.addEventListener("progress", (event) => {
+      handlers.onProgress?.(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener("complete", (event) => {
+      source.close();
+      handlers.onComplete?.(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener("error", (event) => {
+      // Server-sent "error" events carry data; connection errors do not
+      source.close();
+      const data = (event as MessageEvent).data;
+      handlers.onError?.(data ? JSON.parse(data).error : "Failed to stream report");
+    });
+
+    return () => source.close();
+  },
+};
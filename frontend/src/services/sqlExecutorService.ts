@@ -15,16 +15,31 @@ export interface QueryExecuteResponse {
   error?: string;
 }
 
+export type IsolationLevel =
+  | "READ UNCOMMITTED"
+  | "READ COMMITTED"
+  | "REPEATABLE READ"
+  | "SERIALIZABLE";
+
+export interface QueryBatchResponse {
+  success: boolean;
+  results: QueryExecuteResponse[];
+  duration_ms?: number;
+}
+
 export const sqlExecutorApi = {
   /**
    * Execute a SQL query
    * @param query - SQL query string
    * @param limit - Optional limit for number of rows
+   * @param language - Optional caller language (it_language code): multilingual
+   *   fields are returned in it, falling back to _ln1
    * @returns Query results or error
    */
   executeQuery: async (
     query: string,
-    limit?: number
+    limit?: number,
+    language?: string
   ): Promise<QueryExecuteResponse> => {
     try {
       const response = await fetch(`${API_BASE_URL}/runQuery`, {
@@ -32,7 +47,7 @@ export const sqlExecutorApi = {
         headers: {
           "Content-Type": "application/json",
         },
-        body: JSON.stringify({ query, limit }),
+        body: JSON.stringify({ query, limit, language }),
       });
 
       const data = await response.json();
@@ -49,33 +64,69 @@ export const sqlExecutorApi = {
   },
 
   /**
-   * Get all active branches
+   * Execute several queries against one consistent database snapshot
+   * @param queries - Queries (with optional limits) for one page/report
+   * @param isolationLevel - Optional transaction isolation level
+   * @param language - Optional caller language (it_language code)
+   * @returns One result per query, in request order
+   */
+  executeBatch: async (
+    queries: QueryExecuteRequest[],
+    isolationLevel?: IsolationLevel,
+    language?: string
+  ): Promise<QueryBatchResponse> => {
+    const response = await fetch(`${API_BASE_URL}/runQueries`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ queries, isolation_level: isolationLevel, language }),
+    });
+
+    const data = await response.json();
+
+    if (!response.ok) {
+      throw new Error(data.detail || "Failed to execute queries");
+    }
+
+    return data;
+  },
+
+  /**
+   * Get all active branches (served from the backend reference cache)
    */
   getBranches: async (): Promise<{ id: number; name: string }[]> => {
-    const query =
-      "SELECT id, name_ln1 as name FROM gl_branch WHERE status = 1 ORDER BY name_ln1";
-    const response = await sqlExecutorApi.executeQuery(query);
-    return response.success ? response.data : [];
+    const response = await fetch(`${API_BASE_URL}/reference/branches`);
+    if (!response.ok) return [];
+    const data = await response.json();
+    return data.branches.map((b: { id: number; name_ln1: string }) => ({
+      id: b.id,
+      name: b.name_ln1,
+    }));
   },
 
   /**
-   * Get all active customer types
+   * Get all active customer types (served from the backend reference cache)
    */
   getCustomerTypes: async (): Promise<{ id: number; name: string }[]> => {
-    const query =
-      "SELECT id, type_ln1 as name FROM ci_customer_type WHERE status = 1 ORDER BY type_ln1";
-    const response = await sqlExecutorApi.executeQuery(query);
-    return response.success ? response.data : [];
+    const response = await fetch(`${API_BASE_URL}/reference/customer-types`);
+    if (!response.ok) return [];
+    const data = await response.json();
+    return data.customer_types.map((t: { id: number; type_ln1: string }) => ({
+      id: t.id,
+      name: t.type_ln1,
+    }));
   },
 
   /**
-   * Get institute information
+   * Get institute information (served from the backend reference cache)
    */
   getInstitute: async (): Promise<{ id: number; name: string } | null> => {
-    const query = "SELECT id, name_ln1 as name FROM it_institute LIMIT 1";
-    const response = await sqlExecutorApi.executeQuery(query);
-    return response.success && response.data.length > 0
-      ? response.data[0]
+    const response = await fetch(`${API_BASE_URL}/reference/institute`);
+    if (!response.ok) return null;
+    const data = await response.json();
+    return data.institute
+      ? { id: data.institute.id, name: data.institute.name_ln1 }
       : null;
   },
 };